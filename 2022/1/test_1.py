@@ -1,23 +1,131 @@
 import pytest
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Iterator, NamedTuple
 from pathlib import Path
 from queue import PriorityQueue
 import heapq
+from operator import attrgetter
+from aoc import reader, trace, vector
+from aoc.answers import Answer, check_answer
 
-def test():
+TOP_TRACE = trace.channel('day1.top')
+
+class Elf(NamedTuple):
+    items: int
+    total: int
+    largest: int
+
+def get_elfs(input_file: Path) -> Iterator[Elf]:
+    # Streamed a chunk at a time, nothing is kept once an elf is counted
+    for group in reader.stream_groups(input_file):
+        yield Elf(len(group), sum(group), max(group))
+
+class Summary(NamedTuple):
+    # Every elf counted, and the top ones with their own item count, total
+    # and largest item
+    elves: int
+    items: int
+    total: int
+    largest: int
+    top: List[Elf]
+
+def summarize(input_file: Path, top: int) -> Summary:
+    # One streamed pass: nlargest keeps a heap of top elves only, whatever
+    # the number of elves, the rest only adds to the counters
+    counts = [0, 0, 0, 0]
+    def counted(elfs: Iterator[Elf]) -> Iterator[Elf]:
+        for elf in elfs:
+            counts[0] += 1
+            counts[1] += elf.items
+            counts[2] += elf.total
+            counts[3] = max(counts[3], elf.largest)
+            yield elf
+    elfs = heapq.nlargest(top, counted(get_elfs(input_file)), key=attrgetter('total'))
+    if TOP_TRACE.on:
+        for rank, elf in enumerate(elfs):
+            TOP_TRACE.emit("#%d: %d calories in %d items, largest %d", rank + 1, elf.total, elf.items, elf.largest)
+    return Summary(*counts, elfs)
+
+def top_elfs(input_file: Path, top: int) -> List[Elf]:
+    return summarize(input_file, top).top
+
+def numpy_totals(input_file: Path):
+    # Calories of every elf in a few passes over the mapped bytes: every
+    # digit is weighted by 10 ** its place in the line, then the weights are
+    # summed per line and the lines per elf, between blank lines
+    np = vector.numpy
+    raw = np.frombuffer(reader.mapped(input_file), dtype=np.uint8)
+    raw = raw[raw != ord('\r')]
+    if not raw.size:
+        return np.zeros(0, dtype=np.int64)
+    if raw[-1] != ord('\n'):
+        raw = np.append(raw, np.uint8(ord('\n')))
+    newline = raw == ord('\n')
+    digits = raw[~newline] - np.uint8(ord('0'))
+    if np.any(digits > 9):
+        raise RuntimeError(f"{input_file} has more than digits and line breaks")
+    ends = np.flatnonzero(newline)
+    lengths = np.diff(ends, prepend=-1) - 1
+    filled = lengths > 0
+    if not np.any(filled):
+        return np.zeros(0, dtype=np.int64)
+    # Blank lines before a line tell which elf it belongs to
+    elf = np.cumsum(~filled)[filled]
+    first = np.flatnonzero(np.concatenate(([True], elf[1:] != elf[:-1])))
+    items = np.diff(first, append=elf.size)
+    if 10 ** int(lengths.max()) * int(items.max()) > np.iinfo(np.int64).max:
+        # Totals that may not fit in int64
+        return None
+    # Position of every digit, counted from the end of its line
+    place = np.repeat(np.cumsum(lengths), lengths) - np.arange(digits.size) - 1
+    powers = np.int64(10) ** np.arange(lengths.max(), dtype=np.int64)
+    starts = (np.cumsum(lengths) - lengths)[filled]
+    values = np.add.reduceat(digits * powers[place], starts)
+    return np.add.reduceat(values, first)
+
+def top_total(input_file: Path, top: int, engine: str) -> int:
+    totals = numpy_totals(input_file) if vector.use_numpy(engine) else None
+    if totals is None:
+        return sum(elf.total for elf in top_elfs(input_file, top))
+    top = min(top, totals.size)
+    if top <= 0:
+        return 0
+    # Only the top elves end up sorted, the others are just partitioned away
+    return int(vector.numpy.partition(totals, totals.size - top)[totals.size - top:].sum())
+
+def sol1(input_file: Path, top: int = 1, engine: str = 'auto') -> Answer:
+    total = top_total(input_file, top, engine)
+    return total
+
+def sol2(input_file: Path, top: int = 3, engine: str = 'auto') -> Answer:
+    total = top_total(input_file, top, engine)
+    return total
+
+def test_summarize(tmp_path):
+    input_file = tmp_path / 'input.txt'
+    input_file.write_text("1000\n2000\n3000\n\n4000\n\n5000\n6000\n\n7000\n8000\n9000\n\n10000\n")
+    summary = summarize(input_file, 2)
+    assert summary[:4] == (5, 10, 55000, 10000)
+    assert summary.top == [Elf(3, 24000, 9000), Elf(2, 11000, 6000)]
+
+def test_1():
+    input_file = Path('2022/1/input.txt')
+    result = sol1(input_file)
+    check_answer(input_file, 1, result)
+
+def test_2():
+    input_file = Path('2022/1/input.txt')
+    result = sol2(input_file)
+    check_answer(input_file, 2, result)
+
+def test_engines(tmp_path):
+    pytest.importorskip('numpy')
+    input_file = tmp_path / 'input.txt'
+    input_file.write_bytes(b"1000\r\n2000\r\n\r\n4000\n\n\n\n5000\n6000\n\n7000\n8000\n9000\n\n10000")
+    for top, total in [(1, 24000), (3, 45000), (9, 52000)]:
+        assert sol1(input_file, top, 'numpy') == sol1(input_file, top, 'python') == total
+    # Too wide for int64, NumPy hands over to the Python engine
+    input_file.write_text(f"{10 ** 25}\n1\n\n{10 ** 19}\n")
+    assert numpy_totals(input_file) is None
+    assert sol2(input_file, engine='numpy') == sol2(input_file, engine='python') == 10 ** 25 + 10 ** 19 + 1
     input_file = Path('2022/1/input.txt')
-    elfs = list()
-    with input_file.open('r') as inf:
-        current_elf = 0
-        for line in inf:
-            line = line.strip()
-            if not line or line == "":
-                elfs.append((current_elf, current_elf))
-                current_elf = 0
-            else:
-                current_elf += int(line)
-    elfs.append((current_elf,current_elf))
-    result = heapq.nlargest(3, elfs)
-    values = [value for idx, value in result]
-    total = sum(values)
-    print(total)
\ No newline at end of file
+    assert sol2(input_file, engine='numpy') == sol2(input_file, engine='python')
@@ -5,6 +5,11 @@ from queue import PriorityQueue
 import heapq
 from collections import OrderedDict
 import re
+from aoc.answers import Answer, check_answer
+from aoc import trace
+
+CYCLE_TRACE = trace.channel('day10.cycle')
+SIGNAL_TRACE = trace.channel('day10.signal')
 
 def process_input(line: str) -> Tuple[str, int]:
     line = line.strip()
@@ -21,9 +26,9 @@ def get_result(cycle: int, x: int) -> int:
     for point in special_points:
         if cycle == point:
             strength = x*cycle
-            print(f"During the {cycle}th cycle, register X has the value {x}, so the signal strength is {cycle} * {x} = {strength}.")
+            if SIGNAL_TRACE.on:
+                SIGNAL_TRACE.emit("During the %dth cycle, register X has the value %d, so the signal strength is %d * %d = %d.", cycle, x, cycle, x, strength)
             return strength
-    #print(f"During the {cycle}th cycle, register X has the value {x}")
     return None
 
 class Computer:
@@ -58,7 +63,8 @@ class Computer:
         strength = get_result(self.cycle, self.x)
         if strength:
             self.total_strength += strength
-        print(f"{self.cycle}, {cmd}, {value}, {delay}, {self.x}")
+        if CYCLE_TRACE.on:
+            CYCLE_TRACE.emit("%d, %s, %s, %d, %d", self.cycle, cmd, value, delay, self.x)
         # Check for output
         row = ((self.cycle - 1) // 40) % 6
         col = (self.cycle - 1) % 40
@@ -72,16 +78,15 @@ class Computer:
         self.cycle += 1
     def has_work(self):
         return len(self.pending) > 0 or self.current[0] == "addx"
-    def print_output(self):
+    def get_output(self) -> str:
         x = list()
         for line in self.output:
             row = ''.join(line)
             x.append(row)
         result = '\n'.join(x)
-        print(result)
+        return result
 
-def sol1(input_file: Path) -> List[int]:
-    print(f"")
+def sol1(input_file: Path) -> Answer:
     cpu = Computer()
     with input_file.open('r') as inf:
         for line in inf:
@@ -90,10 +95,9 @@ def sol1(input_file: Path) -> List[int]:
             cpu.step()
     while cpu.has_work():
         cpu.step()
-    print(f"Total: {cpu.total_strength}")
+    return cpu.total_strength
 
-def sol2(input_file: Path) -> List[int]:
-    print(f"")
+def sol2(input_file: Path) -> Answer:
     cpu = Computer()
     with input_file.open('r') as inf:
         for line in inf:
@@ -102,30 +106,29 @@ def sol2(input_file: Path) -> List[int]:
             cpu.step()
     while cpu.has_work():
         cpu.step()
-    print(f"Total: {cpu.total_strength}")
-    cpu.print_output()
+    return cpu.get_output()
 
 def test_1_test():
     input_file = Path('2022/10/test_input1.txt')
     results = sol1(input_file)
-    print(results)
+    check_answer(input_file, 1, results)
 
 def test_1_test2():
     input_file = Path('2022/10/test_input2.txt')
     results = sol1(input_file)
-    print(results)
+    check_answer(input_file, 1, results)
 
 def test_1():
     input_file = Path('2022/10/input.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
 def test_2_test():
     input_file = Path('2022/10/test_input2.txt')
     results = sol2(input_file)
-    print(results)
+    check_answer(input_file, 2, results)
 
 def test_2():
     input_file = Path('2022/10/input.txt')
     result = sol2(input_file)
-    print(result)
\ No newline at end of file
+    check_answer(input_file, 2, result)
\ No newline at end of file
@@ -5,163 +5,68 @@ from queue import PriorityQueue
 import heapq
 from collections import OrderedDict
 import re
-
-test_max_product = 23 * 19 * 13 *17
-
-class TestMonkey0:
-    def __init__(self):
-        self.items: List[int] = [79, 98]
-    def operate(self, old: int):
-        return old*19
-    def test(self, value: int) -> int:
-        if value % 23 == 0:
-            return 2
-        else:
-            return 3
-
-class TestMonkey1:
-    def __init__(self):
-        self.items: List[int] = [54, 65, 75, 74]
-    def operate(self, old: int):
-        return old + 6
-    def test(self, value: int) -> int:
-        if value % 19 == 0:
-            return 2
-        else:
-            return 0
-
-class TestMonkey2:
-    def __init__(self):
-        self.items: List[int] = [79, 60, 97]
-    def operate(self, old: int):
-        return old * old
-    def test(self, value: int) -> int:
-        if value % 13 == 0:
-            return 1
-        else:
-            return 3
-
-class TestMonkey3:
-    def __init__(self):
-        self.items: List[int] = [74]
-    def operate(self, old: int):
-        return old + 3
-    def test(self, value: int) -> int:
-        if value % 17 == 0:
-            return 0
-        else:
-            return 1
-
-max_product = 11 * 19 * 5 * 2 * 13 * 7 * 3 * 17
-
-class Monkey0:
-    def __init__(self):
-        self.items: List[int] = [97, 81, 57, 57, 91, 61]
-    def operate(self, old: int):
-        return old * 7
-    def test(self, value: int) -> int:
-        if value % 11 == 0:
-            return 5
-        else:
-            return 6
-
-class Monkey1:
-    def __init__(self):
-        self.items: List[int] = [88, 62, 68, 90]
-    def operate(self, old: int):
-        return old * 17
-    def test(self, value: int) -> int:
-        if value % 19 == 0:
-            return 4
-        else:
-            return 2
-
-class Monkey2:
-    def __init__(self):
-        self.items: List[int] = [74, 87]
+from aoc.answers import Answer, check_answer
+from aoc import cycles, trace
+
+ROUND_TRACE = trace.channel('day11.round')
+
+ITEMS_PATTERN = r'\s*Starting items: (.*)'
+OPERATION_PATTERN = r'\s*Operation: new = old ([*+]) (old|\d+)'
+TEST_PATTERN = r'\s*Test: divisible by (\d+)'
+TARGET_PATTERN = r'\s*If (?:true|false): throw to monkey (\d+)'
+
+class Monkey:
+    def __init__(self, items: List[int], operator: str, operand: Optional[int], divisor: int, if_true: int, if_false: int):
+        self.items: List[int] = items
+        self.operator = operator
+        self.operand = operand
+        self.divisor = divisor
+        self.if_true = if_true
+        self.if_false = if_false
     def operate(self, old: int):
-        return old + 2
-    def test(self, value: int) -> int:
-        if value % 5 == 0:
-            return 7
+        value = old if self.operand is None else self.operand
+        if self.operator == "*":
+            return old * value
         else:
-            return 4
-
-class Monkey3:
-    def __init__(self):
-        self.items: List[int] = [53, 81, 60, 87, 90, 99, 75]
-    def operate(self, old: int):
-        return old + 1
+            return old + value
     def test(self, value: int) -> int:
-        if value % 2 == 0:
-            return 2
+        if value % self.divisor == 0:
+            return self.if_true
         else:
-            return 1
-
-class Monkey4:
-    def __init__(self):
-        self.items: List[int] = [57]
-    def operate(self, old: int):
-        return old + 6
-    def test(self, value: int) -> int:
-        if value % 13 == 0:
-            return 7
-        else:
-            return 0
-
-class Monkey5:
-    def __init__(self):
-        self.items: List[int] = [54, 84, 91, 55, 59, 72, 75, 70]
-    def operate(self, old: int):
-        return old * old
-    def test(self, value: int) -> int:
-        if value % 7 == 0:
-            return 6
-        else:
-            return 3
-
-class Monkey6:
-    def __init__(self):
-        self.items: List[int] = [95, 79, 79, 68, 78]
-    def operate(self, old: int):
-        return old + 3
-    def test(self, value: int) -> int:
-        if value % 3 == 0:
-            return 1
-        else:
-            return 3
-
-class Monkey7:
-    def __init__(self):
-        self.items: List[int] = [61, 97, 67]
-    def operate(self, old: int):
-        return old + 4
-    def test(self, value: int) -> int:
-        if value % 17 == 0:
-            return 0
-        else:
-            return 5
-
-test_setup = [
-    TestMonkey0(),
-    TestMonkey1(),
-    TestMonkey2(),
-    TestMonkey3(),
-]
-
-setup = [
-    Monkey0(),
-    Monkey1(),
-    Monkey2(),
-    Monkey3(),
-    Monkey4(),
-    Monkey5(),
-    Monkey6(),
-    Monkey7()
-]
-
-def sol1(setup, rounds: int) -> List[int]:
-    print(f"")
+            return self.if_false
+
+def process_monkey(lines: List[str]) -> Monkey:
+    items_match = re.match(ITEMS_PATTERN, lines[1])
+    operation_match = re.match(OPERATION_PATTERN, lines[2])
+    test_match = re.match(TEST_PATTERN, lines[3])
+    true_match = re.match(TARGET_PATTERN, lines[4])
+    false_match = re.match(TARGET_PATTERN, lines[5])
+    if not (items_match and operation_match and test_match and true_match and false_match):
+        raise RuntimeError(f"Impossible")
+    items = [int(token) for token in items_match.group(1).split(', ')]
+    operator = operation_match.group(1)
+    operand = operation_match.group(2)
+    operand = None if operand == "old" else int(operand)
+    divisor = int(test_match.group(1))
+    if_true = int(true_match.group(1))
+    if_false = int(false_match.group(1))
+    return Monkey(items, operator, operand, divisor, if_true, if_false)
+
+def get_setup(input_file: Path) -> List[Monkey]:
+    setup = list()
+    lines = list()
+    with input_file.open('r') as inf:
+        for line in inf:
+            line = line.rstrip()
+            if line:
+                lines.append(line)
+            if len(lines) == 6:
+                setup.append(process_monkey(lines))
+                lines = list()
+    return setup
+
+def sol1(input_file: Path, rounds: int = 20) -> Answer:
+    setup = get_setup(input_file)
     inspects = list()
     for monkey in setup:
         inspects.append(0)
@@ -174,63 +79,88 @@ def sol1(setup, rounds: int) -> List[int]:
                 setup[next_monkey].items.append(val)
                 inspects[idx] += 1
             monkey.items = list()
-        print(f"")
-        print(f"After round {round +1}, the monkeys are holding items with these worry levels:")
-        for idx, monkey in enumerate(setup):
-            items = [str(val) for val in monkey.items]
-            msg = ', '.join(items)
-            print(f"Monkey {idx}: {msg}")
+        if ROUND_TRACE.on:
+            ROUND_TRACE.emit("After round %d, the monkeys are holding items with these worry levels:", round + 1)
+            for idx, monkey in enumerate(setup):
+                items = [str(val) for val in monkey.items]
+                ROUND_TRACE.emit("Monkey %d: %s", idx, ', '.join(items))
     largest = heapq.nlargest(2, inspects)
-    print(largest)
     result = largest[0] * largest[1]
-    print(f"Result: {result}")
-
-def sol2(setup, max_val: int, rounds: int) -> List[int]:
-    print(f"")
+    return result
+
+def item_rounds(setup: List[Monkey], max_val: int, holder: int, item: int, rounds: int) -> List[int]:
+    # With worries kept modulo max_val items never interact, so every item is
+    # a small state machine of (holder, worry) that soon cycles. A round ends
+    # for an item once it is thrown back to a monkey that already played
+    def advance(state: Tuple[int, int, Tuple[int, ...]]) -> Tuple[int, int, Tuple[int, ...]]:
+        idx, val, _ = state
+        inspected = list()
+        while True:
+            monkey = setup[idx]
+            inspected.append(idx)
+            val = monkey.operate(val) % max_val
+            next_monkey = monkey.test(val)
+            if next_monkey < idx:
+                return (next_monkey, val, tuple(inspected))
+            idx = next_monkey
+    initial = (holder, item % max_val, ())
+    cycle = cycles.brent(advance, initial, lambda state: state[:2], max_steps=rounds)
+    horizon = rounds if cycle is None else min(rounds, cycle.start + cycle.length)
+    # Inspections per monkey after every round, up to one full cycle
+    counts = [0] * len(setup)
+    metrics = [tuple(counts)]
+    state = initial
+    for _ in range(horizon):
+        state = advance(state)
+        for idx in state[2]:
+            counts[idx] += 1
+        metrics.append(tuple(counts))
+    if cycle is None:
+        return counts
+    return list(cycles.extrapolate(metrics, cycle, rounds))
+
+def sol2(input_file: Path, rounds: int = 10000) -> Answer:
+    setup = get_setup(input_file)
+    max_val = 1
+    for monkey in setup:
+        max_val *= monkey.divisor
     print_points = [
         1, 20, 1000, 2000, 3000, 4000, 5000, 
         6000, 7000, 8000, 9000, 10000
     ]
-    inspects = list()
-    for monkey in setup:
-        inspects.append(0)
-    for round in range(rounds):
-        for idx, monkey in enumerate(setup):
-            for item in monkey.items:
-                val = monkey.operate(item)
-                val = val % max_val
-                next_monkey = monkey.test(val)
-                setup[next_monkey].items.append(val)
-                inspects[idx] += 1
-            monkey.items = list()
-        for point in print_points:
-            if round + 1 == point:
-                print(f"")
-                print(f"== After round {point} ==")
-                for idx, monkey in enumerate(setup):
-                    print(f"Monkey {idx} inspected items {inspects[idx]} times.")
-                break
+    inspects = [0] * len(setup)
+    traced = {point: [0] * len(setup) for point in print_points if point <= rounds} if ROUND_TRACE.on else dict()
+    for holder, monkey in enumerate(setup):
+        for item in monkey.items:
+            for idx, count in enumerate(item_rounds(setup, max_val, holder, item, rounds)):
+                inspects[idx] += count
+            for point, totals in traced.items():
+                for idx, count in enumerate(item_rounds(setup, max_val, holder, item, point)):
+                    totals[idx] += count
+    for point, totals in traced.items():
+        ROUND_TRACE.emit("== After round %d ==", point)
+        for idx, count in enumerate(totals):
+            ROUND_TRACE.emit("Monkey %d inspected items %d times.", idx, count)
     largest = heapq.nlargest(2, inspects)
-    print(largest)
     result = largest[0] * largest[1]
-    print(f"Result: {result}")
+    return result
 
 def test_1_test():
     input_file = Path('2022/11/test_input.txt')
-    results = sol1(test_setup, 20)
-    print(results)
+    results = sol1(input_file, 20)
+    check_answer(input_file, 1, results)
 
 def test_1():
     input_file = Path('2022/11/input.txt')
-    result = sol1(setup, 20)
-    print(result)
+    result = sol1(input_file, 20)
+    check_answer(input_file, 1, result)
 
 def test_2_test():
     input_file = Path('2022/11/test_input.txt')
-    results = sol2(test_setup, test_max_product, 10000)
-    print(results)
+    results = sol2(input_file, 10000)
+    check_answer(input_file, 2, results)
 
 def test_2():
     input_file = Path('2022/11/input.txt')
-    result = sol2(setup, max_product, 10000)
-    print(result)
\ No newline at end of file
+    result = sol2(input_file, 10000)
+    check_answer(input_file, 2, result)
\ No newline at end of file
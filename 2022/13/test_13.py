@@ -8,6 +8,7 @@ import re
 import json
 from enum import Enum
 from functools import cmp_to_key
+from aoc.answers import Answer, check_answer
 
 class Result(Enum):
     RIGHT_ORDER=0
@@ -50,7 +51,7 @@ def check_result(a: list, b: list) -> Result:
     else:
         raise RuntimeError(f"Impossible")
 
-def sol1(input_file: Path) -> List[int]:
+def sol1(input_file: Path) -> Answer:
     lines = list()
     with input_file.open('r') as inf:
         for idx, line in enumerate(inf):
@@ -65,7 +66,7 @@ def sol1(input_file: Path) -> List[int]:
         result = check_result(a,b)
         if result == Result.RIGHT_ORDER:
             count += idx + 1
-    print(f"Result: {count}")
+    return count
 
 def compare(item1, item2):
     result = check_result(item1, item2)
@@ -76,7 +77,7 @@ def compare(item1, item2):
     else:
         return 0
 
-def sol2(input_file: Path) -> List[int]:
+def sol2(input_file: Path) -> Answer:
     lines = list()
     with input_file.open('r') as inf:
         for idx, line in enumerate(inf):
@@ -95,27 +96,26 @@ def sol2(input_file: Path) -> List[int]:
         elif item == [[6]]:
             divisor2 = idx + 1
     if divisor1 is None or divisor2 is None:
-        print("Error")
-    else:
-        result = divisor1 * divisor2
-        print(f"Result: {result}")
+        raise RuntimeError(f"Divider packets not found")
+    result = divisor1 * divisor2
+    return result
 
 def test_1_test():
     input_file = Path('2022/13/test_input.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
 def test_1():
     input_file = Path('2022/13/input.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
 def test_2_test():
     input_file = Path('2022/13/test_input.txt')
     result = sol2(input_file)
-    print(result)
+    check_answer(input_file, 2, result)
 
 def test_2():
     input_file = Path('2022/13/input.txt')
     result = sol2(input_file)
-    print(result)
\ No newline at end of file
+    check_answer(input_file, 2, result)
\ No newline at end of file
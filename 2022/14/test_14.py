@@ -6,14 +6,19 @@ import heapq
 from collections import OrderedDict, deque
 import re
 import json
-from enum import Enum
+from enum import IntEnum
 from functools import cmp_to_key
+from aoc.answers import Answer, check_answer
+from aoc.grid import Grid
 
-class Tile(Enum):
+class Tile(IntEnum):
     AIR=0
     ROCK=1
     SAND=2
     SOURCE=3
+    ABYSS=4
+
+TILE_CHARS = {Tile.AIR: '.', Tile.ROCK: '#', Tile.SAND: 'o', Tile.SOURCE: '+', Tile.ABYSS: '~'}
 
 def process_line(line: str) -> list:
     tokens = line.split('->')
@@ -26,65 +31,25 @@ def process_line(line: str) -> list:
         paths.append((x,y))
     return paths
 
-def draw_map(xmin: int, xmax: int, ymin: int, ymax: int, lastx: int, lasty: int, map: Dict[int, Dict[int, Tile]]):
-    print(f"")
-    if ymax-ymin > 20:
-        ymax = min(ymax, lasty + 10)
-        ymin = max(ymin, lasty - 10)
-    if xmax-xmin > 20:
-        xmax = min(xmax, lastx + 10)
-        xmin = max(xmin, lastx - 10)
-    for y in range(ymin, ymax + 1):
-        msg = ""
-        for x in range(xmin, xmax + 1):
-            col = map[x][y]
-            if col == Tile.AIR:
-                msg += '.'
-            elif col == Tile.ROCK:
-                msg += '#'
-            elif col == Tile.SAND:
-                msg += 'o'
-            elif col == Tile.SOURCE:
-                msg += '+'
-            else:
-                raise RuntimeError(f"Impossible")
-        print(msg)
+def draw_map(map: Grid) -> str:
+    return map.render(TILE_CHARS)
 
-def get_map(paths: List[List[Tuple[int, int]]]):
-    map: Dict[Dict[Tile]] = dict()
-    xmin, xmax = float('inf'), 0
-    ymin, ymax = 0, 0
-    map[500] = dict()
-    map[500][0] = Tile.SOURCE
+def add_rocks(map: Grid, paths: List[List[Tuple[int, int]]], xmin: int):
     for path in paths:
         for i in range(0, len(path) - 1):
             x1, y1 = path[i]
             x2, y2 = path[i+1]
-            if x2 >= x1:
-                xrange = range(x1, x2 + 1)
-            else:
-                xrange = range(x2, x1 + 1)
-            if y2 >= y1:
-                yrange = range(y1, y2 + 1)
-            else:
-                yrange = range(y2, y1 + 1)
-            for x in xrange:
-                for y in yrange:
-                    if not x in map:
-                        map[x] = dict()
-                    map[x][y] = Tile.ROCK
-                    if x < xmin:
-                        xmin = x
-                    if x > xmax:
-                        xmax = x
-                    if y > ymax:
-                        ymax = y
-    for x in range(xmin, xmax + 1):
-        for y in range(ymin, ymax + 1):
-            if not x in map:
-                map[x] = dict()
-            if not y in map[x]:
-                map[x][y] = Tile.AIR
+            for x in range(min(x1, x2), max(x1, x2) + 1):
+                for y in range(min(y1, y2), max(y1, y2) + 1):
+                    map[y, x - xmin] = Tile.ROCK
+
+def get_map(paths: List[List[Tuple[int, int]]]) -> Tuple[Grid, int, int, int, int]:
+    # Rows are y and columns x - xmin, sand leaving the rocks falls into the
+    # padding
+    xmin, xmax, ymin, ymax = get_limist(paths)
+    map = Grid(ymax - ymin + 1, xmax - xmin + 1, Tile.AIR, pad_value=Tile.ABYSS)
+    add_rocks(map, paths, xmin)
+    map[0, 500 - xmin] = Tile.SOURCE
     return map, xmin, xmax, ymin, ymax
 
 def get_limist(paths: List[List[Tuple[int, int]]]) -> Tuple[int,int,int,int]:
@@ -102,131 +67,83 @@ def get_limist(paths: List[List[Tuple[int, int]]]) -> Tuple[int,int,int,int]:
                 ymax = y
     return (xmin, xmax, ymin, ymax)
 
-def sol1(input_file: Path) -> List[int]:
+def get_paths(input_file: Path) -> List[List[Tuple[int, int]]]:
     paths = list()
     with input_file.open('r') as inf:
         for idx, line in enumerate(inf):
             line = line.strip()
             path = process_line(line)
             paths.append(path)
-    map, xmin, xmax, ymin, ymax = get_map(paths)
+    return paths
+
+def sol1(input_file: Path) -> Answer:
+    map, xmin, xmax, ymin, ymax = get_map(get_paths(input_file))
+    cells = map.cells
+    below = (map.width, map.width - 1, map.width + 1)
+    source = map.index(0, 500 - xmin)
     # Drop sand
     count = 0
-    abyss = False
-    while not abyss:
+    while True:
         count += 1
+        idx = source
         falling = True
-        x = 500
-        y = 0
         while falling:
             falling = False
-            for nx,ny in [(x,y+1),(x-1,y+1),(x+1,y+1)]:
-                if nx < xmin or nx > xmax or ny > ymax:
-                    abyss = True
-                    print(f"Result: {count-1}")
-                    return
-                tile = map[nx][ny]
+            for offset in below:
+                tile = cells[idx + offset]
+                if tile == Tile.ABYSS:
+                    return count - 1
                 if tile == Tile.AIR:
                     falling = True
-                    map[x][y] = Tile.AIR
-                    map[nx][ny] = Tile.SAND
-                    x = nx
-                    y = ny
+                    idx += offset
                     break
-            #if count == 4:
-            #    draw_map(xmin, xmax, ymin, ymax, x, y, map)
-        #draw_map(xmin, xmax, ymin, ymax, x, y, map)
-        if count % 10 == 0:
-            #draw_map(xmin, xmax, ymin, ymax, x, y, map)
-            pass
-    print(f"Result: {count-1}")
+        cells[idx] = Tile.SAND
 
-def sol2(input_file: Path) -> List[int]:
-    paths = list()
-    with input_file.open('r') as inf:
-        for idx, line in enumerate(inf):
-            line = line.strip()
-            path = process_line(line)
-            paths.append(path)
-    map = list()
-    for x in range(185):
-        row = list()
-        for y in range(1000):
-            row.append(Tile.AIR)
-        map.append(row)
-    # Assign source
-    map[0][500] = Tile.SOURCE
-    # Assign walls
-    xmax = 0
-    for path in paths:
-        for i in range(0, len(path) - 1):
-            y1, x1 = path[i]
-            y2, x2 = path[i+1]
-            if x2 >= x1:
-                xrange = range(x1, x2 + 1)
-            else:
-                xrange = range(x2, x1 + 1)
-            if y2 >= y1:
-                yrange = range(y1, y2 + 1)
-            else:
-                yrange = range(y2, y1 + 1)
-            for x in xrange:
-                for y in yrange:
-                    map[x][y] = Tile.ROCK
-                    if x > xmax:
-                        xmax = x
-    # Assign floor
-    xfloor = xmax + 2
-    for y in range(1000):
-        map[xfloor][y] = Tile.ROCK
-    xmax = xfloor
+def sol2(input_file: Path) -> Answer:
+    paths = get_paths(input_file)
+    _, _, _, ymax = get_limist(paths)
+    # The floor is the padding row below ymax + 1, the sand pile can not get
+    # wider than its height on either side of the source
+    floor = ymax + 2
+    xmin = 500 - floor - 1
+    map = Grid(floor, 2 * floor + 3, Tile.AIR, pad_value=Tile.ROCK)
+    add_rocks(map, paths, xmin)
+    cells = map.cells
+    below = (map.width, map.width - 1, map.width + 1)
+    source = map.index(0, 500 - xmin)
     # Drop sand
     count = 0
-    source = False
-    while not source:
+    while cells[source] != Tile.SAND:
         count += 1
+        idx = source
         falling = True
-        x = 0
-        y = 500
         while falling:
             falling = False
-            for nx,ny in [(x+1,y),(x+1,y-1),(x+1,y+1)]:
-                #draw_map(xmin, xmax, ymin, ymax, x, y, map)
-                if nx >= xmax:
-                    break
-                else:
-                    tile = map[nx][ny]
-                    if tile == Tile.AIR:
-                        falling = True
-                        x = nx
-                        y = ny
-                        break
-            if not falling:
-                map[x][y] = Tile.SAND
-                #if x == 500 and y == 0:
-                if map[1][499] == map[1][500] == map[1][501] == Tile.SAND:
-                    #draw_map(0, 184, 0, 1000, 500, 0, map)
-                    source = True
-                    print(f"Result {count+1}")
+            for offset in below:
+                if cells[idx + offset] == Tile.AIR:
+                    falling = True
+                    idx += offset
                     break
-    print(f"Result: {count+1}")
+        cells[idx] = Tile.SAND
+    return count
 
 def test_1_test():
     input_file = Path('2022/14/test_input.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
 def test_1():
     input_file = Path('2022/14/input.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
 def test_2_test():
     input_file = Path('2022/14/test_input.txt')
     result = sol2(input_file)
-    print(result)
+    check_answer(input_file, 2, result)
 
+@pytest.mark.slow
 def test_2():
     input_file = Path('2022/14/input.txt')
     result = sol2(input_file)
-    print(result)
\ No newline at end of file
+    check_answer(input_file, 2, result)
\ No newline at end of file
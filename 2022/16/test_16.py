@@ -9,6 +9,8 @@ import json
 from enum import Enum
 from functools import cmp_to_key
 import itertools
+from aoc.answers import Answer, check_answer
+from aoc import bits, search
 
 PATTERN = r'Valve ([A-Z]{2}) has flow rate=(\d+); tunnel[s]? lead[s]? to valve[s]? (.*)'
 
@@ -43,60 +45,51 @@ def get_graph(entries: List[Tuple[Node, List[str]]]) -> Node:
             node.add_neighbor(nnode)
     return nodes['AA']
 
-def floyd_warshall(graph: Node, n: int) -> Tuple[List[List[int]], List[int]]:
-    dist = list()
-    for i in range(n):
-        row = list()
-        for j in range(n):
-            row.append(float('inf'))
-        dist.append(row)
-    for i in range(n):
-        dist[i][i] = 0
+def shortest_paths(graph: Node, n: int) -> Tuple[List[List[int]], List[int]]:
     rates = [0] * n
+    adjacency: List[List[int]] = [list() for _ in range(n)]
     visited = [False] * n
+    visited[graph.id] = True
     q = deque()
     q.append(graph)
     while len(q):
         node: Node = q.popleft()
-        idx = node.id
-        visited[idx] = True
-        rates[idx] = node.rate
+        rates[node.id] = node.rate
         for neighbor in node.neighbors:
-            nidx = neighbor.id
-            dist[idx][nidx] = 1
-            if not visited[nidx]:
+            adjacency[node.id].append(neighbor.id)
+            if not visited[neighbor.id]:
+                visited[neighbor.id] = True
                 q.append(neighbor)
-    for k in range(n):
-        for i in range(n):
-            for j in range(n):
-                if dist[i][j] > dist[i][k] + dist[k][j]:
-                    dist[i][j] = dist[i][k] + dist[k][j]
+    # Tunnels are unit length, so one BFS per valve gives every distance.
+    # Valves out of reach are infinitely far away
+    dist = list()
+    for row in search.all_pairs_bfs(adjacency.__getitem__, n):
+        dist.append([d if d != search.UNREACHED else float('inf') for d in row])
     return dist, rates
 
-def dfs(node: int, dist: List[List[int]], rates: List[int], visited: List[bool], time: int, pressure: int, nodes: int, time_limit: int) -> int:
+def dfs(node: int, dist: List[List[int]], rates: List[int], visited: int, time: int, pressure: int, nodes: int, time_limit: int) -> int:
+    # visited is a mask of the valves already opened or not worth opening
     if time >= time_limit:
         return pressure
-    if all(visited):
+    if visited == bits.full(nodes):
         return pressure
-    visited[node] = True
+    visited |= 1 << node
     # Open this valve
     current_time = time + 1
     current_pressure = (time_limit - time) * rates[node] + pressure
     max_pressure = current_pressure
-    # Go to all neighbors via floyd warshall shortest path
-    for idx in range(nodes):
-        if visited[idx]:
-            continue
+    # Go to all neighbors via the shortest path
+    for idx in bits.bits(bits.full(nodes) & ~visited):
         sp = dist[node][idx]
         if sp > 0:
             neighbor_time = current_time + sp
             neighbor_pressure = current_pressure
-            pressure = dfs(idx, dist, rates, visited.copy(), neighbor_time, neighbor_pressure, nodes, time_limit)
+            pressure = dfs(idx, dist, rates, visited, neighbor_time, neighbor_pressure, nodes, time_limit)
             if pressure > max_pressure:
                 max_pressure = pressure
     return max_pressure
 
-def sol1(input_file: Path) -> List[int]:
+def sol1(input_file: Path) -> Answer:
     entries: List[Tuple[Node, List[str]]] = list()
     with input_file.open('r') as inf:
         for idx, line in enumerate(inf):
@@ -105,17 +98,14 @@ def sol1(input_file: Path) -> List[int]:
             entries.append((node, neighbors))
     graph = get_graph(entries)
     n = len(entries)
-    dist, rates = floyd_warshall(graph, n)
-    visited = [False] * n
+    dist, rates = shortest_paths(graph, n)
     # Valves with rate == 0 do not matter
-    for i in range(n):
-        if rates[i] == 0:
-            visited[i] = True
+    visited = bits.from_indexes(i for i in range(n) if rates[i] == 0)
     # Start opening valve from all nodes assuming first one is AA
     aa_idx = graph.id
     final_pressure = 0
     for idx in range(n):
-        if visited[idx]:
+        if visited >> idx & 1:
             continue
         node, _ = entries[idx]
         if idx == aa_idx:
@@ -125,10 +115,10 @@ def sol1(input_file: Path) -> List[int]:
             if sp == 0:
                 continue
             time = 1 + sp
-        pressure = dfs(idx, dist, rates, visited.copy(), time, 0, n, 30)
+        pressure = dfs(idx, dist, rates, visited, time, 0, n, 30)
         if pressure > final_pressure:
             final_pressure = pressure
-    print(f"Result: {final_pressure}")
+    return final_pressure
 
 def powerset(iterable):
     "powerset([1,2,3]) --> () (1,) (2,) (3,) (1,2) (1,3) (2,3) (1,2,3)"
@@ -144,7 +134,7 @@ def get_all_subset_combinations(rates: List[int]):
     subsets_elephant = [nodes - set(sp) for sp in subsets_person]
     return subsets_person, subsets_elephant
 
-def sol2(input_file: Path) -> List[int]:
+def sol2(input_file: Path) -> Answer:
     entries: List[Tuple[Node, List[str]]] = list()
     with input_file.open('r') as inf:
         for idx, line in enumerate(inf):
@@ -153,12 +143,9 @@ def sol2(input_file: Path) -> List[int]:
             entries.append((node, neighbors))
     graph = get_graph(entries)
     n = len(entries)
-    dist, rates = floyd_warshall(graph, n)
-    visited = [False] * n
+    dist, rates = shortest_paths(graph, n)
     # Valves with rate == 0 do not matter
-    for i in range(n):
-        if rates[i] == 0:
-            visited[i] = True
+    visited = bits.from_indexes(i for i in range(n) if rates[i] == 0)
     subsets_person, subsets_elephant = get_all_subset_combinations(rates)
     # Start opening valve from all nodes assuming first one is AA
     aa_idx = graph.id
@@ -172,12 +159,10 @@ def sol2(input_file: Path) -> List[int]:
             person_pressure = memoization[person_key]
         else:
             person_pressure = 0
-            visited_person = visited.copy()
-            for idx in elephant:
-                visited_person[idx] = True
+            visited_person = visited | bits.from_indexes(elephant)
             # Person path
             for idx in person:
-                if visited_person[idx]:
+                if visited_person >> idx & 1:
                     continue
                 node, _ = entries[idx]
                 if idx == aa_idx:
@@ -187,7 +172,7 @@ def sol2(input_file: Path) -> List[int]:
                     if sp == 0:
                         continue
                     time = 1 + sp
-                pressure = dfs(idx, dist, rates, visited_person.copy(), time, 0, n, 26)
+                pressure = dfs(idx, dist, rates, visited_person, time, 0, n, 26)
                 if pressure > person_pressure:
                     person_pressure = pressure
             memoization[person_key] = person_pressure
@@ -197,11 +182,9 @@ def sol2(input_file: Path) -> List[int]:
             elephant_pressure = memoization[elephant_key]
         else:
             elephant_pressure = 0
-            visited_elephant = visited.copy()
-            for idx in person:
-                visited_elephant[idx] = True
+            visited_elephant = visited | bits.from_indexes(person)
             for idx in elephant:
-                if visited_elephant[idx]:
+                if visited_elephant >> idx & 1:
                     continue
                 node, _ = entries[idx]
                 if idx == aa_idx:
@@ -211,32 +194,33 @@ def sol2(input_file: Path) -> List[int]:
                     if sp == 0:
                         continue
                     time = 1 + sp
-                pressure = dfs(idx, dist, rates, visited_elephant.copy(), time, 0, n, 26)
+                pressure = dfs(idx, dist, rates, visited_elephant, time, 0, n, 26)
                 if pressure > elephant_pressure:
                     elephant_pressure = pressure
             pressure = person_pressure + elephant_pressure
             if pressure > final_pressure:
                 final_pressure = pressure
             memoization[elephant_key] = elephant_pressure
-    print(f"Result: {final_pressure}")
+    return final_pressure
 
 
 def test_1_test():
     input_file = Path('2022/16/test_input.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
 def test_1():
     input_file = Path('2022/16/input.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
 def test_2_test():
     input_file = Path('2022/16/test_input.txt')
     result = sol2(input_file)
-    print(result)
+    check_answer(input_file, 2, result)
 
+@pytest.mark.slow
 def test_2():
     input_file = Path('2022/16/input.txt')
     result = sol2(input_file)
-    print(result)
\ No newline at end of file
+    check_answer(input_file, 2, result)
\ No newline at end of file
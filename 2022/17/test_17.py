@@ -6,9 +6,14 @@ import heapq
 from collections import OrderedDict, deque
 import re
 import json
-from enum import Enum
+from enum import Enum, IntEnum
 from functools import cmp_to_key
 import itertools
+from aoc.answers import Answer, check_answer
+from aoc.grid import Grid
+from aoc import cycles, trace
+
+CYCLE_TRACE = trace.channel('day17.cycle')
 
 PATTERN = r'Valve ([A-Z]{2}) has flow rate=(\d+); tunnel[s]? lead[s]? to valve[s]? (.*)'
 
@@ -18,11 +23,27 @@ class Direction(Enum):
     RIGHT=2
     DOWN=3
 
-class Tile(Enum):
+class Tile(IntEnum):
     ROCK=0
     AIR=1
     SHAPE=2
 
+TILE_CHARS = {Tile.ROCK: '#', Tile.AIR: '.', Tile.SHAPE: '@'}
+JET_SHIFT = {Direction.LEFT: -1, Direction.RIGHT: 1}
+# Cells of each rock as (x, y) from its bottom left corner, y grows upwards.
+# The last cell is always on the top row of the rock
+SHAPES = [
+    [(0,0), (1,0), (2,0), (3,0)],
+    [(1,0), (0,1), (1,1), (2,1), (1,2)],
+    [(0,0), (1,0), (2,0), (2,1), (2,2)],
+    [(0,0), (0,1), (0,2), (0,3)],
+    [(0,0), (1,0), (0,1), (1,1)],
+]
+# Rows added to the chamber at once
+CHUNK = 1024
+# Rows above the floor compared when looking for a cycle
+STATE_ROWS = 100
+
 def process_line(line: str) -> List[Direction]:
     result = list()
     for char in line:
@@ -34,163 +55,28 @@ def process_line(line: str) -> List[Direction]:
             raise RuntimeError(f"Impossible")
     return result
 
-class Shape:
-    def __init__(self):
-        self.rows: List[List[Tuple[int,int]]] = list()
-    def fall(self):
-        for idx in range(len(self.rows)):
-            row = self.rows[idx]
-            new_row = [(x,y-1) for x,y in row]
-            self.rows[idx] = new_row
-    def shift(self, jet: Direction):
-        if jet == Direction.LEFT:
-            possible = True
-            for row in self.rows:
-                for x,y in row:
-                    if x == 0:
-                        possible = False
-                        break
-                if not possible:
-                    break
-            if possible:
-                for idx in range(len(self.rows)):
-                    row = self.rows[idx]
-                    new_row = [(x-1,y) for x,y in row]
-                    self.rows[idx] = new_row
-        elif jet == Direction.RIGHT:
-            possible = True
-            for row in self.rows:
-                for x,y in row:
-                    if x == 6:
-                        possible = False
-                        break
-                if not possible:
-                    break
-            if possible:
-                for idx in range(len(self.rows)):
-                    row = self.rows[idx]
-                    new_row = [(x+1,y) for x,y in row]
-                    self.rows[idx] = new_row
-        elif jet == Direction.NONE:
-            return
-        else:
-            raise RuntimeError(f"Impossible")
-
-class FirstShape(Shape):
-    def __init__(self, xstart:int, ystart: int):
-        super().__init__()
-        row = [(xstart, ystart), (xstart + 1, ystart), (xstart + 2, ystart), (xstart + 3, ystart)]
-        self.rows.append(row)
-    def __repr__(self) -> str:
-        x,y = self.rows[0]
-        return f"1st:({x},{y})"
-    def __str__(self) -> str:
-        return self.__repr__()
-
-class SecondShape(Shape):
-    def __init__(self, xstart:int, ystart: int):
-        super().__init__()
-        row0 = [(xstart + 1, ystart)]
-        row1 = [(xstart, ystart + 1), (xstart + 1, ystart + 1), (xstart + 2, ystart + 1)]
-        row2 = [(xstart + 1, ystart + 2)]
-        self.rows.append(row0)
-        self.rows.append(row1)
-        self.rows.append(row2)
-    def __repr__(self) -> str:
-        x,y = self.rows[0]
-        return f"2nd:({x},{y})"
-    def __str__(self) -> str:
-        return self.__repr__()
-
-class ThirdShape(Shape):
-    def __init__(self, xstart:int, ystart: int):
-        super().__init__()
-        row0 = [(xstart, ystart), (xstart + 1, ystart), (xstart + 2, ystart)]
-        row1 = [(xstart + 2, ystart + 1)]
-        row2 = [(xstart + 2, ystart + 2)]
-        self.rows.append(row0)
-        self.rows.append(row1)
-        self.rows.append(row2)
-    def __repr__(self) -> str:
-        x,y = self.rows[0]
-        return f"3rd:({x},{y})"
-    def __str__(self) -> str:
-        return self.__repr__()
-
-class FourthShape(Shape):
-    def __init__(self, xstart:int, ystart: int):
-        super().__init__()
-        row0 = [(xstart, ystart)]
-        row1 = [(xstart, ystart + 1)]
-        row2 = [(xstart, ystart + 2)]
-        row3 = [(xstart, ystart + 3)]
-        self.rows.append(row0)
-        self.rows.append(row1)
-        self.rows.append(row2)
-        self.rows.append(row3)
-    def __repr__(self) -> str:
-        x,y = self.rows[0]
-        return f"4th:({x},{y})"
-    def __str__(self) -> str:
-        return self.__repr__()
-
-class FifthShape(Shape):
-    def __init__(self, xstart:int, ystart: int):
-        super().__init__()
-        row0 = [(xstart, ystart), (xstart + 1, ystart)]
-        row1 = [(xstart, ystart + 1), (xstart + 1, ystart + 1)]
-        self.rows.append(row0)
-        self.rows.append(row1)
-    def __repr__(self) -> str:
-        x,y = self.rows[0]
-        return f"4th:({x},{y})"
-    def __str__(self) -> str:
-        return self.__repr__()
-
 class Map:
+    # Row y of the chamber is grid row y, the padding is the floor below row
+    # 0 and the walls on both sides
     def __init__(self, jets: List[Direction]):
         self.steps = 0
-        self.tiles = dict()
-        self.falling_shape: Shape = None
-        self.shape_class = [FirstShape, SecondShape, ThirdShape, FourthShape, FifthShape]
+        self.grid = Grid(0, 7, Tile.AIR, pad_value=Tile.ROCK)
+        self.shapes = [tuple(dy * self.grid.width + dx for dx, dy in shape) for shape in SHAPES]
+        self.falling_shape: Optional[Tuple[int, ...]] = None
+        self.falling_idx = 0
         self.shape_idx = 0
         self.bottom = -1
-        self.jets = jets
+        self.jets = [JET_SHIFT[jet] for jet in jets]
         self.jet_idx = 0
         self.count = 0
         self.fresh_shape = False
-    def get_state_hash(self) -> str:
-        rows = list()
-        shape = list()
-        for row in self.falling_shape.rows:
-            for entry in row:
-                shape.append(entry)
-        key = ''
-        for ny in range(100):
-            y = self.bottom + 8 - ny
-            if y < 0:
-                key += "-------"
-            else:
-                row = list()
-                for x in range(7):
-                    if (x,y) in shape:
-                        key += "@"
-                    elif x in self.tiles:
-                        if y in self.tiles[x]:
-                            val = self.tiles[x][y]
-                            if val == Tile.ROCK:
-                                key += "#"
-                            elif val == Tile.AIR:
-                                key += "."
-                            elif val == Tile.SHAPE:
-                                key += "@"
-                        else:
-                            key += "."
-                    else:
-                        key += "."
-        key += str(self.shape_idx)
-        key += str(self.jet_idx)
-        return key
+    def get_state_hash(self) -> Tuple[bytes, int, int]:
+        # A fresh rock always starts at the same place above the floor, so the
+        # top rows and both indexes are the whole state
+        grid = self.grid
+        low = max(self.bottom + 9 - STATE_ROWS, 0)
+        rows = grid.cells[grid.index(low, 0):grid.index(self.bottom + 9, 0)]
+        return (bytes(rows), self.shape_idx, self.jet_idx)
     def get_count(self) -> int:
         return self.count
     def get_height(self) -> int:
@@ -199,92 +85,36 @@ class Map:
         if self.falling_shape is not None:
             raise RuntimeError(f"Impossible")
         self.count += 1
-        shape = self.shape_class[self.shape_idx]
+        self.falling_shape = self.shapes[self.shape_idx]
         self.shape_idx += 1
-        self.shape_idx %= len(self.shape_class)
-        x = 2
-        y = self.bottom + 4
-        self.falling_shape = shape(x, y)
+        self.shape_idx %= len(self.shapes)
+        if self.grid.rows < self.bottom + 9:
+            self.grid.grow(CHUNK)
+        self.falling_idx = self.grid.index(self.bottom + 4, 2)
         self.fresh_shape = True
-    def collide(self, shape: Shape):
-        max_y = self.bottom
-        for row in shape.rows:
-            for x,y in row:
-                if not x in self.tiles:
-                    self.tiles[x] = dict()
-                self.tiles[x][y] = Tile.ROCK
-                if y > max_y:
-                    max_y = y
-        self.bottom = max_y
-    def collision(self, shape: Shape, dir: Direction) -> bool:
-        if dir == Direction.RIGHT:
-            dx = 1
-            dy = 0
-        elif dir == Direction.LEFT:
-            dx = -1
-            dy = 0
-        elif dir == Direction.DOWN:
-            dx = 0
-            dy = -1
-        elif dir == Direction.NONE:
-            return False
-        else:
-            raise RuntimeError(f"Impossible")
-        for row in shape.rows:
-            for x,y in row:
-                nx = x + dx
-                ny = y + dy
-                if nx < 0 or nx > 6:
-                    # Collision!
-                    return True
-                elif ny < 0:
-                    # Collision!
-                    return True
-                elif nx in self.tiles:
-                    if ny in self.tiles[nx]:
-                        tile = self.tiles[nx][ny]
-                        if tile == Tile.ROCK:
-                            # Collision!
-                            return True
-                else:
-                    continue
+    def collide(self, shape: Tuple[int, ...], idx: int):
+        cells = self.grid.cells
+        for offset in shape:
+            cells[idx + offset] = Tile.ROCK
+        r, _ = self.grid.position(idx + shape[-1])
+        if r > self.bottom:
+            self.bottom = r
+    def collision(self, shape: Tuple[int, ...], idx: int) -> bool:
+        cells = self.grid.cells
+        for offset in shape:
+            if cells[idx + offset] != Tile.AIR:
+                return True
         return False
-    def draw(self):
-        rows = list()
-        ymax = self.bottom
-        for y in range(ymax + 8):
-            row = list()
-            for x in range(7):
-                tile = Tile.AIR
-                if x in self.tiles:
-                    if y in self.tiles[x]:
-                        tile = self.tiles[x][y]
-                row.append(tile)
-            rows.append(row)
+    def draw(self) -> str:
+        grid = self.grid.copy()
         if self.falling_shape:
-            for row in self.falling_shape.rows:
-                for x,y in row:
-                    rows[y][x] = Tile.SHAPE
-        rows.reverse()
+            for offset in self.falling_shape:
+                grid.cells[self.falling_idx + offset] = Tile.SHAPE
         lines = list()
-        for row in rows:
-            line = "|"
-            for tile in row:
-                if tile == Tile.AIR:
-                    col = "."
-                elif tile == Tile.ROCK:
-                    col = "#"
-                elif tile == Tile.SHAPE:
-                    col = "@"
-                else:
-                    raise RuntimeError(f"Impossible")
-                line += col
-            line += "|"
-            lines.append(line)
-        lines.append("---------")
-        print(f"")
-        for line in lines:
-            print(line)
+        for y in range(self.bottom + 8, -1, -1):
+            lines.append('|' + ''.join(TILE_CHARS[tile] for tile in grid.row(y)) + '|')
+        lines.append("+-------+")
+        return '\n'.join(lines)
 
     def step(self):
         self.fresh_shape = False
@@ -294,18 +124,19 @@ class Map:
         self.jet_idx %= len(self.jets)
         shape = self.falling_shape
         # Apply jet if not collision
-        if not self.collision(shape, jet):
-            shape.shift(jet)
+        if not self.collision(shape, self.falling_idx + jet):
+            self.falling_idx += jet
         # Fall down or collide
-        if self.collision(shape, Direction.DOWN):
-            self.collide(shape)
+        below = self.falling_idx - self.grid.width
+        if self.collision(shape, below):
+            self.collide(shape, self.falling_idx)
             self.falling_shape = None
             self.add_shape()
         else:
-            self.falling_shape.fall()
+            self.falling_idx = below
         return None
 
-def sol1(input_file: Path) -> List[int]:
+def sol1(input_file: Path) -> Answer:
     jets: List[Direction] = list()
     with input_file.open('r') as inf:
         for idx, line in enumerate(inf):
@@ -314,13 +145,12 @@ def sol1(input_file: Path) -> List[int]:
             jets.extend(sjets)
     map = Map(jets)
     map.add_shape()
-    map.draw()
     while map.get_count() < 2023:
         map.step()
     height = map.get_height()
-    print(f"Result: {height}")
+    return height
 
-def sol2(input_file: Path) -> List[int]:
+def sol2(input_file: Path) -> Answer:
     jets: List[Direction] = list()
     with input_file.open('r') as inf:
         for idx, line in enumerate(inf):
@@ -329,48 +159,35 @@ def sol2(input_file: Path) -> List[int]:
             jets.extend(sjets)
     map = Map(jets)
     map.add_shape()
-    #map.draw()
-    memo = dict()
-    # Find cycle
-    while map.get_count() < 1000000000001:
+    def drop():
+        # Until the next rock appears, i.e. one more rock has landed
         map.step()
-        if map.fresh_shape:
-            key = map.get_state_hash()
-            count = map.get_count()
-            height = map.get_height()
-            if key in memo:
-                new = (count, height)
-                prev = memo[key]
-                prev_count, prev_height = prev
-                dcount = count - prev_count
-                dheight = height - prev_height
-                if (1000000000001 - count) % dcount == 0:
-                    # Found answer!
-                    result = height + ((1000000000001-count)//dcount)*dheight
-                    print(f"Found result: {result}")
-                    break
-                else:
-                    print(f"Found cycle! Count: {count}, Prev: {prev}, New: {new}, DCount: {dcount}, DHeight: {dheight}")
-            memo[key] = (count, height)
-    height = map.get_height()
-    print(f"Result: {height}")
+        while not map.fresh_shape:
+            map.step()
+    # Step k of the cycle is the state with k rocks landed
+    cycle, heights = cycles.detect(drop, lambda: hash(map.get_state_hash()), map.get_height)
+    if cycle is None:
+        raise RuntimeError(f"Impossible")
+    if CYCLE_TRACE.on:
+        CYCLE_TRACE.emit("Found cycle! Start: %d, Length: %d, DHeight: %d", cycle.start, cycle.length, heights[cycle.start + cycle.length] - heights[cycle.start])
+    return cycles.extrapolate(heights, cycle, 1000000000000)
 
 def test_1_test():
     input_file = Path('2022/17/input_test.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
 def test_1():
     input_file = Path('2022/17/input.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
 def test_2_test():
     input_file = Path('2022/17/input_test.txt')
     result = sol2(input_file)
-    print(result)
+    check_answer(input_file, 2, result)
 
 def test_2():
     input_file = Path('2022/17/input.txt')
     result = sol2(input_file)
-    print(result)
\ No newline at end of file
+    check_answer(input_file, 2, result)
\ No newline at end of file
@@ -1,7 +1,4 @@
 import pytest
-from mpl_toolkits.mplot3d import Axes3D
-import numpy as np
-import matplotlib.pyplot as plt
 from typing import Optional, List, Tuple, Dict, Set
 from pathlib import Path
 from queue import PriorityQueue
@@ -13,8 +10,8 @@ from enum import Enum
 from functools import cmp_to_key
 import itertools
 import logging
-
-logging.getLogger('matplotlib.font_manager').disabled = True
+from aoc import viz
+from aoc.answers import Answer, check_answer
 
 class Point:
     def __init__(self, x: int, y: int, z: int):
@@ -63,7 +60,13 @@ class Droplet:
             surface = self.point_surface(point)
             total_surface += surface
         return total_surface
+    @viz.view
     def draw(self):
+        # matplotlib and numpy are only imported when visualization is on
+        np = viz.require('numpy')
+        plt = viz.require('matplotlib.pyplot')
+        viz.require('mpl_toolkits.mplot3d')
+        logging.getLogger('matplotlib.font_manager').disabled = True
         fig = plt.figure()
         ax = fig.add_subplot(projection='3d')
         # Make grid
@@ -125,7 +128,7 @@ class Box:
         inside = Droplet(inside_points)
         return inside
 
-def sol1(input_file: Path) -> List[int]:
+def sol1(input_file: Path) -> Answer:
     points: List[Point] = list()
     with input_file.open('r') as inf:
         for idx, line in enumerate(inf):
@@ -134,10 +137,10 @@ def sol1(input_file: Path) -> List[int]:
             points.append(point)
     drop = Droplet(points)
     surface = drop.surface()
-    print(f"Result: {surface}")
     drop.draw()
+    return surface
 
-def sol2(input_file: Path) -> List[int]:
+def sol2(input_file: Path) -> Answer:
     points: List[Point] = list()
     with input_file.open('r') as inf:
         for idx, line in enumerate(inf):
@@ -154,29 +157,29 @@ def sol2(input_file: Path) -> List[int]:
     drop_surface = drop.surface()
     inside_surface = inside.surface()
     surface = drop_surface - inside_surface
-    print(f"Result: {surface}")
+    return surface
 
 def test_1_test():
     input_file = Path('2022/18/test_input.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
 def test_1_test2():
     input_file = Path('2022/18/test_input2.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
 def test_1():
     input_file = Path('2022/18/input.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
 def test_2_test():
     input_file = Path('2022/18/test_input.txt')
     result = sol2(input_file)
-    print(result)
+    check_answer(input_file, 2, result)
 
 def test_2():
     input_file = Path('2022/18/input.txt')
     result = sol2(input_file)
-    print(result)
\ No newline at end of file
+    check_answer(input_file, 2, result)
\ No newline at end of file
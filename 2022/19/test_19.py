@@ -9,8 +9,14 @@ import json
 from enum import Enum
 from functools import cmp_to_key
 import itertools
+from aoc.answers import Answer, check_answer
+from aoc import cache, trace
+
+BLUEPRINT_TRACE = trace.channel('day19.blueprint')
 
 PATTERN = r'Blueprint (\d+): Each ore robot costs (\d+) ore. Each clay robot costs (\d+) ore. Each obsidian robot costs (\d+) ore and (\d+) clay. Each geode robot costs (\d+) ore and (\d+) obsidian.'
+# Bump when the parsed form changes, older cache entries are then ignored
+PARSER_VERSION = 1
 
 class Item(Enum):
     ORE=0
@@ -141,51 +147,55 @@ def process_line(line: str) -> Blueprint:
     bp = Blueprint(idx, orer_ore_cost, clar_ore_cost, obsr_ore_cost, obsr_cla_cost, geor_ore_cost, geor_obs_cost)
     return bp
 
-def sol1(input_file: Path) -> List[int]:
-    bps: List[Blueprint] = list()
+def parse_blueprints(input_file: Path) -> List[Tuple[int, ...]]:
+    blueprints = list()
     with input_file.open('r') as inf:
-        for idx, line in enumerate(inf):
-            line = line.strip()
-            bp = process_line(line)
-            bps.append(bp)
+        for line in inf:
+            bp = process_line(line.strip())
+            blueprints.append((bp.idx, bp.orer_ore_cost, bp.clar_ore_cost, bp.obsr_ore_cost, bp.obsr_cla_cost, bp.geor_ore_cost, bp.geor_obs_cost))
+    return blueprints
+
+def get_blueprints(input_file: Path) -> List[Blueprint]:
+    flat = cache.load_records(input_file, 'day19.blueprints', PARSER_VERSION, 7, parse_blueprints)
+    return [Blueprint(*fields) for fields in cache.records(flat, 7)]
+
+def sol1(input_file: Path) -> Answer:
+    bps = get_blueprints(input_file)
     count = 0
     for bp in bps:
         geodes = dfs(bp, 0, (0, 0, 0, 0), (1, 0, 0, 0), 24, True, True, True)
         value = (bp.idx)*geodes
-        print(f"BP({bp.idx}: Max geodes: {geodes}, Value: {value}")
+        if BLUEPRINT_TRACE.on:
+            BLUEPRINT_TRACE.emit("BP(%d: Max geodes: %d, Value: %d", bp.idx, geodes, value)
         count += value
-    print(f"Result: {count}")
+    return count
 
-def sol2(input_file: Path) -> List[int]:
-    bps: List[Blueprint] = list()
-    with input_file.open('r') as inf:
-        for idx, line in enumerate(inf):
-            line = line.strip()
-            bp = process_line(line)
-            bps.append(bp)
+def sol2(input_file: Path) -> Answer:
+    bps = get_blueprints(input_file)
     count = 1
     for bp in bps[0:3]:
         geodes = dfs(bp, 0, (0, 0, 0, 0), (1, 0, 0, 0), 32, True, True, True)
-        print(f"BP({bp.idx}: Max geodes: {geodes}")
+        if BLUEPRINT_TRACE.on:
+            BLUEPRINT_TRACE.emit("BP(%d: Max geodes: %d", bp.idx, geodes)
         count *= geodes
-    print(f"Result: {count}")
+    return count
 
 def test_1_test():
     input_file = Path('2022/19/input_test.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
 def test_1():
     input_file = Path('2022/19/input.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
 def test_2_test():
     input_file = Path('2022/19/input_test.txt')
     result = sol2(input_file)
-    print(result)
+    check_answer(input_file, 2, result)
 
 def test_2():
     input_file = Path('2022/19/input.txt')
     result = sol2(input_file)
-    print(result)
\ No newline at end of file
+    check_answer(input_file, 2, result)
\ No newline at end of file
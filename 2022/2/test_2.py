@@ -1,8 +1,10 @@
 import pytest
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Dict
 from pathlib import Path
 from queue import PriorityQueue
 import heapq
+from aoc import parallel, reader, vector
+from aoc.answers import Answer, check_answer
 
 game_result = {
     # Rock vs Rock
@@ -46,26 +48,94 @@ game_result2 = {
     ('C','Z'): 1 + 6,
 }
 
+OPONENTS = 'ABC'
+PLAYERS = 'XYZ'
+# The 0..8 code of a round is 3 * oponent + player, the same order as codes
+ROUNDS = [f"{oponent} {player}".encode() for oponent in OPONENTS for player in PLAYERS]
+
+def by_code(results: Dict[Tuple[str, str], int]) -> List[int]:
+    return [results[oponent, player] for oponent in OPONENTS for player in PLAYERS]
+
+game_codes = by_code(game_result)
+game_codes2 = by_code(game_result2)
+
+def python_histogram(data: reader.Buffer, start: int, end: int) -> List[int]:
+    # How many rounds of each code, bytes.count runs at C speed over a window
+    # of the mapped file at a time. Every round has exactly one space, so the
+    # spaces tell if some line was not a round
+    counts = [0] * len(ROUNDS)
+    for window in reader.windows(data, start=start, end=end):
+        found = 0
+        for code, round in enumerate(ROUNDS):
+            count = window.count(round)
+            counts[code] += count
+            found += count
+        if found != window.count(b' '):
+            raise RuntimeError(f"Lines that are not rounds after byte {start}")
+    return counts
+
+def numpy_histogram(data: reader.Buffer, start: int, end: int) -> List[int]:
+    # The letters around every space give the code of a round
+    np = vector.numpy
+    raw = np.frombuffer(data, dtype=np.uint8, count=end - start, offset=start)
+    spaces = np.flatnonzero(raw == ord(' '))
+    if spaces.size and (spaces[0] == 0 or spaces[-1] == raw.size - 1):
+        raise RuntimeError(f"Lines that are not rounds after byte {start}")
+    oponents = raw[spaces - 1] - np.uint8(ord('A'))
+    players = raw[spaces + 1] - np.uint8(ord('X'))
+    if np.any(oponents > 2) or np.any(players > 2):
+        raise RuntimeError(f"Lines that are not rounds after byte {start}")
+    codes = oponents.astype(np.intp) * 3 + players
+    return np.bincount(codes, minlength=len(ROUNDS)).tolist()
+
+def histogram(data: reader.Buffer, start: int, end: int, engine: str = 'auto') -> List[int]:
+    if vector.use_numpy(engine):
+        return numpy_histogram(data, start, end)
+    return python_histogram(data, start, end)
+
+def scores(input_file: Path, engine: str = 'auto', processes: int = 1) -> Tuple[int, int]:
+    # Both parts from a single pass, as the dot product of the histogram
+    # with each score table. With several processes every one counts a range
+    # of lines and the histograms are added up
+    counts = [0] * len(ROUNDS)
+    for partial in parallel.score_ranges(2, 'histogram', input_file, processes, engine=engine):
+        counts = [count + more for count, more in zip(counts, partial)]
+    return (
+        sum(count * points for count, points in zip(counts, game_codes)),
+        sum(count * points for count, points in zip(counts, game_codes2)),
+    )
+
+def sol1(input_file: Path, engine: str = 'auto', processes: int = 1) -> Answer:
+    return scores(input_file, engine, processes)[0]
+
+def sol2(input_file: Path, engine: str = 'auto', processes: int = 1) -> Answer:
+    return scores(input_file, engine, processes)[1]
+
 def test_1():
     input_file = Path('2022/2/input.txt')
-    result = 0
-    with input_file.open('r') as inf:
-        for line in inf:
-            values = line.strip().split(' ')
-            oponent = values[0]
-            player = values[1]
-            points = game_result[(oponent, player)]
-            result += points
-    print(result)
+    result = sol1(input_file)
+    check_answer(input_file, 1, result)
 
 def test_2():
     input_file = Path('2022/2/input.txt')
-    result = 0
-    with input_file.open('r') as inf:
-        for line in inf:
-            values = line.strip().split(' ')
-            oponent = values[0]
-            player = values[1]
-            points = game_result2[(oponent, player)]
-            result += points
-    print(result)
\ No newline at end of file
+    result = sol2(input_file)
+    check_answer(input_file, 2, result)
+
+def test_engines(tmp_path):
+    input_file = tmp_path / 'input.txt'
+    input_file.write_bytes(b"A Y\r\nB X\n\nC Z")
+    assert scores(input_file, 'python') == (15, 12)
+    bad_file = tmp_path / 'bad.txt'
+    bad_file.write_bytes(b"A Y\nB  X\n")
+    with pytest.raises(RuntimeError):
+        scores(bad_file, 'python')
+    pytest.importorskip('numpy')
+    assert scores(input_file, 'numpy') == (15, 12)
+    with pytest.raises(RuntimeError):
+        scores(bad_file, 'numpy')
+    input_file = Path('2022/2/input.txt')
+    assert scores(input_file, 'numpy') == scores(input_file, 'python')
+
+def test_processes():
+    input_file = Path('2022/2/input.txt')
+    assert scores(input_file, 'python', 3) == scores(input_file, 'python')
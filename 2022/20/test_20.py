@@ -9,9 +9,12 @@ import json
 from enum import Enum
 from functools import cmp_to_key
 import itertools
+from aoc import reader
+from aoc.answers import Answer, check_answer
+from aoc import trace
 
-def process_line(line: str) -> int:
-    return int(line)
+MIX_TRACE = trace.channel('day20.mix')
+ROUND_TRACE = trace.channel('day20.round')
 
 def shift_right(nums: List[int], new_indexes_by_orig_index: Dict[int, int], orig_indexes_by_new_index: Dict[int, int], idx: int, value: int) -> List[int]:
     n = len(nums)
@@ -108,44 +111,28 @@ def get_pos_after_zero(nums: List[int], pos: int) -> int:
     result_idx = (zero_idx + pos) % n
     return nums[result_idx]
 
-def sol1(input_file: Path) -> List[int]:
-    print(f"")
-    nums: List[int] = list()
-    with input_file.open('r') as inf:
-        for idx, line in enumerate(inf):
-            line = line.strip()
-            num = process_line(line)
-            nums.append(num)
+def sol1(input_file: Path) -> Answer:
+    nums: List[int] = reader.ints(reader.mapped(input_file))
     curr = nums.copy()
     n = len(nums)
     new_indexes_by_orig_index = { idx:idx for idx, num in enumerate(nums) }
     orig_indexes_by_new_index = { idx:idx for idx, num in enumerate(nums) }
     for idx, num in enumerate(nums):
         shift(curr, new_indexes_by_orig_index, orig_indexes_by_new_index, idx, num)
-        if len(nums) < 10:
+        if MIX_TRACE.on:
             curr_idx = new_indexes_by_orig_index[idx]
             prev = (curr_idx - 1) % n
             nxt = (curr_idx + 1) % n
-            print(f"{num} moves between {curr[prev]} and {curr[nxt]}:")
-            str_nums = [str(val) for val in curr]
-            print(f"[{', '.join(str_nums)}]")
+            MIX_TRACE.emit("%d moves between %d and %d:", num, curr[prev], curr[nxt])
+            MIX_TRACE.emit("[%s]", ', '.join(str(val) for val in curr))
     pos_1000 = get_pos_after_zero(curr, 1000)
     pos_2000 = get_pos_after_zero(curr, 2000)
     pos_3000 = get_pos_after_zero(curr, 3000)
-    print(f"the 1000th number after 0 is {pos_1000}")
-    print(f"the 2000th number after 0 is {pos_2000}")
-    print(f"the 3000th number after 0 is {pos_3000}")
     count = pos_1000 + pos_2000 + pos_3000
-    print(f"Result: {count}")
+    return count
 
-def sol2(input_file: Path) -> List[int]:
-    print(f"")
-    nums: List[int] = list()
-    with input_file.open('r') as inf:
-        for idx, line in enumerate(inf):
-            line = line.strip()
-            num = process_line(line)
-            nums.append(num*811589153)
+def sol2(input_file: Path) -> Answer:
+    nums: List[int] = [num * 811589153 for num in reader.ints(reader.mapped(input_file))]
     curr = nums.copy()
     n = len(nums)
     new_indexes_by_orig_index = { idx:idx for idx, num in enumerate(nums) }
@@ -153,35 +140,33 @@ def sol2(input_file: Path) -> List[int]:
     for round in range(0,10):
         for idx, num in enumerate(nums):
             shift(curr, new_indexes_by_orig_index, orig_indexes_by_new_index, idx, num)
-        if len(nums) < 10:
-            print(f"After {round+1} round{'s' if round > 0 else ''} of mixing:")
-            str_nums = [str(val) for val in curr]
-            print(f"[{', '.join(str_nums)}]")
+        if ROUND_TRACE.on:
+            ROUND_TRACE.emit("After %d round%s of mixing:", round + 1, 's' if round > 0 else '')
+            ROUND_TRACE.emit("[%s]", ', '.join(str(val) for val in curr))
     pos_1000 = get_pos_after_zero(curr, 1000)
     pos_2000 = get_pos_after_zero(curr, 2000)
     pos_3000 = get_pos_after_zero(curr, 3000)
-    print(f"the 1000th number after 0 is {pos_1000}")
-    print(f"the 2000th number after 0 is {pos_2000}")
-    print(f"the 3000th number after 0 is {pos_3000}")
     count = pos_1000 + pos_2000 + pos_3000
-    print(f"Result: {count}")
+    return count
 
 def test_1_test():
     input_file = Path('2022/20/input_test.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
+@pytest.mark.slow
 def test_1():
     input_file = Path('2022/20/input.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
 def test_2_test():
     input_file = Path('2022/20/input_test.txt')
     result = sol2(input_file)
-    print(result)
+    check_answer(input_file, 2, result)
 
+@pytest.mark.slow
 def test_2():
     input_file = Path('2022/20/input.txt')
     result = sol2(input_file)
-    print(result)
\ No newline at end of file
+    check_answer(input_file, 2, result)
\ No newline at end of file
@@ -9,12 +9,17 @@ import json
 from enum import Enum
 from functools import cmp_to_key
 import itertools
+from aoc.answers import Answer, check_answer
+from aoc import cache
 
 SUM_PATTERN = r'([a-z]{4}): ([a-z]{4}) \+ ([a-z]{4})'
 SUB_PATTERN = r'([a-z]{4}): ([a-z]{4}) - ([a-z]{4})'
 MULT_PATTERN = r'([a-z]{4}): ([a-z]{4}) \* ([a-z]{4})'
 DIV_PATTERN = r'([a-z]{4}): ([a-z]{4}) \/ ([a-z]{4})'
 LITERAL_PATTERN = r'([a-z]{4}): (\d+)'
+LABEL_LENGTH = 4
+# Bump when the parsed form changes, older cache entries are then ignored
+PARSER_VERSION = 1
 
 class Type(Enum):
     NONE=0
@@ -159,50 +164,66 @@ def process_line(line: str) -> Node:
     else:
         raise RuntimeError(f"Impossible")
 
-def sol1(input_file: Path) -> List[int]:
-    print(f"")
-    nodes: Dict[str, Node] = dict()
+def encode_label(label: str) -> int:
+    return int.from_bytes(label.encode(), 'big')
+
+def decode_label(code: int) -> str:
+    return code.to_bytes(LABEL_LENGTH, 'big').decode()
+
+def parse_monkeys(input_file: Path) -> List[Tuple[int, int, int, int, int]]:
+    # (label, type, op1, op2, value) with the labels packed into ints and
+    # Type.NONE for literals
+    monkeys = list()
     with input_file.open('r') as inf:
-        for idx, line in enumerate(inf):
-            line = line.strip()
-            node = process_line(line)
-            nodes[node.label] = node
+        for line in inf:
+            node = process_line(line.strip())
+            if isinstance(node, Operation):
+                monkeys.append((encode_label(node.label), node.type.value, encode_label(node.op1_label), encode_label(node.op2_label), 0))
+            else:
+                monkeys.append((encode_label(node.label), Type.NONE.value, 0, 0, int(node.value)))
+    return monkeys
+
+def get_nodes(input_file: Path) -> Dict[str, Node]:
+    nodes: Dict[str, Node] = dict()
+    flat = cache.load_records(input_file, 'day21.monkeys', PARSER_VERSION, 5, parse_monkeys)
+    for label, type, op1, op2, value in cache.records(flat, 5):
+        label = decode_label(label)
+        if type == Type.NONE.value:
+            nodes[label] = Literal(label, float(value))
+        else:
+            nodes[label] = Operation(label, Type(type), decode_label(op1), decode_label(op2))
     for node in nodes.values():
         node.connect(nodes)
+    return nodes
+
+def sol1(input_file: Path) -> Answer:
+    nodes = get_nodes(input_file)
     root = nodes["root"]
     result = root.resolve()
-    print(f"Result: {result}")
+    return round(result)
 
-def sol2(input_file: Path) -> List[int]:
-    print(f"")
-    nodes: Dict[str, Node] = dict()
-    with input_file.open('r') as inf:
-        for idx, line in enumerate(inf):
-            line = line.strip()
-            node = process_line(line)
-            nodes[node.label] = node
-    for node in nodes.values():
-        node.connect(nodes)
+def sol2(input_file: Path) -> Answer:
+    nodes = get_nodes(input_file)
     root = nodes["root"]
     result = root.root_resolve()
-    print(f"Result: {result}")
+    return round(result)
 
 def test_1_test():
     input_file = Path('2022/21/input_test.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
 def test_1():
     input_file = Path('2022/21/input.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
 def test_2_test():
     input_file = Path('2022/21/input_test.txt')
     result = sol2(input_file)
-    print(result)
+    check_answer(input_file, 2, result)
 
 def test_2():
     input_file = Path('2022/21/input.txt')
     result = sol2(input_file)
-    print(result)
\ No newline at end of file
+    check_answer(input_file, 2, result)
\ No newline at end of file
@@ -6,21 +6,32 @@ import heapq
 from collections import OrderedDict, deque
 import re
 import json
-from enum import Enum
+from enum import Enum, IntEnum
 from functools import cmp_to_key
 import itertools
+from aoc.answers import Answer, check_answer
+from aoc.grid import Grid
+from aoc import trace
 
-class Tile(Enum):
+MAP_TRACE = trace.channel('day22.map')
+PATH_TRACE = trace.channel('day22.path')
+
+class Tile(IntEnum):
     NONE=0
     OPEN=1
     WALL=2
 
+TILES = {' ': Tile.NONE, '.': Tile.OPEN, '#': Tile.WALL}
+TILE_CHARS = {Tile.NONE: ' ', Tile.OPEN: '.', Tile.WALL: '#'}
+
 class Direction(Enum):
     UP=0
     DOWN=1
     RIGHT=2
     LEFT=3
 
+DIRECTION_CHARS = {Direction.UP: '^', Direction.DOWN: 'v', Direction.RIGHT: '>', Direction.LEFT: '<'}
+
 class Rotate(Enum):
     LEFT=0
     RIGHT=1
@@ -92,55 +103,44 @@ class CountCommand(Command):
         return self.count
 
 class Map:
-    def __init__(self):
-        self.rows: List[List[Tile]] = list()
+    # Off the map is Tile.NONE, padding included, so stepping onto NONE is
+    # what triggers a warp
+    def __init__(self, grid: Grid):
+        self.grid = grid
         self.min_col_edges: List[int] = list()
         self.max_col_edges: List[int] = list()
         self.min_row_edges: List[int] = list()
         self.max_row_edges: List[int] = list()
-        self.r = 0
-        self.c = 0
+        self.r = grid.rows
+        self.c = grid.cols
+        self.steps = {
+            Direction.UP: -grid.width,
+            Direction.DOWN: grid.width,
+            Direction.RIGHT: 1,
+            Direction.LEFT: -1,
+        }
         self.cursor: Tuple[int,int] = (0,0)
         self.facing: Direction = Direction.RIGHT
+        # Only filled while the day22.path channel is on
         self.path: Dict[Tuple[int,int], str] = dict()
         self.warp: Dict[Tuple[int,int, Direction], Tuple[int,int, Direction]] = dict()
-    def add_row(self, row: List[Tile], min: int, max: int):
-        self.rows.append(row)
-        self.min_col_edges.append(min)
-        self.max_col_edges.append(max)
-        print(f"Added row min: {min}, max: {max}")
     def finish_map(self):
-        self.r = len(self.rows)
+        grid = self.grid
+        for r in range(self.r):
+            tiles = [c for c, tile in enumerate(grid.row(r)) if tile != Tile.NONE]
+            self.min_col_edges.append(tiles[0])
+            self.max_col_edges.append(tiles[-1])
+            if MAP_TRACE.on:
+                MAP_TRACE.emit("Added row min: %d, max: %d", tiles[0], tiles[-1])
         self.cursor = (0, self.min_col_edges[0])
-        # Make all rows same length
-        maxcols = 0
-        for row in self.rows:
-            if len(row) > maxcols:
-                maxcols = len(row)
-        self.c = maxcols
-        for row in self.rows:
-            missing_cols = self.c - len(row)
-            for i in range(0, missing_cols):
-                row.append(Tile.NONE)
-        self.path[self.cursor] = ">"
-        for c in range(0, self.c):
-            minr = 0
-            maxr = self.r - 1
-            start_map = False
-            for r in range(0, self.r):
-                row = self.rows[r]
-                tile = row[c]
-                if tile == Tile.NONE:
-                    if start_map:
-                        start_map = False
-                        maxr = r - 1
-                elif tile == Tile.OPEN or tile == Tile.WALL:
-                    if not start_map:
-                        start_map = True
-                        minr = r
-                else:
-                    raise RuntimeError(f"Impossible")
-            print(f"For column {c} min: {minr}, maxr: {maxr}")
+        if PATH_TRACE.on:
+            self.path[self.cursor] = ">"
+        for c in range(self.c):
+            tiles = [r for r in range(self.r) if grid[r, c] != Tile.NONE]
+            minr = tiles[0]
+            maxr = tiles[-1]
+            if MAP_TRACE.on:
+                MAP_TRACE.emit("For column %d min: %d, maxr: %d", c, minr, maxr)
             self.max_row_edges.append(maxr)
             self.min_row_edges.append(minr)
         # Warp points
@@ -259,9 +259,7 @@ class Map:
             self.warp[minpos] = (199,c-100,Direction.UP) #OK
             self.warp[maxpos] = (c-50,99,Direction.LEFT) #OK
     def get_tile(self, row_idx: int, col_idx: int) -> Tile:
-        row = self.rows[row_idx]
-        tile = row[col_idx]
-        return tile
+        return Tile(self.grid[row_idx, col_idx])
     def rotate_right(self):
         dir = self.facing
         if dir == Direction.UP:
@@ -294,127 +292,62 @@ class Map:
             raise RuntimeError(f"Impossible")
         direction: Direction = self.facing
         total = command.get_count()
-        r, c = self.cursor
+        grid = self.grid
+        cells = grid.cells
+        trace_path = PATH_TRACE.on
+        idx = grid.index(*self.cursor)
+        step = self.steps[direction]
+        if trace_path:
+            self.path[self.cursor] = DIRECTION_CHARS[direction]
         count = 0
-        dr, dc = 0,0
-        dir_str = ""
-        if direction == Direction.UP:
-            dr = -1
-            dir_str = "^"
-        elif direction == Direction.DOWN:
-            dr = 1
-            dir_str = "v"
-        elif direction == Direction.RIGHT:
-            dc = 1
-            dir_str = ">"
-        elif direction == Direction.LEFT:
-            dc = -1
-            dir_str = "<"
-        else:
-            raise RuntimeError(f"Impossible")
-        self.path[(r,c)] = dir_str
         while count < total:
-            nr = r + dr
-            nc = c + dc
-            if nr < self.min_row_edges[c] or nc < self.min_col_edges[r] or nr > self.max_row_edges[c] or nc > self.max_col_edges[r]:
+            nidx = idx + step
+            ntile = cells[nidx]
+            ndirection = direction
+            if ntile == Tile.NONE:
                 # Warping!
+                r, c = grid.position(idx)
                 nr, nc, ndirection = self.warp[(r,c,direction)]
-                ntile = self.rows[nr][nc]
-                if ntile == Tile.WALL:
-                    break
-                elif ntile == Tile.NONE:
+                nidx = grid.index(nr, nc)
+                ntile = cells[nidx]
+                if ntile == Tile.NONE:
                     raise RuntimeError(f"Bad warping from ({r},{c},{direction}) to ({nr},{nc},{ndirection})")
-                elif ntile == Tile.OPEN:
-                    # Advance cursor
-                    r = nr
-                    c = nc
-                    direction = ndirection
-                    if direction == Direction.UP:
-                        dr = -1
-                        dc = 0
-                        dir_str = "^"
-                    elif direction == Direction.DOWN:
-                        dr = 1
-                        dc = 0
-                        dir_str = "v"
-                    elif direction == Direction.RIGHT:
-                        dr = 0
-                        dc = 1
-                        dir_str = ">"
-                    elif direction == Direction.LEFT:
-                        dr = 0
-                        dc = -1
-                        dir_str = "<"
-                    else:
-                        raise RuntimeError(f"Impossible")
-                    self.path[(r,c)] = dir_str
-                    count += 1
-            else:
-                nrow = self.rows[nr]
-                ntile = nrow[nc]
-                if ntile == Tile.WALL:
-                    # Blocked by wall
-                    break
-                elif ntile == Tile.NONE:
-                    raise RuntimeError(f"Impossible")
-                else:
-                    # Advance cursor
-                    r = nr
-                    c = nc
-                    self.path[(r,c)] = dir_str
-                    count += 1
-        self.cursor = (r,c)
+            if ntile == Tile.WALL:
+                # Blocked by wall
+                break
+            # Advance cursor
+            idx = nidx
+            direction = ndirection
+            step = self.steps[direction]
+            if trace_path:
+                self.path[grid.position(idx)] = DIRECTION_CHARS[direction]
+            count += 1
+        self.cursor = grid.position(idx)
         self.facing = direction
         return self.cursor
-    def print(self):
-        print("")
-        for r, row in enumerate(self.rows):
-            row_str = ""
-            for c, tile in enumerate(row):
-                if (r,c) in self.path:
-                    val = self.path[(r,c)]
-                else:
-                    if tile == Tile.NONE:
-                        val = " "
-                    elif tile == Tile.OPEN:
-                        val = "."
-                    elif tile == Tile.WALL:
-                        val = "#"
-                    else:
-                        raise RuntimeError(f"Impossible")
-                row_str += val
-            print(row_str)
-        print(f"")
+    def render(self) -> str:
+        lines = self.grid.render(TILE_CHARS).split('\n')
+        for (r, c), val in self.path.items():
+            lines[r] = lines[r][:c] + val + lines[r][c + 1:]
+        return '\n'.join(lines)
 
-def process_line(line: str, map: Map) -> Map:
-    row: List[Tile] = list()
-    min_idx = 0
-    max_idx = float('inf')
-    map_started = False
-    for idx, c in enumerate(line):
-        if c == ' ':
-            if map_started:
-                max_idx = idx - 1
-                map_started = False
-            row.append(Tile.NONE)
-        elif c == '.':
-            if not map_started:
-                min_idx = idx
-                map_started = True
-            row.append(Tile.OPEN)
-        elif c == '#':
-            if not map_started:
-                min_idx = idx
-                map_started = True
-            row.append(Tile.WALL)
-        elif c == "\n":
-            if map_started:
-                max_idx = idx - 1
-                map_started = False
-        else:
-            raise RuntimeError(f"Impossible")
-    map.add_row(row, min_idx, max_idx)
-    return map
+def get_input(input_file: Path) -> Tuple[Map, List[Command]]:
+    start_dir = Direction.RIGHT
+    lines = list()
+    path = None
+    parsing_map = True
+    with input_file.open('r') as inf:
+        for idx, line in enumerate(inf):
+            strip_line = line.strip()
+            if parsing_map:
+                if strip_line:
+                    lines.append(line.rstrip('\n'))
+                else:
+                    parsing_map = False
+            else:
+                path = process_ins(line, start_dir)
+    map = Map(Grid.from_lines(lines, TILES, Tile.NONE))
+    return map, path
 
 def process_ins(line: str, start_dir: Direction) -> List[Command]:
     dir = start_dir
@@ -442,26 +375,13 @@ def process_ins(line: str, start_dir: Direction) -> List[Command]:
     result.append(cmd)
     return result
 
-def sol1(input_file: Path) -> List[int]:
-    print(f"")
-    map = Map()
-    start_dir = Direction.RIGHT
-    path = None
-    parsing_map = True
-    with input_file.open('r') as inf:
-        for idx, line in enumerate(inf):
-            strip_line = line.strip()
-            if parsing_map:
-                if strip_line:
-                    process_line(line, map)
-                else:
-                    parsing_map = False
-            else:
-                path = process_ins(line, start_dir)
+def sol1(input_file: Path) -> Answer:
+    map, path = get_input(input_file)
     map.finish_map()
     for ins in path:
         map.move_cursor(ins)
-    map.print()
+    if PATH_TRACE.on:
+        PATH_TRACE.emit("\n%s", map.render())
     row, col = map.cursor
     dir = None
     if map.facing == Direction.UP:
@@ -474,26 +394,11 @@ def sol1(input_file: Path) -> List[int]:
         dir = 2
     else:
         raise RuntimeError(f"Impossible")
-    print(f"R:{row+1}, C:{col+1}, F:{dir}")
     result = 1000 * (row + 1) + 4 * (col + 1) + dir
-    print(f"Result: {result}")
+    return result
 
-def sol2(input_file: Path, test: bool) -> List[int]:
-    print(f"")
-    map = Map()
-    start_dir = Direction.RIGHT
-    path = None
-    parsing_map = True
-    with input_file.open('r') as inf:
-        for idx, line in enumerate(inf):
-            strip_line = line.strip()
-            if parsing_map:
-                if strip_line:
-                    process_line(line, map)
-                else:
-                    parsing_map = False
-            else:
-                path = process_ins(line, start_dir)
+def sol2(input_file: Path, test: bool = False) -> Answer:
+    map, path = get_input(input_file)
     map.finish_map()
     if test:
         map.cube_warping_test()
@@ -501,7 +406,8 @@ def sol2(input_file: Path, test: bool) -> List[int]:
         map.cube_warping()
     for ins in path:
         map.move_cursor(ins)
-    map.print()
+    if PATH_TRACE.on:
+        PATH_TRACE.emit("\n%s", map.render())
     row, col = map.cursor
     dir = None
     if map.facing == Direction.UP:
@@ -514,26 +420,25 @@ def sol2(input_file: Path, test: bool) -> List[int]:
         dir = 2
     else:
         raise RuntimeError(f"Impossible")
-    print(f"R:{row+1}, C:{col+1}, F:{dir}")
     result = 1000 * (row + 1) + 4 * (col + 1) + dir
-    print(f"Result: {result}")
+    return result
 
 def test_1_test():
     input_file = Path('2022/22/input_test.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
 def test_1():
     input_file = Path('2022/22/input.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
 def test_2_test():
     input_file = Path('2022/22/input_test.txt')
     result = sol2(input_file, True)
-    print(result)
+    check_answer(input_file, 2, result, test=True)
 
 def test_2():
     input_file = Path('2022/22/input.txt')
     result = sol2(input_file, False)
-    print(result)
\ No newline at end of file
+    check_answer(input_file, 2, result)
\ No newline at end of file
@@ -9,213 +9,157 @@ import json
 from enum import Enum
 from functools import cmp_to_key
 import itertools
+from aoc.answers import Answer, check_answer
+from aoc import bits, trace
 
-DIRECTIONS = [(-1,0), (1,0), (0,-1), (0,1)]
-NEIGHBORS = [
-    [(-1,-1), (-1,0), (-1,1)],
-    [(1,-1), (1,0), (1,1)],
-    [(-1,-1), (0,-1), (1,-1)],
-    [(-1,1), (0,1), (1,1)]
-]
+ROUND_TRACE = trace.channel('day23.round')
+
+# Proposal order at the first round
+NORTH, SOUTH, WEST, EAST = range(4)
+# Free columns added on the west side whenever an elf reaches column 0
+MARGIN = 16
 
 class Map:
-    def __init__(self):
-        self.elves: List[Tuple[int,int]] = list()
+    # One bitboard row per map row, bit c is an elf in column c. Every rule of
+    # a round is a few shifts and masks on whole rows instead of eight probes
+    # per elf
+    def __init__(self, rows: List[int]):
+        self.rows = rows
+        self.count = sum(bits.popcount(row) for row in rows)
         self.dir_idx: int  = 0
-        self.positions: Set[Tuple[int,int]] = set()
         self.destiny: bool = False
-    def add_elf(self, pos: Tuple[int,int]):
-        self.elves.append(pos)
-        self.positions.add(pos)
+    def pad(self):
+        # An empty row above and below and a free column 0, so that every
+        # move lands inside the board
+        rows = self.rows
+        if not rows or rows[0]:
+            rows.insert(0, 0)
+        if rows[-1]:
+            rows.append(0)
+        if any(row & 1 for row in rows):
+            self.rows = [row << MARGIN for row in rows]
+    def positions(self) -> List[Tuple[int,int]]:
+        return [(r, c) for r, row in enumerate(self.rows) for c in bits.bits(row)]
     def get_rectangle(self) -> Tuple[int,int,int,int]:
-        minr = float('inf')
-        maxr = 0
-        minc = float('inf')
-        maxc = 0
-        for r,c in self.elves:
-            if r > maxr:
-                maxr = r
-            if r < minr:
-                minr = r
-            if c > maxc:
-                maxc = c
-            if c < minc:
-                minc = c
-        return (minr, maxr, minc, maxc)
-    def elf_alone(self, idx: int) -> bool:
-        r,c = self.elves[idx]
-        adjancent = [(-1,-1),(-1,0),(-1,1),(0,-1),(0,1),(1,-1),(1,0),(1,1)]
-        for dr, dc in adjancent:
-            nr, nc = r + dr, c + dc
-            if (nr,nc) in self.positions:
-                return False
-        return True
-    def has_no_neighbor(self, idx: int, dir_idx: int) -> bool:
-        r,c = self.elves[idx]
-        for dr, dc in NEIGHBORS[dir_idx]:
-            nr, nc = r + dr, c + dc
-            if (nr,nc) in self.positions:
-                return False
-        return True
-    def get_proposed_position(self, idx: int) -> Tuple[int, int]:
-        r,c = self.elves[idx]
-        if self.elf_alone(idx):
-            return (r,c)
-        else:
-            dir = self.dir_idx
-            dr, dc = DIRECTIONS[dir]
-            if self.has_no_neighbor(idx, dir):
-                return (r+dr,c+dc)
-            else:
-                dir = (self.dir_idx + 1) % 4
-                dr, dc = DIRECTIONS[dir]
-                if self.has_no_neighbor(idx, dir):
-                    return (r+dr,c+dc)
-                else:
-                    dir = (self.dir_idx + 2) % 4
-                    dr, dc = DIRECTIONS[dir]
-                    if self.has_no_neighbor(idx, dir):
-                        return (r+dr,c+dc)
-                    else:
-                        dir = (self.dir_idx + 3) % 4
-                        dr, dc = DIRECTIONS[dir]
-                        if self.has_no_neighbor(idx, dir):
-                            return (r+dr,c+dc)
-                        else:
-                            return (r,c)
-    def get_proposed_positions(self) -> List[Tuple[int,int]]:
-        result = list()
-        for idx, pos in enumerate(self.elves):
-            proposal = self.get_proposed_position(idx)
-            result.append(proposal)
-        return result
-    def move_elves(self, proposed_positions: List[Tuple[int,int]]):
-        move = [True for _ in self.elves]
-        all_proposed = dict()
-        for idx, pos in enumerate(proposed_positions):
-            if pos in all_proposed:
-                move[idx] = False
-                old_idx = all_proposed[pos]
-                move[old_idx] = False
-            else:
-                all_proposed[pos] = idx
+        used = [r for r, row in enumerate(self.rows) if row]
+        minc, maxc = bits.columns(self.rows)
+        return (min(used), max(used), minc, maxc)
+    def get_proposals(self) -> List[List[int]]:
+        # proposals[dir][r] has the elves of row r that propose to move to dir
+        rows = self.rows
+        proposals = [[0] * len(rows) for _ in range(4)]
+        for r in range(1, len(rows) - 1):
+            row = rows[r]
+            if not row:
+                continue
+            up = rows[r - 1]
+            down = rows[r + 1]
+            around = up | row | down
+            taken = [bits.spread(up), bits.spread(down), bits.west(around), bits.east(around)]
+            # Elves with nobody around stay
+            left = row & (taken[NORTH] | taken[SOUTH] | taken[WEST] | taken[EAST])
+            for turn in range(4):
+                dir = (self.dir_idx + turn) % 4
+                moving = left & ~taken[dir]
+                proposals[dir][r] = moving
+                left &= ~moving
+        return proposals
+    def move_elves(self, proposals: List[List[int]]):
+        # Two elves can only propose the same cell from opposite sides, two
+        # rows or two columns apart, and then neither moves
+        north, south, west, east = proposals
+        rows = self.rows
+        new_rows = list(rows)
+        n = len(rows)
         someone_moved = False
-        for idx, (allow, pos) in enumerate(zip(move, proposed_positions)):
-            if allow:
-                old_pos = self.elves[idx]
-                if old_pos != pos:
-                    self.positions.remove(old_pos)
-                    self.elves[idx] = pos
-                    self.positions.add(pos)
-                    someone_moved = True
+        for r in range(1, n - 1):
+            north_ok = north[r] & ~(south[r - 2] if r >= 2 else 0)
+            south_ok = south[r] & ~(north[r + 2] if r + 2 < n else 0)
+            west_ok = west[r] & ~(east[r] << 2)
+            east_ok = east[r] & ~(west[r] >> 2)
+            movers = north_ok | south_ok | west_ok | east_ok
+            if not movers:
+                continue
+            someone_moved = True
+            new_rows[r] &= ~movers
+            new_rows[r] |= west_ok >> 1 | east_ok << 1
+            new_rows[r - 1] |= north_ok
+            new_rows[r + 1] |= south_ok
+        self.rows = new_rows
         if not someone_moved:
             # Destiny reached
             self.destiny = True
     def round(self):
-        ppos = self.get_proposed_positions()
-        self.move_elves(ppos)
+        self.pad()
+        self.move_elves(self.get_proposals())
         self.dir_idx = (self.dir_idx + 1) % 4
     def get_empty_positions(self) -> int:
         minr, maxr, minc, maxc = self.get_rectangle()
-        count = 0
-        for r in range(minr, maxr + 1):
-            for c in range(minc, maxc + 1):
-                pos = (r,c)
-                if (r,c) in self.positions:
-                    continue
-                else:
-                    count += 1
-        return count
-    def print(self):
+        return (maxr - minr + 1) * (maxc - minc + 1) - self.count
+    def render(self) -> str:
         minr, maxr, minc, maxc = self.get_rectangle()
-        rows = list()
-        for r in range(minr, maxr + 1):
-            row = list()
-            for c in range(minc, maxc + 1):
-                row.append('.')
-            rows.append(row)
-        for r,c in self.elves:
-            rows[r-minr][c-minc] = '#'
-        print("")
-        for row in rows:
-            row_str = ''.join(row)
-            print(row_str)
-        print(f"")
-
-def process_line(line: str, r: int, map: Map) -> Map:
-    for idx, c in enumerate(line):
-        if c == '.':
-            continue
-        elif c == '#':
-            map.add_elf((r,idx))
-        else:
-            raise RuntimeError(f"Impossible")
-    return map
+        rows = [row >> minc for row in self.rows[minr:maxr + 1]]
+        return '\n'.join(bits.from_rows(rows, maxc - minc + 1))
 
-def sol1(input_file: Path) -> List[int]:
-    print(f"")
-    map = Map()
+def get_map(input_file: Path) -> Map:
     with input_file.open('r') as inf:
-        for idx, line in enumerate(inf):
-            line = line.strip()
-            process_line(line, idx, map)
-    map.print()
+        lines = [line.strip() for line in inf if line.strip()]
+    return Map(bits.to_rows(lines))
+
+def sol1(input_file: Path) -> Answer:
+    map = get_map(input_file)
+    if ROUND_TRACE.on:
+        ROUND_TRACE.emit("Initial state\n%s", map.render())
     for round in range(0,10):
         map.round()
-        print(f"Round {round+1}")
-        map.print()
+        if ROUND_TRACE.on:
+            ROUND_TRACE.emit("Round %d\n%s", round + 1, map.render())
         if map.destiny:
-            print(f"Destiny reached at round {round+1}")
+            ROUND_TRACE.emit("Destiny reached at round %d", round + 1)
             break
-    minr, maxr, minc, maxc = map.get_rectangle()
-    print(f"N:{minr}, S:{maxr}, W:{minc}, E:{maxc}")
+    if ROUND_TRACE.on:
+        ROUND_TRACE.emit("N:%d, S:%d, W:%d, E:%d", *map.get_rectangle())
     count = map.get_empty_positions()
-    print(f"Result: {count}")
+    return count
 
-def sol2(input_file: Path) -> List[int]:
-    print(f"")
-    map = Map()
-    with input_file.open('r') as inf:
-        for idx, line in enumerate(inf):
-            line = line.strip()
-            process_line(line, idx, map)
-    map.print()
+def sol2(input_file: Path) -> Answer:
+    map = get_map(input_file)
     round = 0
     while True:
         map.round()
         if map.destiny:
-            print(f"Destiny reached at round {round+1}")
+            ROUND_TRACE.emit("Destiny reached at round %d", round + 1)
             break
         else:
             round += 1
-    print(f"Result: {round+1}")
+    return round + 1
 
 def test_1_test_small():
     input_file = Path('2022/23/input_test_small.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
 def test_1_test():
     input_file = Path('2022/23/input_test.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
 def test_1():
     input_file = Path('2022/23/input.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
 def test_2_test_small():
     input_file = Path('2022/23/input_test_small.txt')
     result = sol2(input_file)
-    print(result)
+    check_answer(input_file, 2, result)
 
 def test_2_test():
     input_file = Path('2022/23/input_test.txt')
     result = sol2(input_file)
-    print(result)
+    check_answer(input_file, 2, result)
 
 def test_2():
     input_file = Path('2022/23/input.txt')
     result = sol2(input_file)
-    print(result)
\ No newline at end of file
+    check_answer(input_file, 2, result)
\ No newline at end of file
@@ -1,5 +1,5 @@
 import pytest
-from typing import Optional, List, Tuple, Set, Dict
+from typing import Optional, List, Tuple, Set, Dict, Union
 from pathlib import Path
 from queue import PriorityQueue
 import heapq
@@ -11,6 +11,9 @@ from enum import Enum, IntEnum
 from functools import cmp_to_key
 import itertools
 import math
+from aoc.answers import Answer, check_answer
+from aoc import search
+from aoc.grid import Grid
 
 DIRECTIONS = [(-1,0), (1,0), (0,-1), (0,1)]
 POSSIBLE_DIRECTIONS = [(0,0), (-1,0), (1,0), (0,-1), (0,1)]
@@ -24,7 +27,7 @@ NEIGHBORS = [
 def lcm(a, b):
     return abs(a*b) // math.gcd(a, b)
 
-class Tile(Enum):
+class Tile(IntEnum):
     NONE=0
     WALL=1
 
@@ -34,284 +37,136 @@ class Direction(IntEnum):
     LEFT=2
     RIGHT=3
 
+TILES = {'.': Tile.NONE, '#': Tile.WALL, '>': Tile.NONE, '<': Tile.NONE, '^': Tile.NONE, 'v': Tile.NONE}
+BLIZZARDS = {'>': Direction.RIGHT, '<': Direction.LEFT, '^': Direction.UP, 'v': Direction.DOWN}
+BLIZZARD_CHARS = {Direction.UP: '^', Direction.DOWN: 'v', Direction.LEFT: '<', Direction.RIGHT: '>'}
+
 class Map:
-    def __init__(self):
-        self.grid: List[List[Tile]] = list()
-        self.blizzards: List[Tuple[int,int]] = list()
+    # Walls, blizzards and positions are flat indexes of a grid padded with
+    # walls, so nobody ever leaves it through the entrance or the exit
+    def __init__(self, lines: List[str]):
+        self.grid = Grid.from_lines(lines, TILES, Tile.NONE, pad_value=Tile.WALL)
+        self.blizzards: List[int] = list()
         self.blizzard_directions: List[Direction] = list()
-        self.blizzard_grid: List[List[int]] = list()
-        self.blizzard_grids: List[List[List[int]]] = list()
-        self.r = 0
-        self.c = 0
+        self.blizzard_grid = Grid(self.grid.rows, self.grid.cols)
+        self.blizzard_grids: List[bytes] = list()
+        self.r = self.grid.rows
+        self.c = self.grid.cols
         self.n = 0
         self.start_pos: Tuple[int,int] = (0,1)
-        self.end_pos: Tuple[int,int] = (0,1)
-    def add_row(self, row: List[Tile]):
-        self.grid.append(row)
-        brow = [0 for _ in row]
-        self.blizzard_grid.append(brow)
+        self.end_pos: Tuple[int,int] = (self.r-1,self.c-2)
+        width = self.grid.width
+        self.steps = [dr * width + dc for dr, dc in DIRECTIONS]
+        self.moves = [dr * width + dc for dr, dc in POSSIBLE_DIRECTIONS]
+        # Where a blizzard reappears, relative to the wall it ran into
+        self.wraps = [(self.r - 2) * width, -(self.r - 2) * width, self.c - 2, -(self.c - 2)]
+        for r, line in enumerate(lines):
+            for c, char in enumerate(line):
+                if char in BLIZZARDS:
+                    self.add_blizzard((r,c), BLIZZARDS[char])
     def add_blizzard(self, pos: Tuple[int,int], dir: Direction):
-        self.blizzards.append(pos)
+        idx = self.grid.index(*pos)
+        self.blizzards.append(idx)
         self.blizzard_directions.append(dir)
-        r,c = pos
-        self.blizzard_grid[r][c] = 1
+        self.blizzard_grid.cells[idx] += 1
     def compute_all_blizzard_grids(self):
         wrapr = self.r-2
         wrapc = self.c-2
         self.n = lcm(wrapr,wrapc)
         for i in range(self.n):
             self.update_blizzars()
-            grid = copy.deepcopy(self.blizzard_grid)
-            self.blizzard_grids.append(grid)
+            self.blizzard_grids.append(self.blizzard_grid.snapshot())
         return
     def update_blizzars(self):
-        n = len(self.blizzards)
-        for idx in range(0,n):
-            r,c = self.blizzards[idx]
-            dir = self.blizzard_directions[idx]
-            dr, dc = DIRECTIONS[int(dir)]
-            nr,nc = r+dr, c+dc
-            tile = self.grid[nr][nc]
-            if tile == Tile.NONE:
-                # Free to move
-                self.blizzards[idx] = (nr,nc)
-                self.blizzard_grid[r][c] -= 1
-                self.blizzard_grid[nr][nc] += 1
-            elif tile == Tile.WALL:
+        walls = self.grid.cells
+        counts = self.blizzard_grid.cells
+        for idx, dir in enumerate(self.blizzard_directions):
+            pos = self.blizzards[idx]
+            npos = pos + self.steps[dir]
+            if walls[npos] == Tile.WALL:
                 # Warp around
-                if dir == Direction.UP:
-                    nr, nc = self.r-2, c
-                elif dir == Direction.DOWN:
-                    nr, nc = 1, c
-                elif dir == Direction.LEFT:
-                    nr, nc = r, self.c-2
-                elif dir == Direction.RIGHT:
-                    nr, nc = r, 1
-                else:
-                    raise RuntimeError(f"Impossible")
-                tile = self.grid[nr][nc]
-                if tile != Tile.NONE:
-                    raise RuntimeError(f"Impossible")
-                self.blizzards[idx] = (nr,nc)
-                self.blizzard_grid[r][c] -= 1
-                self.blizzard_grid[nr][nc] += 1
-            else:
-                raise RuntimeError(f"Impossible")
-    def finish_map(self):
-        self.r = len(self.grid)
-        self.c = len(self.grid[0])
-        self.end_pos = (self.r-1,self.c-2)
-    def print(self):
-        rows = list()
-        for r in self.grid:
-            row = list()
-            for tile in r:
-                if tile == Tile.NONE:
-                    row.append('.')
-                elif tile == Tile.WALL:
-                    row.append('#')
-                else:
+                npos += self.wraps[dir]
+                if walls[npos] != Tile.NONE:
                     raise RuntimeError(f"Impossible")
-            rows.append(row)
-        for pos,dir in zip(self.blizzards, self.blizzard_directions):
-            r,c = pos
-            count = self.blizzard_grid[r][c]
-            if count > 1:
-                rows[r][c] = str(count)
-            elif dir == Direction.UP:
-                rows[r][c] = '^'
-            elif dir == Direction.DOWN:
-                rows[r][c] = 'v'
-            elif dir == Direction.LEFT:
-                rows[r][c] = '<'
-            elif dir == Direction.RIGHT:
-                rows[r][c] = '>'
-            else:
-                raise RuntimeError(f"Impossible")
-        print("")
-        for row in rows:
-            row_str = ''.join(row)
-            print(row_str)
-        print(f"")
-    def print_blizzard(self, idx: int):
-        rows = list()
-        for r in self.grid:
-            row = list()
-            for tile in r:
-                if tile == Tile.NONE:
-                    row.append('.')
-                elif tile == Tile.WALL:
-                    row.append('#')
-                else:
-                    raise RuntimeError(f"Impossible")
-            rows.append(row)
-        grid = self.blizzard_grids[idx]
-        for r, row in enumerate(grid):
-            for c, count in enumerate(row):
+            self.blizzards[idx] = npos
+            counts[pos] -= 1
+            counts[npos] += 1
+    def render_blizzard(self, counts: Union[bytes, bytearray], directions: bool = False) -> str:
+        rows = [list(row) for row in self.grid.render({Tile.NONE: '.', Tile.WALL: '#'}).split('\n')]
+        for r in range(self.r):
+            for c in range(self.c):
+                count = counts[self.grid.index(r, c)]
                 if count > 0:
                     rows[r][c] = str(count)
-        print("")
-        for row in rows:
-            row_str = ''.join(row)
-            print(row_str)
-        print(f"")
-    def dfs(self, time: int, pos: Tuple[int, int], best_time: int, visited: Dict[Tuple[Tuple[int,int],int], int]) -> int:
-        if time > best_time:
-            return best_time
-        if pos == self.end_pos:
-            return time
-        state = (time % self.n)
-        bgrid = self.blizzard_grids[state]
-        r,c = pos
-        min_time = best_time
-        found = False
-        for dr,dc in POSSIBLE_DIRECTIONS:
-            nr,nc = r+dr, c+dc
-            if nr < 0 or nr >= self.r:
-                continue
-            if nc < 0 or nc >= self.c:
-                continue
-            tile = self.grid[nr][nc]
-            if tile == Tile.WALL:
-                continue
-            if bgrid[nr][nc] > 0:
-                continue
-            ntime = time + 1
-            nstate = (state + 1) % self.n
-            npos = (nr,nc)
-            v = visited.get((npos, nstate))
-            if not v or v > ntime:
-                visited[(npos,nstate)] = ntime
-                result = self.dfs(ntime, npos, min_time, visited)
-                found = True
-                if result < min_time:
-                    min_time = result
-        if not found:
-            visited[(pos,state)] = 0
-        return min_time
-    def dijkstra(self, time: int, state: int, start_pos: Tuple[int,int], end_pos: Tuple[int,int]) -> Tuple[int,int]:
+        if directions:
+            for pos, dir in zip(self.blizzards, self.blizzard_directions):
+                if counts[pos] == 1:
+                    r, c = self.grid.position(pos)
+                    rows[r][c] = BLIZZARD_CHARS[dir]
+        return '\n'.join(''.join(row) for row in rows)
+    def travel(self, time: int, start_pos: Tuple[int,int], end_pos: Tuple[int,int]) -> int:
+        # Blizzards repeat every n minutes, so the state at a given time is the
+        # position plus time % n. The search only keeps the positions reachable
+        # at the current minute instead of every (position, state) pair
         n = self.n
-        pos = start_pos
-        visited = dict()
-        visited[(pos,state)] = 0
-        pq = []
-        heapq.heappush(pq, (time, (pos, state)))
-        while len(pq) > 0:
-            time, (pos, state) = heapq.heappop(pq)
-            if pos == end_pos:
-                return (time, state)
-            ntime = time + 1
-            nstate = (state + 1) % n
-            ngrid = self.blizzard_grids[nstate]
-            r,c = pos
-            found = False
-            for dr,dc in POSSIBLE_DIRECTIONS:
-                nr,nc = r+dr, c+dc
-                npos = (nr,nc)
-                if nr < 0 or nc < 0:
-                    continue
-                if nr >= self.r or nc >= self.c:
-                    continue
-                tile = self.grid[nr][nc]
-                if tile == Tile.WALL:
-                    continue
-                if ngrid[nr][nc] > 0:
-                    continue
-                v = visited.get((npos,nstate))
-                if not v or v > ntime:
-                    # Worth visiting
-                    visited[(npos, nstate)] = ntime
-                    heapq.heappush(pq, (ntime, (npos, nstate)))
-                    found = True
-            if not found:
-                # This state is pointless
-                visited[(npos, nstate)] = 0
-        return (-1,state)
-
+        walls = self.grid.cells
+        moves = self.moves
+        grids = self.blizzard_grids
+        def neighbors(pos: int, step: int) -> List[int]:
+            ngrid = grids[(time + step) % n]
+            return [pos + move for move in moves if walls[pos + move] != Tile.WALL and ngrid[pos + move] == 0]
+        # Waiting at the start is always possible, so the search is bounded by
+        # the number of (position, state) pairs when the end is unreachable
+        steps = search.layered_bfs(neighbors, [self.grid.index(*start_pos)], self.grid.index(*end_pos), n * len(walls))
+        if steps is None:
+            raise RuntimeError(f"No way from {start_pos} to {end_pos}")
+        return time + steps
 
-
-def process_line(line: str, r: int, map: Map) -> Map:
-    row = list()
-    blizzards = list()
-    for idx, c in enumerate(line):
-        if c == '.':
-            row.append(Tile.NONE)
-        elif c == '#':
-            row.append(Tile.WALL)
-        elif c == '>':
-            row.append(Tile.NONE)
-            blizzards.append(((r,idx), Direction.RIGHT))
-        elif c == '<':
-            row.append(Tile.NONE)
-            blizzards.append(((r,idx), Direction.LEFT))
-        elif c == '^':
-            row.append(Tile.NONE)
-            blizzards.append(((r,idx), Direction.UP))
-        elif c == 'v':
-            row.append(Tile.NONE)
-            blizzards.append(((r,idx), Direction.DOWN))
-        else:
-            raise RuntimeError(f"Impossible")
-    map.add_row(row)
-    for pos, dir in blizzards:
-        map.add_blizzard(pos, dir)
-    return map
-
-def sol1(input_file: Path) -> List[int]:
-    print(f"")
-    map = Map()
+def get_map(input_file: Path) -> Map:
     with input_file.open('r') as inf:
-        for idx, line in enumerate(inf):
-            line = line.strip()
-            process_line(line, idx, map)
-    map.finish_map()
+        lines = [line.strip() for line in inf if line.strip()]
+    return Map(lines)
+
+def sol1(input_file: Path) -> Answer:
+    map = get_map(input_file)
     map.compute_all_blizzard_grids()
-    #map.print()
-    #for i in range(map.n):
-    #    map.print_blizzard(i)
-    visited = dict()
-    #count = map.dfs(0, map.start_pos, float('inf'), visited) # Recursion depth exceeded!
-    count, state = map.dijkstra(0,0,map.start_pos, map.end_pos)
-    print(f"Result: {count+1}")
+    count = map.travel(0, map.start_pos, map.end_pos)
+    return count + 1
 
-def sol2(input_file: Path) -> List[int]:
-    print(f"")
-    map = Map()
-    with input_file.open('r') as inf:
-        for idx, line in enumerate(inf):
-            line = line.strip()
-            process_line(line, idx, map)
-    map.finish_map()
+def sol2(input_file: Path) -> Answer:
+    map = get_map(input_file)
     map.compute_all_blizzard_grids()
     # First travel
-    count, state = map.dijkstra(0,0,map.start_pos, map.end_pos)
+    count = map.travel(0, map.start_pos, map.end_pos)
     # Second part
-    count, state = map.dijkstra(count, state, map.end_pos, map.start_pos)
+    count = map.travel(count, map.end_pos, map.start_pos)
     # Third part
-    count, state = map.dijkstra(count, state, map.start_pos, map.end_pos)
-    print(f"Result: {count+1}")
+    count = map.travel(count, map.start_pos, map.end_pos)
+    return count + 1
 
 def test_1_test_small():
     input_file = Path('2022/24/input_test_small.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
 def test_1_test():
     input_file = Path('2022/24/input_test.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
+@pytest.mark.slow
 def test_1():
     input_file = Path('2022/24/input.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
 def test_2_test():
     input_file = Path('2022/24/input_test.txt')
     result = sol2(input_file)
-    print(result)
+    check_answer(input_file, 2, result)
 
+@pytest.mark.slow
 def test_2():
     input_file = Path('2022/24/input.txt')
     result = sol2(input_file)
-    print(result)
\ No newline at end of file
+    check_answer(input_file, 2, result)
\ No newline at end of file
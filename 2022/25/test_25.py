@@ -11,6 +11,7 @@ from enum import Enum, IntEnum
 from functools import cmp_to_key
 import itertools
 import math
+from aoc.answers import Answer, check_answer
 
 def process_line(line: str) -> int:
     number = 0
@@ -62,46 +63,45 @@ def to_snafu(number: int) -> str:
             remainder /= 5
     return result[::-1]
 
-def sol1(input_file: Path) -> List[int]:
-    print(f"")
+def sol1(input_file: Path) -> Answer:
     numbers = list()
     with input_file.open('r') as inf:
         for idx, line in enumerate(inf):
             line = line.strip()
             num = process_line(line)
             numbers.append(num)
-    print(numbers)
     total = sum(numbers)
     result = to_snafu(total)
-    print(f"Result: {result}")
+    return result
 
-def sol2(input_file: Path) -> List[int]:
-    pass
+def sol2(input_file: Path) -> Answer:
+    # Day 25 has no second puzzle
+    return None
 
 def test_1_small():
     input_file = Path('2022/25/input_test_small.txt')
     result = sol1(input_file)
-    for i in [1,2,3,4,5,6,7,8,9,10,15,20,2022,12345,314159265]:
-        num = to_snafu(i)
-        print(f"{i} = {num}")
-    print(result)
+    expected = {1: "1", 2: "2", 3: "1=", 4: "1-", 5: "10", 6: "11", 7: "12", 8: "2=", 9: "2-", 10: "20", 15: "1=0", 20: "1-0", 2022: "1=11-2", 12345: "1-0---0", 314159265: "1121-1110-1=0"}
+    for i, num in expected.items():
+        assert to_snafu(i) == num
+    check_answer(input_file, 1, result)
 
 def test_1_test():
     input_file = Path('2022/25/input_test.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
 def test_1():
     input_file = Path('2022/25/input.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
 def test_2_test():
     input_file = Path('2022/25/input_test.txt')
     result = sol2(input_file)
-    print(result)
+    check_answer(input_file, 2, result)
 
 def test_2():
     input_file = Path('2022/25/input.txt')
     result = sol2(input_file)
-    print(result)
\ No newline at end of file
+    check_answer(input_file, 2, result)
\ No newline at end of file
@@ -1,72 +1,176 @@
 import pytest
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Iterator
 from pathlib import Path
 from queue import PriorityQueue
 import heapq
+from aoc import parallel, reader, vector
+from aoc.answers import Answer, check_answer
 
 priorities = {
     'a': 1, 'b': 2, 'c': 3, 'd': 4, 'e': 5, 'f': 6, 'g': 7, 'h': 8, 'i': 9, 'j': 10, 'k': 11, 'l': 12, 'm': 13, 'n': 14, 'o': 15, 'p': 16, 'q': 17, 'r': 18, 's': 19, 't': 20, 'u': 21, 'v': 22, 'w': 23, 'x': 24, 'y': 25, 'z': 26,
     'A': 27, 'B': 28, 'C': 29, 'D': 30, 'E': 31, 'F': 32, 'G': 33, 'H': 34, 'I': 35, 'J': 36, 'K': 37, 'L': 38, 'M': 39, 'N': 40, 'O': 41, 'P': 42, 'Q': 43, 'R': 44, 'S': 45, 'T': 46, 'U': 47, 'V': 48, 'W': 49, 'X': 50, 'Y': 51, 'Z': 52
 }
 
+# Priority of every byte, 0 for bytes that are not items
+PRIORITY_TABLE = bytes(priorities.get(chr(byte), 0) for byte in range(256))
+ITEMS = ''.join(priorities).encode()
+
+def common_priority(*rucksacks: bytes) -> int:
+    # Set intersection runs in C, faster than building a bit mask per
+    # rucksack byte by byte
+    common = set(rucksacks[0]).intersection(*rucksacks[1:])
+    if len(common) != 1:
+        raise RuntimeError(f"Rucksacks {rucksacks} share {len(common)} items")
+    return PRIORITY_TABLE[common.pop()]
+
+def numpy_masks(data: reader.Buffer, start: int, end: int):
+    # Bit p set for an item of priority p, a rucksack is the OR of the bits
+    # of its items. Returns the bit of every byte and the start and length
+    # of every rucksack line
+    np = vector.numpy
+    raw = np.frombuffer(data, dtype=np.uint8, count=end - start, offset=start)
+    raw = raw[raw != ord('\r')]
+    if raw.size and raw[-1] != ord('\n'):
+        raw = np.append(raw, np.uint8(ord('\n')))
+    table = np.array([1 << priority if priority else 0 for priority in PRIORITY_TABLE], dtype=np.uint64)
+    item_bits = table[raw]
+    newline = raw == ord('\n')
+    if np.any(~newline & (item_bits == 0)):
+        raise RuntimeError(f"Bytes that are not items after byte {start}")
+    ends = np.flatnonzero(newline)
+    lengths = np.diff(ends, prepend=-1) - 1
+    filled = lengths > 0
+    return item_bits, (ends - lengths)[filled], lengths[filled]
+
+def numpy_priority_sum(common) -> int:
+    # Exactly one bit per rucksack group, its index is the priority
+    np = vector.numpy
+    if np.any((common == 0) | (common & (common - np.uint64(1)) != 0)):
+        raise RuntimeError("Rucksacks do not share exactly one item")
+    return int(np.rint(np.log2(common.astype(np.float64))).astype(np.int64).sum())
+
+def numpy_sum(data: reader.Buffer, start: int, end: int, part: int) -> int:
+    np = vector.numpy
+    item_bits, starts, lengths = numpy_masks(data, start, end)
+    if not starts.size:
+        return 0
+    if part == 2:
+        if starts.size % 3:
+            raise RuntimeError(f"Rucksacks after byte {start} are not in groups of three")
+        masks = np.bitwise_or.reduceat(item_bits, starts).reshape(-1, 3)
+        return numpy_priority_sum(np.bitwise_and.reduce(masks, axis=1))
+    if np.any(lengths % 2):
+        raise RuntimeError(f"Odd rucksacks after byte {start}")
+    # Segments alternate between first and second compartments, the second
+    # one runs up to the next rucksack over line breaks, which have no bits
+    bounds = np.empty(2 * starts.size, dtype=np.intp)
+    bounds[0::2] = starts
+    bounds[1::2] = starts + lengths // 2
+    masks = np.bitwise_or.reduceat(item_bits, bounds)
+    return numpy_priority_sum(masks[0::2] & masks[1::2])
+
+def python_rucksacks(data: reader.Buffer, start: int, end: int) -> Iterator[bytes]:
+    # The lines that are not blank, rejected like the NumPy engine does when
+    # they hold anything else than items
+    for line in reader.window_lines(data, start, end):
+        line = line.strip()
+        if line:
+            if line.translate(None, ITEMS):
+                raise RuntimeError(f"Bytes that are not items after byte {start}")
+            yield line
+
+def python_sum(data: reader.Buffer, start: int, end: int, part: int) -> int:
+    result = 0
+    rucksacks = python_rucksacks(data, start, end)
+    if part == 2:
+        # Three lines at a time, a window of the file at a time
+        group = list()
+        for values in rucksacks:
+            group.append(values)
+            if len(group) == 3:
+                result += common_priority(*group)
+                group.clear()
+        if group:
+            raise RuntimeError(f"Rucksacks after byte {start} are not in groups of three")
+        return result
+    for values in rucksacks:
+        if len(values) % 2:
+            raise RuntimeError(f"Odd rucksacks after byte {start}")
+        A = values[:len(values)//2]
+        B = values[len(values)//2:]
+        result += common_priority(A, B)
+    return result
+
+def priority_sum(data: reader.Buffer, start: int, end: int, part: int, engine: str = 'auto') -> int:
+    if vector.use_numpy(engine):
+        return numpy_sum(data, start, end, part)
+    return python_sum(data, start, end, part)
+
+def sol1(input_file: Path, engine: str = 'auto', processes: int = 1) -> Answer:
+    return sum(parallel.score_ranges(3, 'priority_sum', input_file, processes, part=1, engine=engine))
+
+def sol2(input_file: Path, engine: str = 'auto', processes: int = 1) -> Answer:
+    # Ranges start on a group of three rucksacks
+    return sum(parallel.score_ranges(3, 'priority_sum', input_file, processes, group=3, part=2, engine=engine))
+
 def test_1_test():
     input_file = Path('2022/3/test_input.txt')
-    result = 0
-    with input_file.open('r') as inf:
-        for line in inf:
-            values = line.strip()
-            A = values[:len(values)//2]
-            B = values[len(values)//2:]
-            common = list(set(A).intersection(B))
-            assert len(common) == 1
-            value = common[0]
-            priority = priorities[value]
-            result += priority
-    print(result)
+    result = sol1(input_file)
+    check_answer(input_file, 1, result)
 
 def test_1():
     input_file = Path('2022/3/input.txt')
-    result = 0
-    with input_file.open('r') as inf:
-        for line in inf:
-            values = line.strip()
-            A = values[:len(values)//2]
-            B = values[len(values)//2:]
-            common = list(set(A).intersection(B))
-            assert len(common) == 1
-            value = common[0]
-            priority = priorities[value]
-            result += priority
-    print(result)
+    result = sol1(input_file)
+    check_answer(input_file, 1, result)
 
 def test_2_test():
     input_file = Path('2022/3/test_input.txt')
-    result = 0
-    with input_file.open('r') as inf:
-        lines = inf.readlines()
-        for i in range(0, len(lines), 3):
-            A = set(lines[i].strip())
-            B = set(lines[i+1].strip())
-            C = set(lines[i+2].strip())
-            common = list(set(A).intersection(B).intersection(C))
-            assert len(common) == 1
-            value = common[0]
-            priority = priorities[value]
-            result += priority
-    print(result)
+    result = sol2(input_file)
+    check_answer(input_file, 2, result)
 
 def test_2():
     input_file = Path('2022/3/input.txt')
-    result = 0
-    with input_file.open('r') as inf:
-        lines = inf.readlines()
-        for i in range(0, len(lines), 3):
-            A = set(lines[i].strip())
-            B = set(lines[i+1].strip())
-            C = set(lines[i+2].strip())
-            common = list(set(A).intersection(B).intersection(C))
-            assert len(common) == 1
-            value = common[0]
-            priority = priorities[value]
-            result += priority
-    print(result)
\ No newline at end of file
+    result = sol2(input_file)
+    check_answer(input_file, 2, result)
+
+def test_engines(tmp_path):
+    pytest.importorskip('numpy')
+    for input_file in [Path('2022/3/test_input.txt'), Path('2022/3/input.txt')]:
+        assert sol1(input_file, 'numpy') == sol1(input_file, 'python')
+        assert sol2(input_file, 'numpy') == sol2(input_file, 'python')
+    input_file = tmp_path / 'input.txt'
+    input_file.write_bytes(b"aAba\r\nAdeA\r\n\r\ngAhg")
+    assert sol1(input_file, 'numpy') == sol1(input_file, 'python') == 1 + 27 + 7
+    assert sol2(input_file, 'numpy') == sol2(input_file, 'python') == 27
+
+def test_malformed(tmp_path):
+    input_file = tmp_path / 'input.txt'
+    input_file.write_bytes(b"abca\n")
+    engines = ['python'] + (['numpy'] if vector.numpy is not None else [])
+    for engine in engines:
+        with pytest.raises(RuntimeError):
+            sol2(input_file, engine)
+    input_file.write_bytes(b"abcaX\n")
+    for engine in engines:
+        with pytest.raises(RuntimeError):
+            sol1(input_file, engine)
+    # Bytes that are not items would have priority 0
+    input_file.write_bytes(b"a1b1\nc1d1\ne1f1\n")
+    for engine in engines:
+        for sol in (sol1, sol2):
+            with pytest.raises(RuntimeError, match="not items"):
+                sol(input_file, engine)
+
+def test_processes():
+    input_file = Path('2022/3/input.txt')
+    assert sol1(input_file, 'python', 3) == sol1(input_file, 'python')
+    assert sol2(input_file, 'python', 3) == sol2(input_file, 'python')
+
+def test_processes_blank_lines(tmp_path):
+    # Groups of three stay aligned across the ranges whatever the blank lines
+    lines = Path('2022/3/input.txt').read_bytes().splitlines()
+    input_file = tmp_path / 'input.txt'
+    input_file.write_bytes(b"\n".join(line + (b"\n" if idx % 7 == 5 else b"") for idx, line in enumerate(lines)))
+    for engine in ['python'] + (['numpy'] if vector.numpy is not None else []):
+        assert sol1(input_file, engine, 4) == sol1(input_file, engine) == sol1(Path('2022/3/input.txt'), engine)
+        assert sol2(input_file, engine, 4) == sol2(input_file, engine) == sol2(Path('2022/3/input.txt'), engine)
@@ -1,75 +1,102 @@
 import pytest
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Iterator
 from pathlib import Path
 from queue import PriorityQueue
 import heapq
+from aoc import reader, vector
+from aoc.answers import Answer, check_answer
+from aoc.intervals import IntervalIndex
 
-def process_range(line: str) -> bool:
-    ranges = line.split(',')
-    rangeA = ranges[0].split('-')
-    rangeB = ranges[1].split('-')
-    rangeA_min = int(rangeA[0])
-    rangeA_max = int(rangeA[1])
-    rangeB_min = int(rangeB[0])
-    rangeB_max = int(rangeB[1])
-    return ( set((range(rangeA_min,rangeA_max+1))).issubset(range(rangeB_min,rangeB_max+1)) or set((range(rangeB_min,rangeB_max+1))).issubset(range(rangeA_min,rangeA_max+1)))
-    if rangeA_min >= rangeB_min:
-        if rangeA_max <= rangeB_max:
-            return True
-        else:
-            return False
-    else:
-        if rangeA_max >= rangeB_max:
-            return True
-        else:
-            return False
+def process_range(rangeA_min: int, rangeA_max: int, rangeB_min: int, rangeB_max: int) -> bool:
+    # Constant time whatever the size of the sections
+    return (rangeB_min <= rangeA_min and rangeA_max <= rangeB_max) or (rangeA_min <= rangeB_min and rangeB_max <= rangeA_max)
 
-def process_range2(line: str) -> bool:
-    ranges = line.split(',')
-    rangeA = ranges[0].split('-')
-    rangeB = ranges[1].split('-')
-    rangeA_min = int(rangeA[0])
-    rangeA_max = int(rangeA[1])
-    rangeB_min = int(rangeB[0])
-    rangeB_max = int(rangeB[1])
-    rA = set(range(rangeA_min,rangeA_max+1))
-    rB = set(range(rangeB_min,rangeB_max+1))
-    return len(rA.intersection(rB)) > 0
+def process_range2(rangeA_min: int, rangeA_max: int, rangeB_min: int, rangeB_max: int) -> bool:
+    return rangeA_min <= rangeB_max and rangeB_min <= rangeA_max
 
-def sol1(input_file: Path) -> int:
+def numpy_counts(input_file: Path) -> Tuple[int, int]:
+    # Both parts at once from the (N, 4) array of every pair of sections
+    pairs = vector.uint_records(reader.mapped(input_file), 4)
+    a_min, a_max, b_min, b_max = pairs.T
+    contained = ((b_min <= a_min) & (a_max <= b_max)) | ((a_min <= b_min) & (b_max <= a_max))
+    overlapping = (a_min <= b_max) & (b_min <= a_max)
+    return int(contained.sum()), int(overlapping.sum())
+
+def sol1(input_file: Path, engine: str = 'auto') -> Answer:
+    if vector.use_numpy(engine):
+        return numpy_counts(input_file)[0]
     result = 0
-    with input_file.open('r') as inf:
-        for line in inf:
-            included = process_range(line)
-            if included:
-                result += 1
+    # The dashes are separators, not signs
+    for bounds in reader.int_records(reader.mapped(input_file), 4, signed=False):
+        included = process_range(*bounds)
+        if included:
+            result += 1
     return result
 
-def sol2(input_file: Path) -> int:
+def sol2(input_file: Path, engine: str = 'auto') -> Answer:
+    if vector.use_numpy(engine):
+        return numpy_counts(input_file)[1]
     result = 0
-    with input_file.open('r') as inf:
-        for line in inf:
-            included = process_range2(line)
-            if included:
-                result += 1
+    for bounds in reader.int_records(reader.mapped(input_file), 4, signed=False):
+        included = process_range2(*bounds)
+        if included:
+            result += 1
     return result
 
+def get_index(input_file: Path) -> IntervalIndex:
+    # Every assignment of the file, the two elves of line i are 2 * i and
+    # 2 * i + 1, see assignment
+    spans = list()
+    for a_min, a_max, b_min, b_max in reader.int_records(reader.mapped(input_file), 4, signed=False):
+        spans.append((a_min, a_max))
+        spans.append((b_min, b_max))
+    return IntervalIndex(spans)
+
+def assignment(idx: int) -> Tuple[int, int]:
+    # (line, elf) of an assignment of get_index
+    return divmod(idx, 2)
+
+def cross_line_pairs(index: IntervalIndex) -> Iterator[Tuple[int, int]]:
+    # Overlapping assignments of elves from different pairs
+    for first, second in index.overlapping_pairs():
+        if assignment(first)[0] != assignment(second)[0]:
+            yield first, second
+
 def test_1_test():
     input_file = Path('2022/4/test_input.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
 def test_1():
     input_file = Path('2022/4/input.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
 def test_2_test():
     input_file = Path('2022/4/test_input.txt')
     result = sol2(input_file)
-    print(result)
+    check_answer(input_file, 2, result)
 
 def test_2():
     input_file = Path('2022/4/input.txt')
     result = sol2(input_file)
-    print(result)
\ No newline at end of file
+    check_answer(input_file, 2, result)
+
+def test_engines(tmp_path):
+    input_file = tmp_path / 'input.txt'
+    input_file.write_text("1-1000000000,5-6\n7-9,1-6\n3-4,4-8\n")
+    assert (sol1(input_file, 'python'), sol2(input_file, 'python')) == (1, 2)
+    pytest.importorskip('numpy')
+    assert numpy_counts(input_file) == (1, 2)
+    input_file = Path('2022/4/input.txt')
+    assert numpy_counts(input_file) == (sol1(input_file, 'python'), sol2(input_file, 'python'))
+
+def test_index():
+    input_file = Path('2022/4/test_input.txt')
+    index = get_index(input_file)
+    assert sorted(index.containing(6)) == [1, 4, 6, 7, 8, 9, 10, 11]
+    assert [assignment(idx) for idx in sorted(index.overlapping(9, 20))] == [(2, 1)]
+    assert index.max_coverage() == (8, 6)
+    pairs = list(index.overlapping_pairs())
+    # The pairs within a line are the ones of part 2
+    assert len(pairs) - len(list(cross_line_pairs(index))) == sol2(input_file, 'python')
@@ -1,23 +1,15 @@
 import pytest
-from typing import Optional, List, Tuple, Dict
+from typing import Optional, List, Tuple, Dict, Iterable, Iterator
 from pathlib import Path
 from queue import PriorityQueue
 import heapq
-from collections import OrderedDict
 import re
+from aoc.answers import Answer, check_answer
+from aoc import cache
 
 PATTERN = r'move ([0-9]+) from ([0-9]+) to ([0-9]+)'
-
-def parse_crates(line: str, crates: Dict[int, List[str]]) -> Dict[int, List[str]]:
-    chars = len(line) - 1
-    for i in range(0, chars, 4):
-        idx = i // 4
-        crate = line[i+1]
-        if crate != " ":
-            if not idx in crates:
-                crates[idx] = list()
-            crates[idx].append(crate)
-    return crates
+# Bump when the parsed form changes, older cache entries are then ignored
+PARSER_VERSION = 1
 
 def parse_move(line: str) -> Tuple[int, int, int]:
     result = re.match(PATTERN, line)
@@ -26,80 +18,161 @@ def parse_move(line: str) -> Tuple[int, int, int]:
     dst = int(result.group(3))
     return n, src, dst
 
-def sol1(input_file: Path) -> int:
+def parse_moves(input_file: Path) -> List[Tuple[int, int, int]]:
     stage = 0
-    crates: Dict[int, List[str]] = OrderedDict()
     moves: List[Tuple[int, int, int]] = list()
     with input_file.open('r') as inf:
         for line in inf:
             if stage == 0:
-                if "[" in line:
-                    crates = parse_crates(line, crates)
-                else:
+                if not "[" in line:
                     stage = 1
             elif line != "\n":
-                n, src, dst = parse_move(line)
-                moves.append((n,src,dst))
-    for key, values in crates.items():
-        values.reverse()
-    for n, src, dst in moves:
-        for i in range(n):
-            crate = crates[src - 1].pop()
-            crates[dst - 1].append(crate)
-    result = ""
-    n = len(crates)
-    for i in range(n):
-        values = crates[i]
-        top = values[-1]
-        result += top
-    return result
+                moves.append(parse_move(line))
+    return moves
 
-def sol2(input_file: Path) -> int:
-    stage = 0
-    crates: Dict[int, List[str]] = OrderedDict()
-    moves: List[Tuple[int, int, int]] = list()
-    with input_file.open('r') as inf:
+def get_moves(input_file: Path) -> Iterator[Tuple[int, int, int]]:
+    return cache.records(cache.load_records(input_file, 'day5.moves', PARSER_VERSION, 3, parse_moves), 3)
+
+def get_stacks(input_file: Path) -> List[bytearray]:
+    # Only the drawing on top of the file, the moves come from the cache.
+    # Crate letters are bytes, bottom first: stacking the rows bottom up,
+    # every stack is one strided slice of the drawing
+    rows: List[bytes] = list()
+    with input_file.open('rb') as inf:
         for line in inf:
-            if stage == 0:
-                if "[" in line:
-                    crates = parse_crates(line, crates)
-                else:
-                    stage = 1
-            elif line != "\n":
-                n, src, dst = parse_move(line)
-                moves.append((n,src,dst))
-    for key, values in crates.items():
-        values.reverse()
+            if not b"[" in line:
+                count = len(line.split())
+                break
+            rows.append(line.rstrip(b"\n"))
+        else:
+            count = 0
+    width = 4 * count
+    drawing = b"".join(row.ljust(width) for row in reversed(rows))
+    return [bytearray(drawing[4 * idx + 1::width].rstrip(b" ")) for idx in range(count)]
+
+def move_crates(stacks: List[bytearray], moves: Iterable[Tuple[int, int, int]], keep_order: bool) -> List[bytearray]:
+    # Every move is one slice copy onto the destination and one cut of the
+    # source. The CrateMover 9000 takes the crates one at a time, so they
+    # land reversed, the 9001 keeps their order
     for n, src, dst in moves:
-        to_move = list()
-        for i in range(n):
-            to_move.append(crates[src - 1].pop())
-        to_move.reverse()
-        crates[dst - 1].extend(to_move)
+        source = stacks[src - 1]
+        if n > len(source):
+            raise RuntimeError(f"Can not move {n} crates from stack {src} of {len(source)}")
+        if n == 0 or src == dst:
+            continue
+        if keep_order:
+            stacks[dst - 1] += source[-n:]
+        else:
+            stacks[dst - 1] += source[:-n - 1:-1]
+        del source[-n:]
+    return stacks
+
+def tops(stacks: List[bytearray]) -> str:
+    return "".join(chr(stack[-1]) for stack in stacks)
+
+def get_moves_reversed(input_file: Path) -> Iterator[Tuple[int, int, int]]:
+    # Last move first, read backwards from the cached fields
+    flat = cache.load_records(input_file, 'day5.moves', PARSER_VERSION, 3, parse_moves)
+    return ((n, src, dst) for dst, src, n in cache.records(flat[::-1], 3))
+
+def top_origins(count: int, moves: Iterable[Tuple[int, int, int]], keep_order: bool) -> List[Tuple[int, int]]:
+    # Undoes the moves, last first, following only the crates that end up on
+    # top back to the (stack, depth from the top) they start at. A move only
+    # touches the followed crates of its two stacks, however many crates it
+    # takes, so the cost depends on the moves and stacks alone
+    followed: List[List[List[int]]] = [[[idx, 0]] for idx in range(count)]
+    for n, src, dst in moves:
+        if n == 0 or src == dst:
+            continue
+        source = followed[src - 1]
+        for crate in source:
+            crate[1] += n
+        stay = list()
+        for crate in followed[dst - 1]:
+            if crate[1] < n:
+                # One of the moved crates, the 9000 had reversed them
+                if not keep_order:
+                    crate[1] = n - 1 - crate[1]
+                source.append(crate)
+            else:
+                crate[1] -= n
+                stay.append(crate)
+        followed[dst - 1] = stay
+    origins = [(0, 0)] * count
+    for stack, crates in enumerate(followed):
+        for idx, depth in crates:
+            origins[idx] = (stack, depth)
+    return origins
+
+def check_heights(stacks: List[bytearray], moves: Iterable[Tuple[int, int, int]]):
+    # Only the heights, forward, so that the lazy engine rejects the moves
+    # that move_crates would
+    heights = [len(stack) for stack in stacks]
+    for n, src, dst in moves:
+        if n > heights[src - 1]:
+            raise RuntimeError(f"Can not move {n} crates from stack {src} of {heights[src - 1]}")
+        heights[src - 1] -= n
+        heights[dst - 1] += n
+
+def lazy_tops(input_file: Path, keep_order: bool) -> str:
+    stacks = get_stacks(input_file)
+    check_heights(stacks, get_moves(input_file))
     result = ""
-    n = len(crates)
-    for i in range(n):
-        values = crates[i]
-        top = values[-1]
-        result += top
+    for idx, (stack, depth) in enumerate(top_origins(len(stacks), get_moves_reversed(input_file), keep_order)):
+        if depth >= len(stacks[stack]):
+            raise RuntimeError(f"Stack {idx + 1} ends up empty")
+        result += chr(stacks[stack][-1 - depth])
     return result
 
+def sol1(input_file: Path, lazy: bool = False) -> Answer:
+    if lazy:
+        return lazy_tops(input_file, keep_order=False)
+    return tops(move_crates(get_stacks(input_file), get_moves(input_file), keep_order=False))
+
+def sol2(input_file: Path, lazy: bool = False) -> Answer:
+    if lazy:
+        return lazy_tops(input_file, keep_order=True)
+    return tops(move_crates(get_stacks(input_file), get_moves(input_file), keep_order=True))
+
 def test_1_test():
     input_file = Path('2022/5/test_input.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
 def test_1():
     input_file = Path('2022/5/input.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
 def test_2_test():
     input_file = Path('2022/5/test_input.txt')
     result = sol2(input_file)
-    print(result)
+    check_answer(input_file, 2, result)
 
 def test_2():
     input_file = Path('2022/5/input.txt')
     result = sol2(input_file)
-    print(result)
\ No newline at end of file
+    check_answer(input_file, 2, result)
+
+def test_move_crates():
+    stacks = [bytearray(b"ZN"), bytearray(b"MCD"), bytearray(b"P")]
+    moves = [(3, 2, 1), (0, 3, 2), (2, 1, 1), (1, 3, 2)]
+    assert move_crates([bytearray(stack) for stack in stacks], moves, keep_order=False) == [bytearray(b"ZNDCM"), bytearray(b"P"), bytearray()]
+    assert move_crates([bytearray(stack) for stack in stacks], moves, keep_order=True) == [bytearray(b"ZNMCD"), bytearray(b"P"), bytearray()]
+    with pytest.raises(RuntimeError):
+        move_crates(stacks, [(2, 3, 1)], keep_order=True)
+
+def test_lazy(tmp_path):
+    for input_file in (Path('2022/5/test_input.txt'), Path('2022/5/input.txt')):
+        assert (sol1(input_file, lazy=True), sol2(input_file, lazy=True)) == (sol1(input_file), sol2(input_file))
+    input_file = tmp_path / 'input.txt'
+    input_file.write_text("[A]    \n[B] [C]\n 1   2 \n\nmove 2 from 1 to 2\nmove 1 from 2 to 2\nmove 1 from 2 to 1\n")
+    assert (sol1(input_file, lazy=True), sol2(input_file, lazy=True)) == ("BA", "AB")
+    input_file.write_text("[A]    \n[B] [C]\n 1   2 \n\nmove 1 from 2 to 1\n")
+    with pytest.raises(RuntimeError):
+        sol1(input_file, lazy=True)
+    # Both engines reject a move of more crates than the stack holds
+    input_file.write_text("[A] [D]\n[B] [C]\n 1   2 \n\nmove 3 from 1 to 2\nmove 3 from 2 to 1\n")
+    for lazy in (False, True):
+        with pytest.raises(RuntimeError):
+            sol2(input_file, lazy=lazy)
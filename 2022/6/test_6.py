@@ -5,30 +5,29 @@ from queue import PriorityQueue
 import heapq
 from collections import OrderedDict
 import re
+from aoc import bits
+from aoc.answers import Answer, check_answer
 
-def process_line(line: str) -> int:
-    line.strip()
-    for i in range(len(line) - 4):
-        chars = set()
-        chars.add(line[i])
-        chars.add(line[i+1])
-        chars.add(line[i+2])
-        chars.add(line[i+3])
-        if len(chars) == 4:
-            return i + 4
+def find_marker(line: str, size: int) -> Optional[int]:
+    # Bit c of mask is the parity of the count of character c in the window,
+    # all size characters are distinct exactly when size bits are set
+    data = line.strip().encode()
+    mask = 0
+    for i, char in enumerate(data):
+        mask ^= 1 << char
+        if i >= size:
+            mask ^= 1 << data[i - size]
+        if bits.popcount(mask) == size:
+            return i + 1
     return None
 
+def process_line(line: str) -> int:
+    return find_marker(line, 4)
+
 def process_line2(line: str) -> int:
-    line.strip()
-    for i in range(len(line) - 4):
-        chars = set()
-        for j in range(14):
-            chars.add(line[i + j])
-        if len(chars) == 14:
-            return i + 14
-    return None
+    return find_marker(line, 14)
 
-def sol1(input_file: Path) -> List[int]:
+def sol1(input_file: Path) -> Answer:
     results = list()
     with input_file.open('r') as inf:
         for line in inf:
@@ -36,7 +35,7 @@ def sol1(input_file: Path) -> List[int]:
             results.append(result)
     return results
 
-def sol2(input_file: Path) -> List[int]:
+def sol2(input_file: Path) -> Answer:
     results = list()
     with input_file.open('r') as inf:
         for line in inf:
@@ -48,19 +47,19 @@ def sol2(input_file: Path) -> List[int]:
 def test_1_test():
     input_file = Path('2022/6/test_input.txt')
     results = sol1(input_file)
-    print(results)
+    check_answer(input_file, 1, results)
 
 def test_1():
     input_file = Path('2022/6/input.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
 def test_2_test():
     input_file = Path('2022/6/test_input.txt')
     results = sol2(input_file)
-    print(results)
+    check_answer(input_file, 2, results)
 
 def test_2():
     input_file = Path('2022/6/input.txt')
     result = sol2(input_file)
-    print(result)
\ No newline at end of file
+    check_answer(input_file, 2, result)
\ No newline at end of file
@@ -5,6 +5,7 @@ from queue import PriorityQueue
 import heapq
 from collections import OrderedDict
 import re
+from aoc.answers import Answer, check_answer
 
 CD_PATTERN = r'\$ cd (.*)'
 LS_PATTERN = r'\$ ls'
@@ -159,7 +160,7 @@ def process_result(line: str) -> Tuple[str, str, int]:
         else:
             raise NotImplementedError("")
 
-def sol1(input_file: Path) -> List[int]:
+def sol1(input_file: Path) -> Answer:
     fs = FS()
     cmd = None
     path = MyPath()
@@ -178,15 +179,13 @@ def sol1(input_file: Path) -> List[int]:
                 current_folder = fs.get_folder(path)
                 current_folder.add_child(child)
     total_size = fs.compute_size()
-    print(f"Total: {total_size}")
     dirs = fs.get_folders_with_lower_size(100000)
     final_size = 0
     for dir in dirs:
         final_size += dir.size
-        print(dir.name)
-    print(f"Result: {final_size}")
+    return final_size
 
-def sol2(input_file: Path) -> List[int]:
+def sol2(input_file: Path) -> Answer:
     fs = FS()
     cmd = None
     path = MyPath()
@@ -207,7 +206,6 @@ def sol2(input_file: Path) -> List[int]:
                 current_folder = fs.get_folder(path)
                 current_folder.add_child(child)
     total_size = fs.compute_size()
-    print(f"Total: {total_size}")
     available = (total_space - total_size)
     if available < free_space:
         to_delete = free_space - available
@@ -215,25 +213,25 @@ def sol2(input_file: Path) -> List[int]:
         folders_and_size.sort(key=lambda entry: entry[0])
         for size, folder in folders_and_size:
             if size >= to_delete:
-                print(f"Result: {size} for folder {folder.name}")
-                return
+                return size
+    return 0
 
 def test_1_test():
     input_file = Path('2022/7/test_input.txt')
     results = sol1(input_file)
-    print(results)
+    check_answer(input_file, 1, results)
 
 def test_1():
     input_file = Path('2022/7/input.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
 def test_2_test():
     input_file = Path('2022/7/test_input.txt')
     results = sol2(input_file)
-    print(results)
+    check_answer(input_file, 2, results)
 
 def test_2():
     input_file = Path('2022/7/input.txt')
     result = sol2(input_file)
-    print(result)
\ No newline at end of file
+    check_answer(input_file, 2, result)
\ No newline at end of file
@@ -5,143 +5,80 @@ from queue import PriorityQueue
 import heapq
 from collections import OrderedDict
 import re
+from aoc.answers import Answer, check_answer
+from aoc.grid import Grid
 
-def process_input(line: str) -> List[int]:
-    line = line.strip()
-    result = list()
-    for char in line:
-        result.append(int(char))
-    return result
+# Trees are 0 to 9, the padding marks the edge of the forest
+EDGE = 10
+HEIGHTS = {str(height): height for height in range(10)}
 
-def get_scenic_score(r: int, c: int, nr: int, nc: int, trees: List[List[int]]) -> bool:
-    tree = trees[r][c]
-    up_score = 0
-    down_score = 0
-    left_score = 0
-    right_score = 0
-    # Check up
-    for i in range(r-1, -1, -1):
-        up_score += 1
-        other_tree = trees[i][c]
-        if other_tree >= tree:
-            break
-    if up_score == 0:
-        return 0
-    # Check down
-    for i in range(r+1, nr):
-        down_score += 1
-        other_tree = trees[i][c]
-        if other_tree >= tree:
-            break
-    if down_score == 0:
-        return 0
-    # Check left
-    for j in range(c-1, -1, -1):
-        left_score += 1
-        other_tree = trees[r][j]
-        if other_tree >= tree:
-            break
-    if left_score == 0:
-        return 0
-    # Check right
-    for j in range(c+1, nc):
-        right_score += 1
-        other_tree = trees[r][j]
-        if other_tree >= tree:
-            break
-    if right_score == 0:
-        return 0
-    score = up_score * down_score * left_score * right_score
+def get_trees(input_file: Path) -> Grid:
+    return Grid.from_file(input_file, HEIGHTS, pad_value=EDGE)
+
+def get_scenic_score(idx: int, trees: Grid) -> int:
+    cells = trees.cells
+    tree = cells[idx]
+    score = 1
+    for step in trees.offsets4:
+        distance = 0
+        other = idx + step
+        while cells[other] != EDGE:
+            distance += 1
+            if cells[other] >= tree:
+                break
+            other += step
+        if distance == 0:
+            return 0
+        score *= distance
     return score
 
-def is_tree_visible(r: int, c: int, nr: int, nc: int, trees: List[List[int]]) -> bool:
-    if r == 0 or r == nr - 1:
-        return True
-    if c == 0 or c == nc - 1:
-        return True
-    tree = trees[r][c]
-    # Check up
-    visible = True
-    for i in range(r):
-        other_tree = trees[i][c]
-        if other_tree >= tree:
-            visible = False
-    if visible:
-        return True
-    # Check down
-    visible = True
-    for i in range(r+1, nr):
-        other_tree = trees[i][c]
-        if other_tree >= tree:
-            visible = False
-    if visible:
-        return True
-    # Check left
-    visible = True
-    for j in range(c):
-        other_tree = trees[r][j]
-        if other_tree >= tree:
-            visible = False
-    if visible:
-        return True
-    # Check right
-    visible = True
-    for j in range(c+1, nc):
-        other_tree = trees[r][j]
-        if other_tree >= tree:
-            visible = False
-    if visible:
-        return True
+def is_tree_visible(idx: int, trees: Grid) -> bool:
+    cells = trees.cells
+    tree = cells[idx]
+    for step in trees.offsets4:
+        other = idx + step
+        while cells[other] < tree:
+            other += step
+        # Only the edge is taller than every tree
+        if cells[other] == EDGE:
+            return True
     return False
 
-def sol1(input_file: Path) -> List[int]:
-    trees = list()
-    with input_file.open('r') as inf:
-        for line in inf:
-            row = process_input(line)
-            trees.append(row)
-    nr = len(trees)
-    nc = len(trees[0])
+def sol1(input_file: Path) -> Answer:
+    trees = get_trees(input_file)
     visible_trees = 0
-    for r in range(nr):
-        for c in range(nc):
-            visible = is_tree_visible(r, c, nr, nc, trees)
-            if visible:
+    for r in range(trees.rows):
+        for c in range(trees.cols):
+            if is_tree_visible(trees.index(r, c), trees):
                 visible_trees += 1
-    print(f"Total: {visible_trees}")
+    return visible_trees
 
-def sol2(input_file: Path) -> List[int]:
-    trees = list()
-    with input_file.open('r') as inf:
-        for line in inf:
-            row = process_input(line)
-            trees.append(row)
-    nr = len(trees)
-    nc = len(trees[0])
+def sol2(input_file: Path) -> Answer:
+    trees = get_trees(input_file)
     scenic_score = 0
-    for r in range(nr):
-        for c in range(nc):
-            score = get_scenic_score(r, c, nr, nc, trees)
+    for r in range(trees.rows):
+        for c in range(trees.cols):
+            score = get_scenic_score(trees.index(r, c), trees)
             if score > scenic_score:
                 scenic_score = score
-    print(f"Total: {scenic_score}")
+    return scenic_score
 
 def test_1_test():
     input_file = Path('2022/8/test_input.txt')
     results = sol1(input_file)
-    print(results)
+    check_answer(input_file, 1, results)
 
 def test_1():
     input_file = Path('2022/8/input.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
 def test_2_test():
     input_file = Path('2022/8/test_input.txt')
     results = sol2(input_file)
-    print(results)
+    check_answer(input_file, 2, results)
 
 def test_2():
     input_file = Path('2022/8/input.txt')
     result = sol2(input_file)
-    print(result)
\ No newline at end of file
+    check_answer(input_file, 2, result)
\ No newline at end of file
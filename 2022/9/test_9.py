@@ -5,12 +5,13 @@ from queue import PriorityQueue
 import heapq
 from collections import OrderedDict
 import re
+from aoc import reader
+from aoc.answers import Answer, check_answer
 
-def process_input(line: str) -> Tuple[str, int]:
-    line = line.strip()
-    tokens = line.split(' ')
-    dir = tokens[0]
-    steps = int(tokens[1])
+def process_input(line: memoryview) -> Tuple[str, int]:
+    # A line of the mapped input, e.g. b'R 4'
+    dir = chr(line[0])
+    steps = int(line[2:].tobytes())
     return dir, steps
 
 def next_tail(xh, yh, xt, yt) -> Tuple[int, int]:
@@ -96,14 +97,13 @@ def next_tail(xh, yh, xt, yt) -> Tuple[int, int]:
             else:
                 return xt, yt
 
-def sol1(input_file: Path) -> List[int]:
+def sol1(input_file: Path) -> Answer:
     map = dict()
     s = (0,0)
     moves = list()
-    with input_file.open('r') as inf:
-        for line in inf:
-            dir, steps = process_input(line)
-            moves.append((dir, steps))
+    for line in reader.lines(reader.mapped(input_file)):
+        dir, steps = process_input(line)
+        moves.append((dir, steps))
     xh, yh = s
     xt, yt = s
     for dir, steps in moves:
@@ -120,16 +120,15 @@ def sol1(input_file: Path) -> List[int]:
             if not (xt,yt) in map:
                 map[(xt,yt)] = 0
             map[(xt,yt)] += 1
-    print(f"Total: {len(map)}")
+    return len(map)
 
-def sol2(input_file: Path) -> List[int]:
+def sol2(input_file: Path) -> Answer:
     map = dict()
     s = (0,0)
     moves = list()
-    with input_file.open('r') as inf:
-        for line in inf:
-            dir, steps = process_input(line)
-            moves.append((dir, steps))
+    for line in reader.lines(reader.mapped(input_file)):
+        dir, steps = process_input(line)
+        moves.append((dir, steps))
     xh, yh = s
     tails = list()
     for i in range(9):
@@ -157,29 +156,29 @@ def sol2(input_file: Path) -> List[int]:
             if not (xt,yt) in map:
                 map[(xt,yt)] = 0
             map[(xt,yt)] += 1
-    print(f"Total: {len(map)}")
+    return len(map)
 
 def test_1_test():
     input_file = Path('2022/9/test_input.txt')
     results = sol1(input_file)
-    print(results)
+    check_answer(input_file, 1, results)
 
 def test_1():
     input_file = Path('2022/9/input.txt')
     result = sol1(input_file)
-    print(result)
+    check_answer(input_file, 1, result)
 
 def test_2_test():
     input_file = Path('2022/9/test_input.txt')
     results = sol2(input_file)
-    print(results)
+    check_answer(input_file, 2, results)
 
 def test_2_test2():
     input_file = Path('2022/9/test_input2.txt')
     results = sol2(input_file)
-    print(results)
+    check_answer(input_file, 2, results)
 
 def test_2():
     input_file = Path('2022/9/input.txt')
     result = sol2(input_file)
-    print(result)
\ No newline at end of file
+    check_answer(input_file, 2, result)
\ No newline at end of file
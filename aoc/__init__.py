@@ -0,0 +1,6 @@
+from pathlib import Path
+
+YEAR = 2022
+YEAR_DIR = Path(__file__).resolve().parent.parent / str(YEAR)
+DAYS = list(range(1, 26))
+PARTS = [1, 2]
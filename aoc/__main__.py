@@ -0,0 +1,26 @@
+import argparse
+import sys
+
+from aoc import batch, bench, runner
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m aoc', description="Advent of code 2022 solutions")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    run_parser = subparsers.add_parser('run', help="run and time the solvers")
+    runner.add_arguments(run_parser)
+    run_parser.set_defaults(func=runner.main)
+    bench_parser = subparsers.add_parser('bench', help="benchmark the solvers against the stored baseline")
+    bench.add_arguments(bench_parser)
+    bench_parser.set_defaults(func=bench.main)
+    batch_parser = subparsers.add_parser('batch', help="solve one day for many inputs in a warm process")
+    batch.add_arguments(batch_parser)
+    batch_parser.set_defaults(func=batch.main)
+    return parser
+
+def main(argv=None) -> int:
+    parser = get_parser()
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
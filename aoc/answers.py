@@ -0,0 +1,96 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+from aoc import YEAR_DIR
+
+# What every sol1/sol2 returns: a number, a string (day 5 crates, day 10
+# screen, day 25 SNAFU) or one number per line (day 6). None when a day has
+# no puzzle for that part
+Answer = Union[int, str, List[int], None]
+
+REGISTRY_FILE = YEAR_DIR / 'answers.json'
+
+_registry: Optional[Dict[str, Dict[str, Any]]] = None
+_hashes: Dict[Tuple[str, int, int], str] = dict()
+
+def input_hash(input_file: Path) -> str:
+    input_file = Path(input_file)
+    stat = input_file.stat()
+    key = (str(input_file.resolve()), stat.st_size, stat.st_mtime_ns)
+    digest = _hashes.get(key)
+    if digest is None:
+        digest = hashlib.sha256(input_file.read_bytes()).hexdigest()
+        _hashes[key] = digest
+    return digest
+
+def load_registry(path: Path = REGISTRY_FILE) -> Dict[str, Dict[str, Any]]:
+    global _registry
+    if path != REGISTRY_FILE:
+        return _read(path)
+    if _registry is None:
+        _registry = _read(path)
+    return _registry
+
+def _read(path: Path) -> Dict[str, Dict[str, Any]]:
+    if not path.exists():
+        return dict()
+    with path.open('r') as inf:
+        return json.load(inf)
+
+def registered_names(day: int, path: Path = REGISTRY_FILE) -> Set[str]:
+    # File names of the inputs of day in the registry. Without hashing, an
+    # input of another name is known to have no recorded answer
+    return {entry['input'] for entry in load_registry(path).values() if entry['day'] == day}
+
+def normalize(answer: Answer) -> Answer:
+    # Tuples and floats do not survive a JSON round trip unchanged
+    if isinstance(answer, tuple):
+        return list(answer)
+    if isinstance(answer, float) and answer.is_integer():
+        return int(answer)
+    return answer
+
+def expected(input_file: Path, part: int, params: Optional[Dict[str, Any]] = None, path: Path = REGISTRY_FILE) -> Tuple[bool, Answer]:
+    if not Path(input_file).is_file():
+        return False, None
+    entry = load_registry(path).get(input_hash(input_file))
+    if entry is None:
+        return False, None
+    known = entry['parts'].get(str(part))
+    if known is None or known.get('params', dict()) != (params or dict()):
+        return False, None
+    return True, known['answer']
+
+def verify(input_file: Path, part: int, answer: Answer, params: Optional[Dict[str, Any]] = None, path: Path = REGISTRY_FILE) -> Optional[bool]:
+    found, value = expected(input_file, part, params, path)
+    if not found:
+        return None
+    return normalize(answer) == value
+
+def check_answer(input_file: Path, part: int, answer: Answer, **params):
+    found, value = expected(input_file, part, params)
+    if found:
+        assert normalize(answer) == value, f"{input_file} part {part}: got {answer!r}, expected {value!r}"
+
+def record(input_file: Path, day: int, part: int, answer: Answer, params: Optional[Dict[str, Any]] = None, path: Path = REGISTRY_FILE, force: bool = False) -> bool:
+    global _registry
+    registry = _read(path)
+    entry = registry.setdefault(input_hash(input_file), {'day': day, 'input': Path(input_file).name, 'parts': dict()})
+    if str(part) in entry['parts'] and not force:
+        return False
+    known = {'answer': normalize(answer)}
+    if params:
+        known['params'] = params
+    entry['parts'][str(part)] = known
+    ordered = dict(sorted(registry.items(), key=lambda item: (item[1]['day'], item[1]['input'], item[0])))
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with tmp.open('w') as outf:
+        json.dump(ordered, outf, indent=2)
+        outf.write('\n')
+    tmp.replace(path)
+    if path == REGISTRY_FILE:
+        _registry = None
+    return True
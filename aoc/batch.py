@@ -0,0 +1,122 @@
+import json
+import multiprocessing
+import os
+import sys
+import time
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set
+
+from aoc import PARTS, answers, runner, synthetic
+
+# Inputs handed to a worker at once, large enough to amortize the pickling
+# of small puzzles, small enough to keep the workers busy at the end
+CHUNK_SIZE = 8
+
+class BatchStats(NamedTuple):
+    inputs: int
+    errors: int
+    wrong: int
+    wall_s: float
+
+    @property
+    def per_second(self) -> float:
+        return self.inputs / self.wall_s if self.wall_s > 0 else 0.0
+
+def expand_inputs(names: Iterable[str]) -> Iterator[Path]:
+    # Files as they are, directories for every .txt file inside
+    for name in names:
+        path = Path(name)
+        if path.is_dir():
+            yield from sorted(path.glob('*.txt'))
+        else:
+            yield path
+
+def synthetic_inputs(day: int, count: int, size: int) -> Iterator[Path]:
+    for seed in range(count):
+        yield synthetic.synthetic_input(day, size, seed)
+
+def solve(day: int, part: int, input_file: Path, params: Optional[Dict[str, Any]] = None, registered: Optional[Set[str]] = None) -> runner.JobResult:
+    # The solver is called straight away, without the stdout redirection and
+    # profiler of run_job, and an input is only hashed for the answer
+    # registry when its name is in `registered`: synthetic inputs never are
+    input_file = Path(input_file)
+    solver = runner.find_solver(runner.load_day(day), part)
+    if solver is None:
+        raise RuntimeError(f"Day {day} has no solver for part {part}")
+    kwargs = runner.bind_params(solver, params or dict())
+    answer = None
+    error = None
+    verified = None
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    try:
+        answer = solver(input_file, **kwargs)
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}"
+    wall = time.perf_counter() - wall
+    cpu = time.process_time() - cpu
+    if error is None and (registered is None or input_file.name in registered):
+        verified = answers.verify(input_file, part, answer, kwargs)
+    return runner.JobResult(day, part, str(input_file), answer, wall, cpu, runner.peak_rss_kb(), error, verified)
+
+def run_batch(day: int, part: int, inputs: Iterable[Path], processes: int = 1, params: Optional[Dict[str, Any]] = None) -> Iterator[runner.JobResult]:
+    # Unlike the runner, which starts a fresh process per job, the day is
+    # loaded once per process and stays warm: module level tables, compiled
+    # patterns, the answer registry and the parse cache are shared by every
+    # input. Results are streamed as they complete, in no particular order
+    # with several processes
+    runner.load_day(day)
+    job = partial(solve, day, part, params=params, registered=answers.registered_names(day))
+    if processes <= 1:
+        for input_file in inputs:
+            yield job(input_file)
+        return
+    ctx = multiprocessing.get_context()
+    with ctx.Pool(processes=processes, initializer=runner.load_day, initargs=(day,)) as pool:
+        yield from pool.imap_unordered(job, inputs, CHUNK_SIZE)
+
+def add_arguments(parser):
+    parser.add_argument('day', type=int, help="day to run")
+    parser.add_argument('inputs', nargs='*', help="input files, or folders of .txt input files")
+    parser.add_argument('-p', '--part', dest='parts', type=int, action='append', choices=PARTS, help="part to run, may be repeated (default: both)")
+    parser.add_argument('--synthetic', type=int, default=0, metavar='COUNT', help="also run COUNT synthetic inputs, one per seed")
+    parser.add_argument('-s', '--size', type=int, default=1000, help="size of the synthetic inputs (default: 1000)")
+    parser.add_argument('--param', dest='params', action='append', default=[], type=runner.parse_param, help="extra solver argument KEY=VALUE, e.g. ycheck=10")
+    parser.add_argument('-j', '--jobs', dest='processes', type=int, default=1, help="worker processes, 0 for one per core (default: 1)")
+    parser.add_argument('--json', action='store_true', help="emit one JSON object per line")
+    parser.add_argument('--quiet', action='store_true', help="only print the throughput")
+
+def main(args) -> int:
+    params = dict()
+    for param in args.params:
+        params.update(param)
+    processes = args.processes or os.cpu_count() or 1
+    inputs: List[Path] = list(expand_inputs(args.inputs))
+    inputs.extend(synthetic_inputs(args.day, args.synthetic, args.size))
+    if not inputs:
+        print("No inputs", file=sys.stderr)
+        return 1
+    failed = False
+    for part in args.parts or PARTS:
+        errors = 0
+        wrong = 0
+        wall = time.perf_counter()
+        for result in run_batch(args.day, part, inputs, processes, params):
+            errors += result.error is not None
+            wrong += result.verified is False
+            if args.json:
+                print(runner.to_json(result), flush=True)
+            elif not args.quiet:
+                answer = str(result.error or result.answer).replace('\n', '\\n')
+                print(f"{args.day:>3} {part:>4} {result.wall_s:>10.4f} {runner.VERIFIED_MARKS[result.verified]:>5}  {result.input_file}  {answer}", flush=True)
+        stats = BatchStats(len(inputs), errors, wrong, time.perf_counter() - wall)
+        failed = failed or bool(errors or wrong)
+        summary = f"Day {args.day} part {part}: {stats.inputs} inputs in {stats.wall_s:.2f}s, {stats.per_second:.1f} inputs/s, {processes} process(es)"
+        if errors or wrong:
+            summary += f", {errors} failed, {wrong} wrong"
+        if args.json:
+            print(json.dumps({'day': args.day, 'part': part, **stats._asdict(), 'per_second': stats.per_second}), flush=True)
+        else:
+            print(summary, file=sys.stderr, flush=True)
+    return 1 if failed else 0
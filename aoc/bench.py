@@ -0,0 +1,197 @@
+import csv
+import json
+import math
+import re
+import statistics
+import sys
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from aoc import DAYS, PARTS, runner, synthetic, timings
+from aoc.timings import BASELINE_FILE
+
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.25
+# Regressions smaller than this are timer noise on the cheap days
+NOISE_FLOOR_S = 0.005
+# Labels of the synthetic inputs, see timings.input_label
+SIZE_LABEL = re.compile(r'size(\d+)_seed\d+')
+
+class BenchResult(NamedTuple):
+    day: int
+    part: int
+    label: str
+    samples: List[float]
+    median: float
+    p95: float
+    min: float
+    answer: Any
+    error: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        return timings.job_key(self.day, self.part, self.label)
+
+class Regression(NamedTuple):
+    key: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else math.inf
+
+def percentile(samples: List[float], fraction: float) -> float:
+    # Nearest rank, so the value is always one of the samples
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+def bench_job(job: runner.Job, repeat: int = DEFAULT_REPEAT) -> BenchResult:
+    samples = list()
+    answer = None
+    for _ in range(repeat):
+        result = runner.run_job(job)
+        error = result.error
+        if error is None and result.verified is False:
+            error = f"Wrong answer {result.answer!r}"
+        if error:
+            return BenchResult(job.day, job.part, timings.input_label(job.input_file), samples, 0.0, 0.0, 0.0, result.answer, error)
+        samples.append(result.wall_s)
+        answer = result.answer
+    return BenchResult(job.day, job.part, timings.input_label(job.input_file), samples, statistics.median(samples), percentile(samples, 0.95), min(samples), answer)
+
+def make_bench_jobs(days: Iterable[int], parts: Iterable[int], sizes: Iterable[int] = (), real: bool = True, seed: int = 0) -> List[runner.Job]:
+    jobs = list()
+    for day in days:
+        if real:
+            jobs.extend(runner.make_jobs([day], parts))
+        if day not in synthetic.GENERATORS:
+            continue
+        for size in sizes:
+            input_file = synthetic.synthetic_input(day, size, seed)
+            jobs.extend(runner.make_jobs([day], parts, str(input_file)))
+    return jobs
+
+def run_bench(jobs: Iterable[runner.Job], repeat: int = DEFAULT_REPEAT, isolate: bool = True) -> Iterable[BenchResult]:
+    return runner.map_jobs(partial(bench_job, repeat=repeat), jobs, isolate)
+
+def load_baseline(path: Path = BASELINE_FILE) -> Dict[str, Dict[str, Any]]:
+    return timings.load_entries(path)
+
+def save_baseline(results: Iterable[BenchResult], path: Path = BASELINE_FILE):
+    # Merge, so a partial run only refreshes the entries it measured
+    entries = load_baseline(path)
+    for result in results:
+        if result.error:
+            continue
+        entries[result.key] = {
+            'median': result.median,
+            'p95': result.p95,
+            'min': result.min,
+            'repeat': len(result.samples),
+        }
+    timings.write_entries(path, entries)
+
+def find_regression(result: BenchResult, baseline: Dict[str, Dict[str, Any]], threshold: float = DEFAULT_THRESHOLD) -> Optional[Regression]:
+    entry = baseline.get(result.key)
+    if entry is None or result.error:
+        return None
+    reference = entry['median']
+    if result.median > reference * (1 + threshold) and result.median - reference > NOISE_FLOOR_S:
+        return Regression(result.key, reference, result.median)
+    return None
+
+def scaling_curves(results: Iterable[BenchResult]) -> Dict[Tuple[int, int], List[Tuple[int, float]]]:
+    # Median wall time against input size for every day and part that ran
+    # on synthetic inputs
+    curves: Dict[Tuple[int, int], List[Tuple[int, float]]] = dict()
+    for result in results:
+        match = SIZE_LABEL.fullmatch(result.label)
+        if match is None or result.error:
+            continue
+        curves.setdefault((result.day, result.part), list()).append((int(match.group(1)), result.median))
+    for points in curves.values():
+        points.sort()
+    return curves
+
+def growth_exponent(points: List[Tuple[int, float]]) -> Optional[float]:
+    # Least squares slope in log-log space: about 1 for linear days, 2 for
+    # quadratic ones
+    points = [(math.log(size), math.log(median)) for size, median in points if size > 0 and median > 0]
+    if len({x for x, _ in points}) < 2:
+        return None
+    mean_x = statistics.fmean(x for x, _ in points)
+    mean_y = statistics.fmean(y for _, y in points)
+    num = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    den = sum((x - mean_x) ** 2 for x, _ in points)
+    return num / den
+
+def format_curve(day: int, part: int, points: List[Tuple[int, float]]) -> str:
+    exponent = growth_exponent(points)
+    growth = f"n^{exponent:.2f}" if exponent is not None else "-"
+    series = ' '.join(f"{size}:{median:.4f}" for size, median in points)
+    return f"{day:>3} {part:>4} {growth:>8}  {series}"
+
+def write_curves(path: Path, curves: Dict[Tuple[int, int], List[Tuple[int, float]]]):
+    with path.open('w', newline='') as outf:
+        writer = csv.writer(outf)
+        writer.writerow(['day', 'part', 'size', 'median_s'])
+        for (day, part), points in sorted(curves.items()):
+            for size, median in points:
+                writer.writerow([day, part, size, median])
+
+def format_result(result: BenchResult) -> str:
+    if result.error:
+        return f"{result.day:>3} {result.part:>4} {result.label:<22} {result.error}"
+    return f"{result.day:>3} {result.part:>4} {result.label:<22} {result.median:>10.4f} {result.p95:>10.4f} {result.min:>10.4f}"
+
+def add_arguments(parser):
+    parser.add_argument('days', nargs='*', type=int, default=DAYS, help="days to benchmark (default: all)")
+    parser.add_argument('-p', '--part', dest='parts', type=int, action='append', choices=PARTS, help="part to run, may be repeated (default: both)")
+    parser.add_argument('-n', '--repeat', type=int, default=DEFAULT_REPEAT, help=f"runs per day and part (default: {DEFAULT_REPEAT})")
+    parser.add_argument('-s', '--size', dest='sizes', type=int, action='append', default=[], help="also run a synthetic input with this many records, may be repeated")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the synthetic inputs")
+    parser.add_argument('--synthetic-only', action='store_true', help="skip the real inputs")
+    parser.add_argument('--curve', type=Path, help="write the median time against synthetic size as CSV to this file")
+    parser.add_argument('--baseline', type=Path, default=BASELINE_FILE, help=f"baseline file (default: {BASELINE_FILE.name})")
+    parser.add_argument('--save', action='store_true', help="store the measured timings in the baseline file")
+    parser.add_argument('--check', action='store_true', help="fail when a day is slower than the baseline")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help=f"allowed slowdown before failing (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument('--json', action='store_true', help="emit one JSON object per line")
+    parser.add_argument('--inline', action='store_true', help="run every job in this process instead of a fresh one")
+
+def main(args) -> int:
+    jobs = make_bench_jobs(args.days, args.parts or PARTS, args.sizes, not args.synthetic_only, args.seed)
+    baseline = load_baseline(args.baseline)
+    results = list()
+    regressions = list()
+    if not args.json:
+        print(f"{'day':>3} {'part':>4} {'input':<22} {'median_s':>10} {'p95_s':>10} {'min_s':>10}")
+    for result in run_bench(jobs, args.repeat, isolate=not args.inline):
+        results.append(result)
+        regression = find_regression(result, baseline, args.threshold) if args.check else None
+        if regression:
+            regressions.append(regression)
+        if args.json:
+            entry = result._asdict()
+            entry['regression'] = regression is not None
+            print(json.dumps(entry, default=str), flush=True)
+        else:
+            suffix = f"  REGRESSION x{regression.ratio:.2f}" if regression else ""
+            print(format_result(result) + suffix, flush=True)
+    if args.save:
+        save_baseline(results, args.baseline)
+    curves = scaling_curves(results)
+    if curves and len(set(args.sizes)) > 1 and not args.json:
+        print(f"\n{'day':>3} {'part':>4} {'growth':>8}  size:median_s")
+        for (day, part), points in sorted(curves.items()):
+            print(format_curve(day, part, points))
+    if args.curve:
+        write_curves(args.curve, curves)
+    for regression in regressions:
+        print(f"Regression in {regression.key}: {regression.baseline:.4f}s -> {regression.current:.4f}s (x{regression.ratio:.2f})", file=sys.stderr)
+    if regressions or any(result.error for result in results):
+        return 1
+    return 0
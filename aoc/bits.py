@@ -0,0 +1,87 @@
+from typing import Iterable, Iterator, List, Mapping, Sequence, Tuple, TypeVar
+
+Item = TypeVar('Item')
+
+def popcount(mask: int) -> int:
+    return mask.bit_count()
+
+def bits(mask: int) -> Iterator[int]:
+    # Indexes of the set bits, lowest first
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+def lowest(mask: int) -> int:
+    # Index of the lowest set bit, -1 for an empty mask
+    return (mask & -mask).bit_length() - 1
+
+def highest(mask: int) -> int:
+    return mask.bit_length() - 1
+
+def full(count: int) -> int:
+    # The mask of the first count bits
+    return (1 << count) - 1
+
+def indexer(items: Iterable[Item]) -> Mapping[Item, int]:
+    # Bit index of every distinct item, in order of appearance, e.g. the
+    # valves of a graph or the letters of an alphabet
+    index = dict()
+    for item in items:
+        index.setdefault(item, len(index))
+    return index
+
+def from_indexes(indexes: Iterable[int]) -> int:
+    mask = 0
+    for idx in indexes:
+        mask |= 1 << idx
+    return mask
+
+def encode(items: Iterable[Item], index: Mapping[Item, int]) -> int:
+    mask = 0
+    for item in items:
+        mask |= 1 << index[item]
+    return mask
+
+def decode(mask: int, items: Sequence[Item]) -> List[Item]:
+    return [items[idx] for idx in bits(mask)]
+
+# Row bitboards: a grid is a list of ints, bit c of row r is the cell (r, c).
+# Shifting a whole row moves every cell of it at once, so the neighbors of all
+# the cells of a row are a handful of big int operations
+def to_rows(lines: Iterable[str], char: str = '#') -> List[int]:
+    rows = list()
+    for line in lines:
+        row = 0
+        for c, tile in enumerate(line):
+            if tile == char:
+                row |= 1 << c
+        rows.append(row)
+    return rows
+
+def from_rows(rows: Sequence[int], cols: int, char: str = '#', empty: str = '.') -> List[str]:
+    return [''.join(char if row >> c & 1 else empty for c in range(cols)) for row in rows]
+
+def west(row: int) -> int:
+    # Cells whose western neighbor is set
+    return row << 1
+
+def east(row: int) -> int:
+    # Cells whose eastern neighbor is set
+    return row >> 1
+
+def spread(row: int) -> int:
+    # Cells that are set or next to a set cell of the same row
+    return row | row << 1 | row >> 1
+
+def columns(rows: Iterable[int]) -> Tuple[int, int]:
+    # Lowest and highest column used by any row, (0, -1) when all are empty
+    low = None
+    high = -1
+    for row in rows:
+        if row:
+            first = lowest(row)
+            if low is None or first < low:
+                low = first
+            high = max(high, highest(row))
+    return (0 if low is None else low, high)
@@ -0,0 +1,68 @@
+import mmap
+import os
+import struct
+from array import array
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Sequence, Tuple
+
+from aoc import YEAR_DIR
+from aoc.answers import input_hash
+
+CACHE_DIR = YEAR_DIR.parent / '.aoc_cache' / 'parsed'
+# Set to 0 to parse every time, e.g. to benchmark the parsers themselves
+ENV_VAR = 'AOC_PARSE_CACHE'
+
+# Magic, record width and record count, followed by the int64 fields of
+# every record in native byte order
+HEADER = struct.Struct('<4sIQ')
+MAGIC = b'AOCP'
+
+Parser = Callable[[Path], Iterable[Sequence[int]]]
+
+def enabled() -> bool:
+    return os.environ.get(ENV_VAR, '1') != '0'
+
+def cache_file(input_file: Path, name: str, version: int) -> Path:
+    # A new parser version or a changed input is a different file
+    return CACHE_DIR / f"{name}-v{version}-{input_hash(input_file)[:32]}.bin"
+
+def write_records(path: Path, width: int, records: Iterable[Sequence[int]]) -> int:
+    flat = array('q')
+    for record in records:
+        if len(record) != width:
+            raise RuntimeError(f"Record {record} does not have {width} fields")
+        flat.extend(record)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with tmp.open('wb') as outf:
+        outf.write(HEADER.pack(MAGIC, width, len(flat) // width))
+        flat.tofile(outf)
+    tmp.replace(path)
+    return len(flat) // width
+
+def read_records(path: Path, width: int) -> memoryview:
+    with path.open('rb') as inf:
+        mapped = mmap.mmap(inf.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, stored_width, count = HEADER.unpack_from(mapped)
+    if magic != MAGIC or stored_width != width or len(mapped) != HEADER.size + count * width * 8:
+        raise RuntimeError(f"Corrupted parse cache {path}")
+    # The view keeps the mapping alive, nothing is copied
+    return memoryview(mapped)[HEADER.size:].cast('q')
+
+def load_records(input_file: Path, name: str, version: int, width: int, parse: Parser) -> Sequence[int]:
+    # Flat fields of the records `parse` returns for input_file, parsed once
+    # per input and parser version and memory mapped afterwards
+    if not enabled():
+        return array('q', [field for record in parse(input_file) for field in record])
+    path = cache_file(input_file, name, version)
+    if path.exists():
+        try:
+            return read_records(path, width)
+        except (RuntimeError, ValueError, struct.error):
+            pass
+    write_records(path, width, parse(input_file))
+    return read_records(path, width)
+
+def records(flat: Sequence[int], width: int) -> Iterator[Tuple[int, ...]]:
+    fields = iter(flat)
+    return zip(*[fields] * width)
@@ -0,0 +1,112 @@
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple, Optional, Sequence, Tuple, TypeVar
+
+State = TypeVar('State')
+# An int, or a tuple of ints for several metrics at once
+Metric = Any
+
+class Cycle(NamedTuple):
+    # States repeat from step start on, every length steps
+    start: int
+    length: int
+
+    def reduce(self, step: int) -> int:
+        # The first step with the same state as step
+        if step < self.start:
+            return step
+        return self.start + (step - self.start) % self.length
+
+def identity(state):
+    return state
+
+def floyd(transition: Callable[[State], State], initial: State, fingerprint: Callable[[State], Hashable] = identity, max_steps: Optional[int] = None) -> Optional[Cycle]:
+    # Tortoise and hare on a pure transition: constant memory, about three
+    # transitions per step. None when no cycle shows up within max_steps
+    slow = transition(initial)
+    fast = transition(slow)
+    steps = 1
+    while fingerprint(slow) != fingerprint(fast):
+        if max_steps is not None and steps > max_steps:
+            return None
+        slow = transition(slow)
+        fast = transition(transition(fast))
+        steps += 1
+    start = 0
+    slow = initial
+    while fingerprint(slow) != fingerprint(fast):
+        slow = transition(slow)
+        fast = transition(fast)
+        start += 1
+    length = 1
+    fast = transition(slow)
+    while fingerprint(slow) != fingerprint(fast):
+        fast = transition(fast)
+        length += 1
+    return Cycle(start, length)
+
+def brent(transition: Callable[[State], State], initial: State, fingerprint: Callable[[State], Hashable] = identity, max_steps: Optional[int] = None) -> Optional[Cycle]:
+    # Constant memory like Floyd, with fewer transitions: the hare runs
+    # ahead in powers of two and the tortoise teleports to it
+    power = length = 1
+    tortoise = fingerprint(initial)
+    hare = transition(initial)
+    steps = 1
+    while tortoise != fingerprint(hare):
+        if max_steps is not None and steps > max_steps:
+            return None
+        if power == length:
+            tortoise = fingerprint(hare)
+            power *= 2
+            length = 0
+        hare = transition(hare)
+        length += 1
+        steps += 1
+    # Two pointers length apart meet at the start of the cycle
+    tortoise = hare = initial
+    for _ in range(length):
+        hare = transition(hare)
+    start = 0
+    while fingerprint(tortoise) != fingerprint(hare):
+        tortoise = transition(tortoise)
+        hare = transition(hare)
+        start += 1
+    return Cycle(start, length)
+
+def detect(advance: Callable[[], None], fingerprint: Callable[[], Hashable], metric: Callable[[], Metric] = lambda: 0, max_steps: Optional[int] = None) -> Tuple[Optional[Cycle], List[Metric]]:
+    # Hashed snapshots for simulations that mutate their state in place and
+    # cannot be rewound. Fingerprints should be small, e.g. hash() of the
+    # state, and are checked over a whole extra period before a cycle is
+    # reported, so a collision can not fake one. Also returns the metric of
+    # every step simulated, for extrapolate
+    seen: Dict[Hashable, int] = dict()
+    prints: List[Hashable] = list()
+    metrics: List[Metric] = list()
+    step = 0
+    candidate: Optional[Cycle] = None
+    while max_steps is None or step <= max_steps:
+        key = fingerprint()
+        prints.append(key)
+        metrics.append(metric())
+        if candidate is not None:
+            if key != prints[step - candidate.length]:
+                candidate = None
+            elif step == candidate.start + 2 * candidate.length:
+                return candidate, metrics
+        if candidate is None and key in seen:
+            candidate = Cycle(seen[key], step - seen[key])
+        seen[key] = step
+        advance()
+        step += 1
+    return None, metrics
+
+def extrapolate(metrics: Sequence[Metric], cycle: Cycle, step: int) -> Metric:
+    # Value of a metric that grows by the same amount every period, known
+    # for steps 0 to cycle.start + cycle.length at least, at any later step
+    if step < len(metrics):
+        return metrics[step]
+    periods, rest = divmod(step - cycle.start, cycle.length)
+    base = metrics[cycle.start + rest]
+    first = metrics[cycle.start]
+    after = metrics[cycle.start + cycle.length]
+    if isinstance(base, tuple):
+        return tuple(value + periods * (late - early) for value, early, late in zip(base, first, after))
+    return base + periods * (after - first)
@@ -0,0 +1,221 @@
+from array import array
+from pathlib import Path
+from typing import Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+Cells = Union[bytearray, array]
+
+class Grid:
+    # Row-major cells in one flat buffer ('B' is a bytearray, any other array
+    # typecode such as 'h' an array.array), surrounded by `pad` rows and
+    # columns of `pad_value`. Hot loops work on flat indexes: the neighbors of
+    # idx are idx + offset for the offsets below, and the padding makes them
+    # valid without any bounds check
+    def __init__(self, rows: int, cols: int, fill: int = 0, pad: int = 1, pad_value: Optional[int] = None, typecode: str = 'B'):
+        if pad_value is None:
+            pad_value = fill
+        self.rows = rows
+        self.cols = cols
+        self.pad = pad
+        self.fill = fill
+        self.pad_value = pad_value
+        self.typecode = typecode
+        self.width = cols + 2 * pad
+        self.height = rows + 2 * pad
+        self.offsets4 = (-self.width, self.width, -1, 1)
+        self.offsets8 = (-self.width - 1, -self.width, -self.width + 1, -1, 1, self.width - 1, self.width, self.width + 1)
+        self.cells: Cells = self._filled(pad_value, pad * self.width)
+        self.cells += self._row() * rows
+        self.cells += self._filled(pad_value, pad * self.width)
+
+    def _filled(self, value: int, count: int) -> Cells:
+        if self.typecode == 'B':
+            return bytearray([value]) * count
+        return array(self.typecode, [value]) * count
+    def _row(self) -> Cells:
+        row = self._filled(self.pad_value, self.pad)
+        row += self._filled(self.fill, self.cols)
+        row += self._filled(self.pad_value, self.pad)
+        return row
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[Union[str, bytes]], table: Mapping[str, int], fill: int = 0, pad: int = 1, pad_value: Optional[int] = None) -> 'Grid':
+        # Character maps are translated a whole line at a time, shorter lines
+        # are completed with `fill`
+        rows = [line.encode() if isinstance(line, str) else bytes(line) for line in lines]
+        translate = bytearray(range(256))
+        for char, value in table.items():
+            translate[ord(char)] = value
+        known = ''.join(table).encode()
+        grid = cls(len(rows), max((len(row) for row in rows), default=0), fill, pad, pad_value)
+        for r, row in enumerate(rows):
+            unknown = row.translate(None, known)
+            if unknown:
+                raise RuntimeError(f"Unknown tiles {unknown.decode()!r} in row {r}")
+            start = grid.index(r, 0)
+            grid.cells[start:start + len(row)] = row.translate(translate)
+        return grid
+    @classmethod
+    def from_file(cls, input_file: Path, table: Mapping[str, int], fill: int = 0, pad: int = 1, pad_value: Optional[int] = None) -> 'Grid':
+        # Reads up to the first empty line, leading blanks are part of the map
+        lines = list()
+        for line in input_file.read_bytes().split(b'\n'):
+            line = line.rstrip(b'\r')
+            if not line:
+                break
+            lines.append(line)
+        return cls.from_lines(lines, table, fill, pad, pad_value)
+
+    def index(self, r: int, c: int) -> int:
+        return (r + self.pad) * self.width + c + self.pad
+    def position(self, idx: int) -> Tuple[int, int]:
+        r, c = divmod(idx, self.width)
+        return (r - self.pad, c - self.pad)
+    def __getitem__(self, pos: Tuple[int, int]) -> int:
+        return self.cells[self.index(*pos)]
+    def __setitem__(self, pos: Tuple[int, int], value: int):
+        self.cells[self.index(*pos)] = value
+    def __contains__(self, pos: Tuple[int, int]) -> bool:
+        r, c = pos
+        return 0 <= r < self.rows and 0 <= c < self.cols
+    def inside(self, idx: int) -> bool:
+        return self.position(idx) in self
+
+    def neighbors(self, idx: int, offsets: Optional[Tuple[int, ...]] = None) -> List[int]:
+        return [idx + offset for offset in (offsets or self.offsets4)]
+    def around(self, idx: int, offsets: Optional[Tuple[int, ...]] = None) -> Tuple[int, ...]:
+        cells = self.cells
+        return tuple(cells[idx + offset] for offset in (offsets or self.offsets8))
+
+    def row(self, r: int) -> Cells:
+        start = self.index(r, 0)
+        return self.cells[start:start + self.cols]
+    def count(self, value: int) -> int:
+        return sum(self.row(r).count(value) for r in range(self.rows))
+    def find(self, value: int) -> List[int]:
+        found = list()
+        for r in range(self.rows):
+            start = self.index(r, 0)
+            row = self.row(r)
+            if self.typecode == 'B':
+                c = row.find(value)
+                while c >= 0:
+                    found.append(start + c)
+                    c = row.find(value, c + 1)
+            else:
+                found.extend(start + c for c, cell in enumerate(row) if cell == value)
+        return found
+    def layer(self) -> 'BitLayer':
+        return BitLayer(len(self.cells))
+
+    # Whole grid queries: a layer is one big int over the flat cells, so a
+    # neighbor offset shifts every cell at once and the padding keeps the
+    # shifted cells of the grid inside the buffer
+    def where(self, value: int) -> 'BitLayer':
+        # Every cell equal to value, padding included
+        if self.typecode == 'B':
+            table = bytearray(b'0') * 256
+            table[value] = ord('1')
+            digits = bytes(self.cells).translate(table)
+        else:
+            digits = bytes(ord('1') if cell == value else ord('0') for cell in self.cells)
+        return BitLayer.from_int(len(self.cells), int(digits[::-1], 2) if digits else 0)
+    def inside_layer(self) -> 'BitLayer':
+        # The cells of the grid, without the padding
+        row = ((1 << self.cols) - 1) << self.pad
+        value = 0
+        for r in range(self.rows):
+            value |= row << (r + self.pad) * self.width
+        return BitLayer.from_int(len(self.cells), value)
+    def neighbor_planes(self, layer: 'BitLayer', offsets: Optional[Tuple[int, ...]] = None) -> List[int]:
+        # How many neighbors of every cell are in layer, bit sliced: bit k of
+        # the count of idx is bit idx of plane k. Adding a shifted layer is a
+        # ripple carry over the planes
+        planes: List[int] = list()
+        for offset in (offsets or self.offsets8):
+            carry = layer.shifted(offset).as_int()
+            for k in range(len(planes)):
+                if not carry:
+                    break
+                planes[k], carry = planes[k] ^ carry, planes[k] & carry
+            if carry:
+                planes.append(carry)
+        return planes
+    def neighbors_at_least(self, layer: 'BitLayer', count: int, offsets: Optional[Tuple[int, ...]] = None) -> 'BitLayer':
+        # Cells with count neighbors or more in layer, compared bit plane by
+        # bit plane from the highest one
+        planes = self.neighbor_planes(layer, offsets)
+        full = (1 << len(self.cells)) - 1
+        equal = full
+        greater = 0
+        for k in range(max(len(planes), count.bit_length()) - 1, -1, -1):
+            plane = planes[k] if k < len(planes) else 0
+            if count >> k & 1:
+                equal &= plane
+            else:
+                greater |= equal & plane
+                equal &= ~plane
+        return BitLayer.from_int(len(self.cells), (greater | equal) & full)
+
+    def grow(self, rows: int):
+        # New rows go below the last one, so existing indexes stay valid
+        tail = self.cells[len(self.cells) - self.pad * self.width:]
+        del self.cells[len(self.cells) - self.pad * self.width:]
+        self.cells += self._row() * rows
+        self.cells += tail
+        self.rows += rows
+        self.height += rows
+    def copy(self) -> 'Grid':
+        other = Grid.__new__(Grid)
+        other.__dict__.update(self.__dict__)
+        other.cells = self.cells[:]
+        return other
+    def snapshot(self) -> bytes:
+        return self.cells.tobytes() if self.typecode != 'B' else bytes(self.cells)
+    def render(self, chars: Mapping[int, str]) -> str:
+        return '\n'.join(''.join(chars[cell] for cell in self.row(r)) for r in range(self.rows))
+
+class BitLayer:
+    # A set of flat grid indexes, packed eight to a byte
+    __slots__ = ('size', 'bits')
+
+    def __init__(self, size: int, indexes: Iterable[int] = ()):
+        self.size = size
+        self.bits = bytearray((size + 7) >> 3)
+        for idx in indexes:
+            self.add(idx)
+    def add(self, idx: int):
+        self.bits[idx >> 3] |= 1 << (idx & 7)
+    def discard(self, idx: int):
+        self.bits[idx >> 3] &= ~(1 << (idx & 7)) & 0xff
+    def __contains__(self, idx: int) -> bool:
+        return (self.bits[idx >> 3] >> (idx & 7)) & 1 == 1
+    def __len__(self) -> int:
+        return self.as_int().bit_count()
+    def __iter__(self) -> Iterator[int]:
+        for byte_idx, byte in enumerate(self.bits):
+            while byte:
+                low = byte & -byte
+                yield (byte_idx << 3) + low.bit_length() - 1
+                byte ^= low
+    def __eq__(self, other) -> bool:
+        return isinstance(other, BitLayer) and self.bits == other.bits
+    def clear(self):
+        self.bits[:] = bytes(len(self.bits))
+    def as_int(self) -> int:
+        return int.from_bytes(self.bits, 'little')
+    def shifted(self, offset: int) -> 'BitLayer':
+        # Bit idx is set when idx + offset is in the layer
+        value = self.as_int()
+        value = value >> offset if offset >= 0 else value << -offset
+        return BitLayer.from_int(self.size, value & ((1 << self.size) - 1))
+    @classmethod
+    def from_int(cls, size: int, value: int) -> 'BitLayer':
+        layer = cls(size)
+        layer.bits[:] = value.to_bytes(len(layer.bits), 'little')
+        return layer
+    def __or__(self, other: 'BitLayer') -> 'BitLayer':
+        return BitLayer.from_int(self.size, self.as_int() | other.as_int())
+    def __and__(self, other: 'BitLayer') -> 'BitLayer':
+        return BitLayer.from_int(self.size, self.as_int() & other.as_int())
+    def __sub__(self, other: 'BitLayer') -> 'BitLayer':
+        return BitLayer.from_int(self.size, self.as_int() & ~other.as_int())
@@ -0,0 +1,180 @@
+import heapq
+from bisect import bisect_right
+from typing import Iterable, Iterator, List, Tuple
+
+Span = Tuple[int, int]
+
+class IntervalSet:
+    # A set of integers stored as sorted, disjoint and non adjacent inclusive
+    # spans (lo, hi), the way puzzles write ranges: 2-4 is 2, 3 and 4. Memory
+    # and time depend on the number of spans, never on the values
+    def __init__(self, spans: Iterable[Span] = ()):
+        self.spans: List[Span] = merge(spans)
+
+    @classmethod
+    def _from_merged(cls, spans: List[Span]) -> 'IntervalSet':
+        result = cls()
+        result.spans = spans
+        return result
+
+    def __iter__(self) -> Iterator[Span]:
+        return iter(self.spans)
+    def __len__(self) -> int:
+        return len(self.spans)
+    def __bool__(self) -> bool:
+        return bool(self.spans)
+    def __eq__(self, other) -> bool:
+        return isinstance(other, IntervalSet) and self.spans == other.spans
+    def __repr__(self) -> str:
+        return f"IntervalSet({self.spans})"
+
+    def _find(self, value: int) -> int:
+        # Index of the last span starting at or before value, -1 if none
+        return bisect_right(self.spans, (value, float('inf'))) - 1
+
+    def add(self, lo: int, hi: int):
+        if lo > hi:
+            return
+        spans = self.spans
+        first = bisect_right(spans, (lo, float('inf')))
+        if first and spans[first - 1][1] >= lo - 1:
+            first -= 1
+        last = first
+        while last < len(spans) and spans[last][0] <= hi + 1:
+            last += 1
+        if first < last:
+            lo = min(lo, spans[first][0])
+            hi = max(hi, spans[last - 1][1])
+        spans[first:last] = [(lo, hi)]
+
+    def __contains__(self, value: int) -> bool:
+        idx = self._find(value)
+        return idx >= 0 and self.spans[idx][1] >= value
+    def covers(self, lo: int, hi: int) -> bool:
+        # Every value of lo..hi is in the set
+        idx = self._find(lo)
+        return idx >= 0 and self.spans[idx][1] >= hi
+    def overlaps(self, lo: int, hi: int) -> bool:
+        # Some value of lo..hi is in the set
+        if lo > hi:
+            return False
+        idx = self._find(hi)
+        return idx >= 0 and self.spans[idx][1] >= lo
+
+    def length(self) -> int:
+        # How many integers the set holds
+        return sum(hi - lo + 1 for lo, hi in self.spans)
+
+    def union(self, other: Iterable[Span]) -> 'IntervalSet':
+        return IntervalSet(self.spans + list(other))
+    def intersection(self, other: Iterable[Span]) -> 'IntervalSet':
+        # Both span lists are sorted, a single merge pass is enough
+        first = self.spans
+        second = other.spans if isinstance(other, IntervalSet) else merge(other)
+        result = list()
+        i = j = 0
+        while i < len(first) and j < len(second):
+            lo = max(first[i][0], second[j][0])
+            hi = min(first[i][1], second[j][1])
+            if lo <= hi:
+                result.append((lo, hi))
+            if first[i][1] < second[j][1]:
+                i += 1
+            else:
+                j += 1
+        return IntervalSet._from_merged(result)
+    __or__ = union
+    __and__ = intersection
+
+    def gaps(self, lo: int, hi: int) -> 'IntervalSet':
+        # The values of lo..hi that are not in the set
+        result = list()
+        start = lo
+        for span_lo, span_hi in self.spans[max(self._find(lo), 0):]:
+            if span_lo > hi:
+                break
+            if span_lo > start:
+                result.append((start, span_lo - 1))
+            start = max(start, span_hi + 1)
+        if start <= hi:
+            result.append((start, hi))
+        return IntervalSet._from_merged(result)
+
+class IntervalIndex:
+    # Spans that may overlap, known by their position in the input. Sorted by
+    # start, with a tree of the largest end below every node, so a query only
+    # walks down to the spans it returns
+    def __init__(self, spans: Iterable[Span]):
+        self.spans: List[Span] = list(spans)
+        self.order = sorted(range(len(self.spans)), key=self.spans.__getitem__)
+        self.starts = [self.spans[idx][0] for idx in self.order]
+        self.size = 1
+        while self.size < len(self.order):
+            self.size *= 2
+        self.max_end = [float('-inf')] * (2 * self.size)
+        for pos, idx in enumerate(self.order):
+            self.max_end[self.size + pos] = self.spans[idx][1]
+        for node in range(self.size - 1, 0, -1):
+            self.max_end[node] = max(self.max_end[2 * node], self.max_end[2 * node + 1])
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+    def overlapping(self, lo: int, hi: int) -> List[int]:
+        # Spans sharing some value with lo..hi, by increasing start. Those
+        # are the spans starting at or before hi that end at or after lo
+        count = bisect_right(self.starts, hi)
+        result = list()
+        stack = [(1, 0, self.size)]
+        while stack:
+            node, left, right = stack.pop()
+            if left >= count or self.max_end[node] < lo:
+                continue
+            if right - left == 1:
+                result.append(self.order[left])
+                continue
+            mid = (left + right) // 2
+            stack.append((2 * node + 1, mid, right))
+            stack.append((2 * node, left, mid))
+        return result
+    def containing(self, value: int) -> List[int]:
+        return self.overlapping(value, value)
+
+    def max_coverage(self) -> Tuple[int, int]:
+        # Most spans sharing a value, and the first such value, with a sweep
+        # over starts and ends. A span stops counting the value after its end
+        events = sorted([(lo, 1) for lo, hi in self.spans] + [(hi + 1, -1) for lo, hi in self.spans])
+        best = (0, 0)
+        count = 0
+        for value, change in events:
+            count += change
+            if count > best[0]:
+                best = (count, value)
+        return best
+
+    def overlapping_pairs(self) -> Iterator[Tuple[int, int]]:
+        # Every pair of overlapping spans once, (earlier, later) in input
+        # order. Sweeping by start, the spans still open when one starts are
+        # exactly those it overlaps
+        active: List[Tuple[int, int]] = list()
+        for idx in self.order:
+            lo, hi = self.spans[idx]
+            while active and active[0][0] < lo:
+                heapq.heappop(active)
+            for _, other in active:
+                yield (min(idx, other), max(idx, other))
+            heapq.heappush(active, (hi, idx))
+
+def merge(spans: Iterable[Span]) -> List[Span]:
+    # Sorted, disjoint and non adjacent spans covering the same values, empty
+    # spans (lo > hi) are dropped
+    result: List[Span] = list()
+    for lo, hi in sorted(spans):
+        if lo > hi:
+            continue
+        if result and lo <= result[-1][1] + 1:
+            if hi > result[-1][1]:
+                result[-1] = (result[-1][0], hi)
+        else:
+            result.append((lo, hi))
+    return result
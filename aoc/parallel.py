@@ -0,0 +1,66 @@
+import multiprocessing
+import os
+from functools import partial
+from pathlib import Path
+from typing import Any, List, Tuple
+
+from aoc import reader, runner
+
+# Ranges per worker process, a few more than one keeps every worker busy
+# when some ranges are slower than others
+RANGES_PER_PROCESS = 4
+
+def split(data: reader.Buffer, parts: int, group: int = 1) -> List[Tuple[int, int]]:
+    # About equal (start, end) byte ranges of data, each starting on a line
+    # and, for group > 1, after a multiple of group records. Records are the
+    # lines that are not blank, as the days read them, so only grouping
+    # needs to look at the lines, windows at a time
+    size = len(data)
+    bounds = [0]
+    for idx in range(1, parts):
+        cut = data.find(b'\n', max(size * idx // parts, bounds[-1] + 1) - 1)
+        if cut < 0 or cut + 1 >= size:
+            break
+        if cut + 1 > bounds[-1]:
+            bounds.append(cut + 1)
+    if group > 1:
+        grouped = [0]
+        counted = 0
+        records = 0
+        for bound in bounds[1:]:
+            if bound <= counted:
+                continue
+            records += sum(1 for line in reader.window_lines(data, counted, bound) if line.strip())
+            # Move on to the start of the next group
+            while records % group and bound < size:
+                cut = data.find(b'\n', bound)
+                end = size if cut < 0 else cut + 1
+                if data[bound:end].strip():
+                    records += 1
+                bound = end
+            counted = bound
+            if bound < size:
+                grouped.append(bound)
+        bounds = grouped
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+def _score(day: int, name: str, input_file: Path, kwargs: dict, bounds: Tuple[int, int]) -> Any:
+    # In the worker: the mapping is opened again and shared with the parent
+    # through the page cache, only the range bounds and the result travel
+    scorer = getattr(runner.load_day(day), name)
+    return scorer(reader.mapped(input_file), *bounds, **kwargs)
+
+def score_ranges(day: int, name: str, input_file: Path, processes: int = 1, group: int = 1, **kwargs) -> List[Any]:
+    # Splits input_file at line (or group of lines) boundaries and calls the
+    # function name of the day on every range as name(data, start, end,
+    # **kwargs), in a pool when processes > 1. The partial results come back
+    # in input order, for the day to reduce
+    processes = processes or os.cpu_count() or 1
+    data = reader.mapped(input_file)
+    if processes <= 1:
+        return [getattr(runner.load_day(day), name)(data, 0, len(data), **kwargs)]
+    ranges = split(data, processes * RANGES_PER_PROCESS, group)
+    ctx = multiprocessing.get_context()
+    with ctx.Pool(processes=processes, initializer=runner.load_day, initargs=(day,)) as pool:
+        return pool.map(partial(_score, day, name, Path(input_file), kwargs), ranges)
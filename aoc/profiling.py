@@ -0,0 +1,171 @@
+import cProfile
+import io
+import pstats
+import signal
+import sys
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Dict, List, Optional, Tuple, Type
+
+from aoc import YEAR_DIR, timings
+
+REPORTS_DIR = YEAR_DIR.parent / 'reports'
+# Rows of the text reports
+TOP = 40
+
+def report_base(day: int, part: int, input_file: Path, directory: Optional[Path] = None) -> Path:
+    # Stable per day, part and input, so a new run overwrites the old report
+    return (directory or REPORTS_DIR) / f"day{day:02d}_part{part}_{timings.input_label(input_file.resolve())}"
+
+def frame_label(code: CodeType) -> str:
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+class Profiler:
+    # Also the profiler of the runs that are not profiled: it only runs the
+    # call and has nothing to write
+    name = ''
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def write(self, base: Path) -> List[Path]:
+        return list()
+
+    def path(self, base: Path, suffix: str) -> Path:
+        base.parent.mkdir(parents=True, exist_ok=True)
+        return base.with_name(f"{base.name}.{self.name}{suffix}")
+
+class CProfiler(Profiler):
+    # Deterministic, exact call counts but a high overhead on the small
+    # functions of the hot loops
+    name = 'cprofile'
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def __enter__(self):
+        self.profile.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self.profile.disable()
+        return False
+
+    def write(self, base: Path) -> List[Path]:
+        raw = self.path(base, '.prof')
+        self.profile.dump_stats(raw)
+        text = io.StringIO()
+        stats = pstats.Stats(self.profile, stream=text)
+        stats.sort_stats('cumulative').print_stats(TOP)
+        report = self.path(base, '.txt')
+        report.write_text(text.getvalue())
+        return [raw, report]
+
+class SamplingProfiler(Profiler):
+    # Samples the Python stack every interval of CPU time. Stacks are written
+    # in the folded format of flamegraph.pl and speedscope, one line per
+    # distinct stack, so deep recursions keep every level
+    name = 'sample'
+
+    def __init__(self, interval: float = 0.001):
+        if not hasattr(signal, 'setitimer'):
+            raise RuntimeError(f"The sampling profiler needs signal.setitimer, not available on {sys.platform}")
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.labels: Dict[CodeType, str] = dict()
+        self.root: Optional[FrameType] = None
+        self.previous = None
+
+    def sample(self, signum, frame: Optional[FrameType]):
+        stack = list()
+        while frame is not None and frame is not self.root:
+            stack.append(frame.f_code)
+            frame = frame.f_back
+        if stack:
+            self.stacks[tuple(reversed(stack))] += 1
+
+    def __enter__(self):
+        # Stacks stop below the frame that started profiling
+        self.root = sys._getframe(1)
+        self.previous = signal.signal(signal.SIGPROF, self.sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        return self
+
+    def __exit__(self, *exc):
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self.previous)
+        self.root = None
+        return False
+
+    def label(self, code: CodeType) -> str:
+        label = self.labels.get(code)
+        if label is None:
+            label = self.labels[code] = frame_label(code).replace(';', ':')
+        return label
+
+    def folded(self) -> List[str]:
+        lines = [f"{';'.join(self.label(code) for code in stack)} {count}" for stack, count in self.stacks.items()]
+        return sorted(lines)
+
+    def top(self) -> List[Tuple[str, int, int]]:
+        # (function, own samples, samples with the function on the stack)
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for code in set(stack):
+                total[code] += count
+        return [(self.label(code), own[code], samples) for code, samples in total.most_common(TOP)]
+
+    def write(self, base: Path) -> List[Path]:
+        folded = self.path(base, '.folded')
+        folded.write_text(''.join(line + '\n' for line in self.folded()))
+        samples = sum(self.stacks.values())
+        lines = [f"{samples} samples every {self.interval * 1000:g}ms of CPU time", f"{'own':>8} {'total':>8}  function"]
+        for label, own, total in self.top():
+            lines.append(f"{own:>8} {total:>8}  {label}")
+        report = self.path(base, '.txt')
+        report.write_text('\n'.join(lines) + '\n')
+        return [folded, report]
+
+class MemoryProfiler(Profiler):
+    # Peak of the Python allocations and the lines that hold the most memory
+    # at the end of the call
+    name = 'memory'
+
+    def __init__(self, frames: int = 1):
+        self.frames = frames
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+        self.current = 0
+        self.peak = 0
+
+    def __enter__(self):
+        tracemalloc.start(self.frames)
+        return self
+
+    def __exit__(self, *exc):
+        self.snapshot = tracemalloc.take_snapshot()
+        self.current, self.peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return False
+
+    def write(self, base: Path) -> List[Path]:
+        snapshot = self.snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+        lines = [f"peak {self.peak / 1024:.1f}KiB, still allocated {self.current / 1024:.1f}KiB"]
+        for stat in snapshot.statistics('lineno')[:TOP]:
+            lines.append(str(stat))
+        report = self.path(base, '.txt')
+        report.write_text('\n'.join(lines) + '\n')
+        return [report]
+
+PROFILERS: Dict[str, Type[Profiler]] = {profiler.name: profiler for profiler in (CProfiler, SamplingProfiler, MemoryProfiler)}
+
+def get_profiler(name: str) -> Profiler:
+    if name not in PROFILERS:
+        raise RuntimeError(f"Unknown profiler {name!r}, expected one of {', '.join(PROFILERS)}")
+    return PROFILERS[name]()
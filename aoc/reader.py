@@ -0,0 +1,147 @@
+import mmap
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+
+# Anything the helpers below can scan: a mapped file, bytes or a memoryview
+Buffer = Union[mmap.mmap, bytes, bytearray, memoryview]
+
+INT_PATTERN = re.compile(rb'-?\d+')
+UINT_PATTERN = re.compile(rb'\d+')
+# Everything but the digits (and minus signs) becomes a space, so that a
+# single bytes.split finds the numbers at C speed
+DIGITS = b'0123456789'
+UINT_TABLE = bytes(char if char in DIGITS else ord(' ') for char in range(256))
+INT_TABLE = bytes(char if char in DIGITS + b'-' else ord(' ') for char in range(256))
+GROUP_TABLE = bytes(char if char in DIGITS + b'-\n' else ord(' ') for char in range(256))
+# Bytes read at once by the streaming helpers
+CHUNK_SIZE = 1 << 20
+
+def mapped(input_file: Path) -> Buffer:
+    # The whole file as read only shared memory, no read() copy and nothing
+    # decoded. The mapping lives as long as the returned object
+    with open(input_file, 'rb') as inf:
+        try:
+            return mmap.mmap(inf.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            return b''
+
+def lines(data: Buffer) -> Iterator[memoryview]:
+    # Every line as a view into data, without its line break and without a
+    # str per line. Like iterating a text file, there is no empty last line
+    view = memoryview(data)
+    size = len(data)
+    start = 0
+    while start < size:
+        end = data.find(b'\n', start)
+        if end < 0:
+            end = size
+        stop = end
+        if stop > start and view[stop - 1] == 13:
+            stop -= 1
+        yield view[start:stop]
+        start = end + 1
+
+def windows(data: Buffer, size: int = CHUNK_SIZE, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+    # Consecutive copies of about size bytes of data[start:end], cut right
+    # after a line break so that no line is split between two windows
+    stop = len(data) if end is None else end
+    while start < stop:
+        cut = data.find(b'\n', start + size - 1, stop) if start + size < stop else -1
+        end = stop if cut < 0 else cut + 1
+        yield data[start:end]
+        start = end
+
+def window_lines(data: Buffer, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+    # The lines of data[start:end] without their line breaks, a window at a
+    # time
+    for window in windows(data, start=start, end=end):
+        yield from window.splitlines()
+
+def count_lines(data: Buffer) -> Counter:
+    # How many times every distinct line appears, for inputs with few kinds
+    # of lines like the rounds of day 2
+    return Counter(bytes(data).splitlines())
+
+def ints(data: Buffer, signed: bool = True) -> List[int]:
+    # Every number of data in order, unsigned reads 2-4 as 2 and 4
+    tokens = bytes(data).translate(INT_TABLE if signed else UINT_TABLE).split()
+    try:
+        return list(map(int, tokens))
+    except ValueError:
+        # A dash int() can not read, alone as in 'a - b' or after a digit as
+        # in '2-4'. The pattern takes every dash before a digit as a sign, so
+        # 2-4 still reads as 2 and -4, use signed=False for ranges
+        return list(map(int, INT_PATTERN.findall(data)))
+
+def int_records(data: Buffer, width: int, signed: bool = True) -> Iterator[Tuple[int, ...]]:
+    # Numbers width at a time, e.g. the four bounds of a day 4 line
+    numbers = ints(data, signed)
+    if len(numbers) % width:
+        raise RuntimeError(f"{len(numbers)} numbers do not make records of {width}")
+    fields = iter(numbers)
+    return zip(*[fields] * width)
+
+def int_columns(data: Buffer, width: int, signed: bool = True) -> List[List[int]]:
+    numbers = ints(data, signed)
+    if len(numbers) % width:
+        raise RuntimeError(f"{len(numbers)} numbers do not make records of {width}")
+    return [numbers[column::width] for column in range(width)]
+
+def _group_ints(group: bytes) -> List[int]:
+    # A group already translated with GROUP_TABLE
+    try:
+        return list(map(int, group.split()))
+    except ValueError:
+        return ints(group)
+
+def int_groups(data: Buffer) -> Iterator[List[int]]:
+    # Numbers grouped by the blank lines between them
+    text = bytes(data).replace(b'\r\n', b'\n').translate(GROUP_TABLE)
+    for group in text.split(b'\n\n'):
+        numbers = _group_ints(group)
+        if numbers:
+            yield numbers
+
+def chunks(input_file: Path, size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    with open(input_file, 'rb') as inf:
+        while True:
+            chunk = inf.read(size)
+            if not chunk:
+                return
+            yield chunk
+
+def stream_groups(input_file: Path, size: int = CHUNK_SIZE) -> Iterator[List[int]]:
+    # Same groups as int_groups, but reading size bytes at a time so that
+    # memory does not depend on the file size. Only the groups before the
+    # last blank line read so far are complete, the pieces after it wait in
+    # a list and are joined once, so a huge group is not copied again with
+    # every chunk
+    pending: List[bytes] = list()
+    last = b''
+    carry = b''
+    for chunk in chunks(input_file, size):
+        chunk = carry + chunk
+        # A \r\n split between two chunks
+        carry = chunk[-1:] if chunk.endswith(b'\r') else b''
+        chunk = chunk[:len(chunk) - len(carry)].replace(b'\r\n', b'\n')
+        if not chunk:
+            continue
+        cut = chunk.rfind(b'\n\n')
+        if cut >= 0:
+            pending.append(chunk[:cut])
+            rest = chunk[cut + 2:]
+        elif last == b'\n' and chunk.startswith(b'\n'):
+            # The blank line starts at the end of the previous chunk
+            rest = chunk[1:]
+        else:
+            pending.append(chunk)
+            last = chunk[-1:]
+            continue
+        yield from int_groups(b''.join(pending))
+        pending = [rest]
+        last = rest[-1:]
+    pending.append(carry)
+    yield from int_groups(b''.join(pending))
@@ -0,0 +1,252 @@
+import ast
+import importlib.util
+import inspect
+import json
+import multiprocessing
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+from functools import partial
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from aoc import DAYS, PARTS, YEAR_DIR, answers, profiling, timings, trace, viz
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, peak RSS is reported as None there
+    resource = None
+
+class Job(NamedTuple):
+    day: int
+    part: int
+    input_file: Path
+    params: Dict[str, Any] = {}
+
+class JobResult(NamedTuple):
+    day: int
+    part: int
+    input_file: str
+    answer: Any
+    wall_s: float
+    cpu_s: float
+    peak_rss_kb: Optional[int]
+    error: Optional[str] = None
+    # True or False when the input is in the answer registry, None otherwise
+    verified: Optional[bool] = None
+    # Files written by the profiler, if any
+    reports: List[str] = []
+
+def day_dir(day: int) -> Path:
+    return YEAR_DIR / str(day)
+
+def resolve_input(day: int, name: Optional[str] = None) -> Path:
+    if name is None:
+        return day_dir(day) / 'input.txt'
+    path = Path(name)
+    if path.exists():
+        return path
+    # Allow names relative to the day folder, e.g. 'test_input.txt'
+    return day_dir(day) / name
+
+def load_day(day: int) -> ModuleType:
+    name = f"test_{day}"
+    path = day_dir(day) / f"{name}.py"
+    module = sys.modules.get(name)
+    if module is not None and Path(module.__file__).resolve() == path.resolve():
+        return module
+    spec = importlib.util.spec_from_file_location(name, path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Cannot load day {day} from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+    return module
+
+def find_solver(module: ModuleType, part: int) -> Optional[Callable]:
+    solver = getattr(module, f"sol{part}", None)
+    if callable(solver):
+        return solver
+    return None
+
+def bind_params(solver: Callable, params: Dict[str, Any]) -> Dict[str, Any]:
+    # Only forward the parameters the solver actually accepts, so a single
+    # --param can be given for a run across several days
+    accepted = inspect.signature(solver).parameters
+    return {key: value for key, value in params.items() if key in accepted}
+
+def parse_param(text: str) -> Dict[str, Any]:
+    if '=' not in text:
+        raise ValueError(f"Bad parameter {text!r}, expected KEY=VALUE")
+    key, raw = text.split('=', 1)
+    try:
+        value = ast.literal_eval(raw)
+    except (ValueError, SyntaxError):
+        value = raw
+    return {key.strip(): value}
+
+def peak_rss_kb() -> Optional[int]:
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        # macOS reports bytes instead of kilobytes
+        rss //= 1024
+    return rss
+
+def run_job(job: Job, quiet: bool = True, profiler: Optional[str] = None) -> JobResult:
+    answer = None
+    error = None
+    verified = None
+    wall = 0.0
+    cpu = 0.0
+    try:
+        module = load_day(job.day)
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}"
+        return JobResult(job.day, job.part, str(job.input_file), None, wall, cpu, peak_rss_kb(), error)
+    solver = find_solver(module, job.part)
+    if solver is None:
+        raise RuntimeError(f"Day {job.day} has no solver for part {job.part}")
+    kwargs = bind_params(solver, job.params)
+    prof = profiling.get_profiler(profiler) if profiler else profiling.Profiler()
+    with open(os.devnull, 'w') as devnull:
+        out = devnull if quiet else sys.stdout
+        with redirect_stdout(out):
+            wall = time.perf_counter()
+            cpu = time.process_time()
+            try:
+                with prof:
+                    answer = solver(job.input_file, **kwargs)
+            except Exception as exc:
+                error = f"{type(exc).__name__}: {exc}"
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+    reports = list()
+    if profiler:
+        # Also written when the solver failed, the profile shows how far it got
+        reports = [str(path) for path in prof.write(profiling.report_base(job.day, job.part, job.input_file))]
+    if error is None:
+        verified = answers.verify(job.input_file, job.part, answer, kwargs)
+    return JobResult(job.day, job.part, str(job.input_file), answer, wall, cpu, peak_rss_kb(), error, verified, reports)
+
+def make_jobs(days: Iterable[int], parts: Iterable[int], input_name: Optional[str] = None, params: Optional[Dict[str, Any]] = None) -> List[Job]:
+    jobs = list()
+    for day in days:
+        try:
+            module = load_day(day)
+        except Exception:
+            # Keep the jobs, run_job reports why the day cannot be loaded
+            module = None
+        for part in parts:
+            if module is not None and find_solver(module, part) is None:
+                continue
+            jobs.append(Job(day, part, resolve_input(day, input_name), dict(params or {})))
+    return jobs
+
+def longest_first(expected: List[float]) -> List[int]:
+    # Longest processing time first: the long days start right away and the
+    # short ones fill the gaps, ties keep the day order
+    return sorted(range(len(expected)), key=lambda idx: (-expected[idx], idx))
+
+def map_jobs(func: Callable[[Job], Any], jobs: Iterable[Job], isolate: bool = True, processes: int = 1, expected: Optional[List[float]] = None) -> Iterable[Any]:
+    jobs = list(jobs)
+    if not isolate:
+        for job in jobs:
+            yield func(job)
+        return
+    # One fresh process per job: peak RSS is then per job and module level
+    # state of a day cannot leak from one part into the other
+    ctx = multiprocessing.get_context()
+    processes = max(1, min(processes, len(jobs)))
+    with ctx.Pool(processes=processes, maxtasksperchild=1) as pool:
+        if processes == 1:
+            for job in jobs:
+                yield pool.apply(func, (job,))
+            return
+        order = longest_first(expected or [0.0] * len(jobs))
+        pending = dict()
+        for idx in order:
+            pending[idx] = pool.apply_async(func, (jobs[idx],))
+        # Results come back in job order whatever the schedule was
+        for idx in range(len(jobs)):
+            yield pending.pop(idx).get()
+
+def run_jobs(jobs: Iterable[Job], isolate: bool = True, quiet: bool = True, processes: int = 1, profiler: Optional[str] = None) -> Iterable[JobResult]:
+    jobs = list(jobs)
+    expected = timings.expected_seconds(jobs) if processes > 1 else None
+    return map_jobs(partial(run_job, quiet=quiet, profiler=profiler), jobs, isolate, processes, expected)
+
+VERIFIED_MARKS = {True: 'ok', False: 'WRONG', None: '-'}
+
+def format_result(result: JobResult) -> str:
+    rss = '-' if result.peak_rss_kb is None else f"{result.peak_rss_kb / 1024:.1f}MiB"
+    answer = result.error if result.error else result.answer
+    answer = str(answer).replace('\n', '\\n')
+    check = VERIFIED_MARKS[result.verified]
+    return f"{result.day:>3} {result.part:>4} {result.wall_s:>10.4f} {result.cpu_s:>10.4f} {rss:>10} {check:>5}  {answer}"
+
+def to_json(result: JobResult) -> str:
+    return json.dumps(result._asdict(), default=str)
+
+def print_results(results: Iterable[JobResult], as_json: bool, stream=None) -> List[JobResult]:
+    stream = stream or sys.stdout
+    collected = list()
+    if not as_json:
+        print(f"{'day':>3} {'part':>4} {'wall_s':>10} {'cpu_s':>10} {'peak_rss':>10} {'check':>5}  answer", file=stream)
+    for result in results:
+        collected.append(result)
+        line = to_json(result) if as_json else format_result(result)
+        print(line, file=stream, flush=True)
+    return collected
+
+def add_arguments(parser):
+    parser.add_argument('days', nargs='*', type=int, default=DAYS, help="days to run (default: all)")
+    parser.add_argument('-p', '--part', dest='parts', type=int, action='append', choices=PARTS, help="part to run, may be repeated (default: both)")
+    parser.add_argument('-i', '--input', dest='input_name', help="input file, or a file name inside each day folder (default: input.txt)")
+    parser.add_argument('--param', dest='params', action='append', default=[], type=parse_param, help="extra solver argument KEY=VALUE, e.g. ycheck=10")
+    parser.add_argument('--json', action='store_true', help="emit one JSON object per line")
+    parser.add_argument('--inline', action='store_true', help="run every job in this process instead of a fresh one")
+    parser.add_argument('-j', '--jobs', dest='processes', type=int, default=1, help="worker processes, 0 for one per core (default: 1)")
+    parser.add_argument('--verbose', action='store_true', help="let solvers write to stdout")
+    parser.add_argument('--record', action='store_true', help="add the answers of inputs not yet in the answer registry")
+    parser.add_argument('--profile', dest='profiler', choices=sorted(profiling.PROFILERS), help=f"profile every solver call and write the reports to {profiling.REPORTS_DIR.name}/")
+    parser.add_argument('--viz', action='store_true', help=f"open the plots of the days that have some (also ${viz.ENV_VAR}=1)")
+    parser.add_argument('--trace', action='append', default=[], metavar='CHANNEL', help=f"log a trace channel to stderr, e.g. day10 or 'day2*.map', may be repeated (also ${trace.ENV_VAR})")
+
+def main(args) -> int:
+    params = dict()
+    for param in args.params:
+        params.update(param)
+    processes = args.processes or os.cpu_count() or 1
+    if args.viz:
+        viz.enable()
+    if args.trace or trace.ENV_VAR in os.environ:
+        trace.enable(args.trace)
+        trace.log_to()
+    jobs = make_jobs(args.days, args.parts or PARTS, args.input_name, params)
+    wall = time.perf_counter()
+    results = print_results(run_jobs(jobs, isolate=not args.inline, quiet=not args.verbose, processes=processes, profiler=args.profiler), args.json)
+    wall = time.perf_counter() - wall
+    if not os.environ.get(trace.ENV_VAR) and not args.profiler:
+        # Traced and profiled runs would skew the scheduling estimates
+        timings.record_last_run(results)
+    if not args.json:
+        for result in results:
+            for report in result.reports:
+                print(f"Profile of day {result.day} part {result.part}: {report}", file=sys.stderr)
+        busy = sum(result.wall_s for result in results)
+        print(f"Total: {wall:.2f}s wall, {busy:.2f}s in solvers, {processes} process(es)", file=sys.stderr)
+    if args.record:
+        for result in results:
+            if result.error is None and result.answer is not None:
+                job_params = bind_params(find_solver(load_day(result.day), result.part), params)
+                answers.record(Path(result.input_file), result.day, result.part, result.answer, job_params)
+    return 1 if any(result.error or result.verified is False for result in results) else 0
@@ -0,0 +1,105 @@
+import heapq
+from array import array
+from collections import deque
+from itertools import count
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+# Distance of the nodes a search never reached
+UNREACHED = -1
+
+# Nodes are ints in range(size), usually flat Grid indexes, so visited marks
+# and distances live in one flat array instead of dicts of tuples
+Neighbors = Callable[[int], Iterable[int]]
+WeightedNeighbors = Callable[[int], Iterable[Tuple[int, int]]]
+
+def bfs(neighbors: Neighbors, starts: Iterable[int], size: int, target: Optional[int] = None) -> array:
+    # Multi-source when given several starts. Nodes are marked when enqueued,
+    # so each one enters the queue once, and the search stops at target
+    dist = array('i', [UNREACHED]) * size
+    q = deque()
+    for start in starts:
+        if dist[start] == UNREACHED:
+            dist[start] = 0
+            q.append(start)
+    while q:
+        node = q.popleft()
+        if node == target:
+            break
+        steps = dist[node] + 1
+        for nnode in neighbors(node):
+            if dist[nnode] == UNREACHED:
+                dist[nnode] = steps
+                q.append(nnode)
+    return dist
+
+def distance(neighbors: Neighbors, starts: Iterable[int], target: int, size: int) -> Optional[int]:
+    steps = bfs(neighbors, starts, size, target)[target]
+    return None if steps == UNREACHED else steps
+
+def all_pairs_bfs(neighbors: Neighbors, size: int, sources: Optional[Iterable[int]] = None) -> List[array]:
+    # One BFS per source, O(V * E) instead of the O(V^3) of Floyd-Warshall on
+    # sparse graphs. Rows of nodes that are not a source stay empty
+    dist = [array('i') for _ in range(size)]
+    for source in (range(size) if sources is None else sources):
+        dist[source] = bfs(neighbors, [source], size)
+    return dist
+
+def dijkstra(neighbors: WeightedNeighbors, starts: Iterable[int], size: int, target: Optional[int] = None) -> array:
+    dist = array('q', [UNREACHED]) * size
+    done = bytearray(size)
+    pq = list()
+    for start in starts:
+        dist[start] = 0
+        pq.append((0, start))
+    heapq.heapify(pq)
+    while pq:
+        cost, node = heapq.heappop(pq)
+        if done[node]:
+            continue
+        done[node] = 1
+        if node == target:
+            break
+        for nnode, weight in neighbors(node):
+            ncost = cost + weight
+            if not done[nnode] and (dist[nnode] == UNREACHED or ncost < dist[nnode]):
+                dist[nnode] = ncost
+                heapq.heappush(pq, (ncost, nnode))
+    return dist
+
+def astar(neighbors: Callable[[Hashable], Iterable[Tuple[Hashable, int]]], start: Hashable, is_target: Callable[[Hashable], bool], heuristic: Callable[[Hashable], int]) -> Optional[int]:
+    # For implicit state spaces too big to index, states are any hashable
+    # value. The heuristic must never overestimate the remaining cost
+    best: Dict[Hashable, int] = {start: 0}
+    tie = count()
+    pq = [(heuristic(start), next(tie), 0, start)]
+    while pq:
+        _, _, cost, state = heapq.heappop(pq)
+        if is_target(state):
+            return cost
+        if cost > best[state]:
+            continue
+        for nstate, weight in neighbors(state):
+            ncost = cost + weight
+            known = best.get(nstate)
+            if known is None or ncost < known:
+                best[nstate] = ncost
+                heapq.heappush(pq, (ncost + heuristic(nstate), next(tie), ncost, nstate))
+    return None
+
+def layered_bfs(neighbors: Callable[[int, int], Iterable[int]], starts: Iterable[int], target: int, max_steps: Optional[int] = None) -> Optional[int]:
+    # BFS over a time-expanded graph: the neighbors of a node depend on the
+    # step they are reached at. Only the current frontier is kept, so the
+    # (node, time) states are never materialized
+    frontier = set(starts)
+    step = 0
+    while frontier:
+        if target in frontier:
+            return step
+        if max_steps is not None and step >= max_steps:
+            return None
+        step += 1
+        nfrontier = set()
+        for node in frontier:
+            nfrontier.update(neighbors(node, step))
+        frontier = nfrontier
+    return None
@@ -0,0 +1,452 @@
+import math
+import os
+import random
+import string
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from aoc import YEAR_DIR
+
+CACHE_DIR = YEAR_DIR.parent / '.aoc_cache' / 'synthetic'
+
+# Every generator takes a size, the number of records of the puzzle (lines,
+# elves, groups...), and a seeded random generator and returns the input text
+GENERATORS: Dict[int, Callable[[int, random.Random], str]] = dict()
+# Part of the cached file names: bump the version of a generator whenever its
+# output changes, older cached inputs are then left alone
+VERSIONS: Dict[int, int] = dict()
+
+def generator(day: int, version: int = 1):
+    def register(func: Callable[[int, random.Random], str]):
+        GENERATORS[day] = func
+        VERSIONS[day] = version
+        return func
+    return register
+
+def to_snafu(number: int) -> str:
+    digits = ""
+    while True:
+        number, rest = divmod(number, 5)
+        if rest > 2:
+            rest -= 5
+            number += 1
+        digits += "=-012"[rest + 2]
+        if number == 0:
+            break
+    return digits[::-1]
+
+@generator(1)
+def calories(size: int, rng: random.Random) -> str:
+    groups = list()
+    for _ in range(size):
+        items = [str(rng.randint(1000, 60000)) for _ in range(rng.randint(1, 15))]
+        groups.append('\n'.join(items))
+    return '\n\n'.join(groups)
+
+@generator(2)
+def strategy_guide(size: int, rng: random.Random) -> str:
+    lines = [f"{rng.choice('ABC')} {rng.choice('XYZ')}" for _ in range(size)]
+    return '\n'.join(lines)
+
+def rucksack(rng: random.Random, pool: List[str], badge: str) -> str:
+    # Exactly one item type shared by both compartments
+    common = rng.choice(pool + [badge])
+    rest = [item for item in pool if item != common]
+    rng.shuffle(rest)
+    left = rest[:len(rest) // 2]
+    right = rest[len(rest) // 2:]
+    length = rng.randint(4, 24)
+    first = [common] + [rng.choice(left) for _ in range(length - 1)]
+    second = [common] + [rng.choice(right) for _ in range(length - 1)]
+    if badge != common:
+        first[rng.randrange(1, length)] = badge
+    rng.shuffle(first)
+    rng.shuffle(second)
+    return ''.join(first) + ''.join(second)
+
+@generator(3)
+def rucksacks(size: int, rng: random.Random) -> str:
+    # size is the number of elf groups, each one with a single badge
+    letters = list(string.ascii_letters)
+    lines = list()
+    for _ in range(size):
+        badge = rng.choice(letters)
+        others = [item for item in letters if item != badge]
+        rng.shuffle(others)
+        for i in range(3):
+            pool = others[i::3]
+            lines.append(rucksack(rng, pool, badge))
+    return '\n'.join(lines)
+
+@generator(4)
+def section_pairs(size: int, rng: random.Random) -> str:
+    lines = list()
+    for _ in range(size):
+        a = sorted(rng.randint(1, 99) for _ in range(2))
+        b = sorted(rng.randint(1, 99) for _ in range(2))
+        lines.append(f"{a[0]}-{a[1]},{b[0]}-{b[1]}")
+    return '\n'.join(lines)
+
+@generator(5, version=2)
+def crate_moves(size: int, rng: random.Random) -> str:
+    # size is the number of moves and also about the height of the stacks,
+    # so large sizes give millions of moves on stacks millions of crates
+    # tall. Moves take up to about sqrt(size) crates. Stack heights are
+    # tracked so that every move takes crates that exist and no stack ever
+    # ends up empty
+    heights = [rng.randint(max(2, size // 2), max(8, size)) for _ in range(9)]
+    rows = list()
+    for level in range(max(heights), 0, -1):
+        cells = [f"[{rng.choice(string.ascii_uppercase)}]" if height >= level else "   " for height in heights]
+        rows.append(' '.join(cells))
+    rows.append(' '.join(f" {idx + 1} " for idx in range(9)))
+    rows.append("")
+    largest = max(20, math.isqrt(size))
+    for _ in range(size):
+        src = rng.choice([idx for idx, height in enumerate(heights) if height > 1])
+        dst = rng.choice([idx for idx in range(9) if idx != src])
+        count = rng.randint(1, min(heights[src] - 1, largest))
+        heights[src] -= count
+        heights[dst] += count
+        rows.append(f"move {count} from {src + 1} to {dst + 1}")
+    return '\n'.join(rows)
+
+@generator(6)
+def datastream(size: int, rng: random.Random) -> str:
+    # size is the number of characters. The noise never has 4 different
+    # characters in a row, so both markers are only found in the tail
+    noise = list()
+    while len(noise) < max(size - 14, 0):
+        noise.extend(rng.choice('abc') * rng.randint(1, 3))
+    tail = rng.sample(string.ascii_lowercase, 14)
+    return ''.join(noise[:max(size - 14, 0)] + tail)
+
+@generator(7)
+def terminal_session(size: int, rng: random.Random) -> str:
+    # size is the number of directories. Two files per directory on average,
+    # scaled so that about 50000000 of the 70000000 are used
+    children: List[List[int]] = [list()]
+    for idx in range(1, size):
+        children[rng.randrange(idx)].append(idx)
+        children.append(list())
+    file_size = max(2, 50000000 // (2 * size))
+    lines = list()
+    stack = [(0, "/", False)]
+    while stack:
+        idx, name, done = stack.pop()
+        if done:
+            lines.append("$ cd ..")
+            continue
+        lines.append(f"$ cd {name}")
+        lines.append("$ ls")
+        names = rng.sample(range(10 ** 6), len(children[idx]) + 4)
+        for child, child_name in zip(children[idx], names):
+            lines.append(f"dir d{child_name}")
+        for file_name in names[len(children[idx]):len(children[idx]) + rng.randint(0, 4)]:
+            lines.append(f"{rng.randint(1, 2 * file_size)} f{file_name}.txt")
+        if idx:
+            stack.append((idx, name, True))
+        for child, child_name in zip(reversed(children[idx]), reversed(names[:len(children[idx])])):
+            stack.append((child, f"d{child_name}", False))
+    return '\n'.join(lines)
+
+@generator(8)
+def tree_heights(size: int, rng: random.Random) -> str:
+    # size is the side of the forest
+    lines = [''.join(rng.choice(string.digits) for _ in range(size)) for _ in range(size)]
+    return '\n'.join(lines)
+
+@generator(9)
+def rope_moves(size: int, rng: random.Random) -> str:
+    lines = [f"{rng.choice('UDLR')} {rng.randint(1, 19)}" for _ in range(size)]
+    return '\n'.join(lines)
+
+@generator(10)
+def cpu_program(size: int, rng: random.Random) -> str:
+    lines = list()
+    for _ in range(size):
+        if rng.random() < 0.3:
+            lines.append("noop")
+        else:
+            lines.append(f"addx {rng.choice([-1, 1]) * rng.randint(1, 20)}")
+    return '\n'.join(lines)
+
+@generator(11)
+def monkeys(size: int, rng: random.Random) -> str:
+    # size is the number of monkeys, at least 2 so that every monkey throws
+    # to others. Divisors are distinct primes like in the puzzle
+    size = max(size, 2)
+    primes = [number for number in range(2, 20 * size + 20) if all(number % div for div in range(2, int(number ** 0.5) + 1))]
+    divisors = rng.sample(primes[:max(size, 8)], size)
+    blocks = list()
+    for idx in range(size):
+        items = ', '.join(str(rng.randint(50, 99)) for _ in range(rng.randint(1, 8)))
+        operation = rng.choice(["* old", f"* {rng.randint(2, 19)}", f"+ {rng.randint(1, 8)}", f"+ {rng.randint(1, 8)}"])
+        targets = rng.sample([other for other in range(size) if other != idx], 2)
+        blocks.append('\n'.join([
+            f"Monkey {idx}:",
+            f"  Starting items: {items}",
+            f"  Operation: new = old {operation}",
+            f"  Test: divisible by {divisors[idx]}",
+            f"    If true: throw to monkey {targets[0]}",
+            f"    If false: throw to monkey {targets[1]}",
+        ]))
+    return '\n\n'.join(blocks)
+
+@generator(12)
+def height_map(size: int, rng: random.Random) -> str:
+    # size is the number of rows, four times as many columns. A monotone path
+    # from S to E climbs from a to z one level at a time, so E is reachable
+    rows = max(size, 6)
+    cols = 4 * rows
+    cells = [[rng.choice('aaaabbccdefghijklmnopqrstuvwxyz') for _ in range(cols)] for _ in range(rows)]
+    moves = [(1, 0)] * (rows - 1) + [(0, 1)] * (cols - 1)
+    rng.shuffle(moves)
+    r, c = 0, 0
+    for step, (dr, dc) in enumerate(moves):
+        cells[r][c] = string.ascii_lowercase[step * 25 // (len(moves) - 1)]
+        r, c = r + dr, c + dc
+    cells[0][0] = 'S'
+    cells[r][c] = 'E'
+    return '\n'.join(''.join(row) for row in cells)
+
+def packet(rng: random.Random, depth: int) -> str:
+    items = list()
+    for _ in range(rng.randint(0, 5)):
+        if depth < 4 and rng.random() < 0.3:
+            items.append(packet(rng, depth + 1))
+        else:
+            items.append(str(rng.randint(0, 10)))
+    return '[' + ','.join(items) + ']'
+
+@generator(13)
+def packet_pairs(size: int, rng: random.Random) -> str:
+    pairs = [f"{packet(rng, 0)}\n{packet(rng, 0)}" for _ in range(size)]
+    return '\n\n'.join(pairs)
+
+@generator(14)
+def rock_paths(size: int, rng: random.Random) -> str:
+    # size is the number of paths. Rocks stay below the source at 500,0, and
+    # the cave gets deeper with the size so the floor of part 2 does too.
+    # Column 501 has no rock, so the sand of part 1 can never pile up to the
+    # source and always ends up in the abyss
+    depth = max(10, size)
+    lines = list()
+    for _ in range(size):
+        low, high = rng.choice([(500 - depth, 500), (502, 502 + depth)])
+        x = rng.randint(low, high)
+        y = rng.randint(2, depth)
+        points = [f"{x},{y}"]
+        for segment in range(rng.randint(1, 4)):
+            if segment % 2:
+                x = min(max(x + rng.choice([-1, 1]) * rng.randint(1, 8), low), high)
+            else:
+                y = min(max(y + rng.choice([-1, 1]) * rng.randint(1, 8), 2), depth)
+            points.append(f"{x},{y}")
+        lines.append(' -> '.join(points))
+    return '\n'.join(lines)
+
+@generator(15)
+def sensors(size: int, rng: random.Random) -> str:
+    # size is the number of sensors, on a jittered lattice over the 0..4000000
+    # square of part 2 with overlapping ranges. Sensors that would see the
+    # distress beacon are shortened to stop right before it, so at least that
+    # position is free
+    limit = 4000000
+    side = max(2, math.ceil(math.sqrt(size)))
+    spacing = limit // (side - 1)
+    distress = (rng.randint(0, limit), rng.randint(0, limit))
+    lines = list()
+    for idx in range(size):
+        # Sensors are never at negative coordinates, only beacons
+        x = max(0, (idx % side) * spacing + rng.randint(-spacing // 8, spacing // 8))
+        y = max(0, (idx // side) * spacing + rng.randint(-spacing // 8, spacing // 8))
+        reach = spacing + spacing // 2
+        if (x, y) == distress:
+            x += 1
+        to_distress = abs(x - distress[0]) + abs(y - distress[1])
+        if to_distress <= reach:
+            reach = to_distress - 1
+        dx = rng.randint(0, reach)
+        bx = x + rng.choice([-1, 1]) * dx
+        by = y + rng.choice([-1, 1]) * (reach - dx)
+        lines.append(f"Sensor at x={x}, y={y}: closest beacon is at x={bx}, y={by}")
+    return '\n'.join(lines)
+
+def valve_label(idx: int) -> str:
+    return string.ascii_uppercase[idx // 26] + string.ascii_uppercase[idx % 26]
+
+@generator(16)
+def valves(size: int, rng: random.Random) -> str:
+    # size is the number of valves, at most 676 two letter labels. A random
+    # spanning tree plus a few extra tunnels keeps the graph connected, and a
+    # quarter of the valves have a flow rate like in the puzzle
+    size = min(max(size, 2), 26 * 26)
+    labels = [valve_label(0)] + [valve_label(idx) for idx in rng.sample(range(1, 26 * 26), size - 1)]
+    tunnels: List[set] = [set() for _ in range(size)]
+    for idx in range(1, size):
+        other = rng.randrange(idx)
+        tunnels[idx].add(other)
+        tunnels[other].add(idx)
+    for _ in range(size // 2):
+        a, b = rng.sample(range(size), 2)
+        tunnels[a].add(b)
+        tunnels[b].add(a)
+    working = set(rng.sample(range(1, size), max(1, size // 4)))
+    lines = list()
+    for idx in range(size):
+        rate = rng.randint(1, 25) if idx in working else 0
+        others = [labels[other] for other in sorted(tunnels[idx])]
+        if len(others) == 1:
+            lines.append(f"Valve {labels[idx]} has flow rate={rate}; tunnel leads to valve {others[0]}")
+        else:
+            lines.append(f"Valve {labels[idx]} has flow rate={rate}; tunnels lead to valves {', '.join(others)}")
+    return '\n'.join(lines)
+
+@generator(17)
+def jets(size: int, rng: random.Random) -> str:
+    return ''.join(rng.choice('<>') for _ in range(size))
+
+@generator(18)
+def cubes(size: int, rng: random.Random) -> str:
+    # size is the number of cubes, packed in a box where about a third of the
+    # positions are taken. Coordinates start at 1 so the outside surrounds them
+    side = max(2, round((3 * size) ** (1 / 3)))
+    positions = rng.sample(range(side ** 3), min(size, side ** 3))
+    lines = [f"{pos // (side * side) + 1},{pos // side % side + 1},{pos % side + 1}" for pos in positions]
+    return '\n'.join(lines)
+
+@generator(19)
+def blueprints(size: int, rng: random.Random) -> str:
+    lines = list()
+    for idx in range(1, size + 1):
+        lines.append(
+            f"Blueprint {idx}: Each ore robot costs {rng.randint(2, 4)} ore. "
+            f"Each clay robot costs {rng.randint(2, 4)} ore. "
+            f"Each obsidian robot costs {rng.randint(2, 4)} ore and {rng.randint(5, 20)} clay. "
+            f"Each geode robot costs {rng.randint(2, 4)} ore and {rng.randint(5, 20)} obsidian.")
+    return '\n'.join(lines)
+
+@generator(20)
+def mixing_list(size: int, rng: random.Random) -> str:
+    numbers = [rng.choice([-1, 1]) * rng.randint(1, 10000) for _ in range(size - 1)]
+    numbers.insert(rng.randrange(size), 0)
+    return '\n'.join(str(number) for number in numbers)
+
+def monkey_label(rng: random.Random, used: set) -> str:
+    while True:
+        label = ''.join(rng.choice(string.ascii_lowercase) for _ in range(4))
+        if label not in used:
+            used.add(label)
+            return label
+
+@generator(21)
+def monkey_math(size: int, rng: random.Random) -> str:
+    # size is the number of monkeys, made odd so that they form a full binary
+    # expression tree. Values are chosen top down, so every division is exact
+    # and every monkey yells a positive number that fits a float. humn is a
+    # leaf that is never under the right side of a division
+    size = max(size, 3) | 1
+    used = {'root', 'humn'}
+    lines = list()
+    leaves = list()
+    stack = [('root', rng.randint(10 ** 6, 10 ** 9), size, True)]
+    while stack:
+        label, value, count, human_ok = stack.pop()
+        if count == 1:
+            lines.append(f"{label}: {value}")
+            if human_ok:
+                leaves.append(label)
+            continue
+        left_count = 2 * rng.randrange((count - 1) // 2) + 1
+        ops = ['*']
+        if value >= 2:
+            ops.append('+')
+        if value < 10 ** 12:
+            ops.append('-')
+        if value < 10 ** 9:
+            ops.append('/')
+        op = rng.choice(ops)
+        if op == '+':
+            left = rng.randint(1, value - 1)
+            right = value - left
+        elif op == '-':
+            right = rng.randint(1, 1000)
+            left = value + right
+        elif op == '*':
+            divisors = [div for div in range(2, 10) if value % div == 0]
+            left = rng.choice(divisors) if divisors else value
+            right = value // left
+        else:
+            right = rng.randint(2, 9)
+            left = value * right
+        left_label = monkey_label(rng, used)
+        right_label = monkey_label(rng, used)
+        lines.append(f"{label}: {left_label} {op} {right_label}")
+        stack.append((left_label, left, left_count, human_ok))
+        stack.append((right_label, right, count - 1 - left_count, human_ok and op != '/'))
+    humn = rng.choice(leaves)
+    rng.shuffle(lines)
+    return '\n'.join(lines).replace(humn, 'humn')
+
+@generator(22)
+def monkey_map(size: int, rng: random.Random) -> str:
+    # size is the number of path instructions. The cube wrapping of part 2 is
+    # written for the layout of the real input, so the map always has six
+    # 50x50 faces in that layout with random walls
+    face = 50
+    layout = [(0, 1), (0, 2), (1, 1), (2, 0), (2, 1), (3, 0)]
+    rows = [[' '] * (3 * face) for _ in range(4 * face)]
+    for frow, fcol in layout:
+        for r in range(frow * face, (frow + 1) * face):
+            for c in range(fcol * face, (fcol + 1) * face):
+                rows[r][c] = '#' if rng.random() < 0.05 else '.'
+    rows[0][face] = '.'
+    lines = [''.join(row).rstrip() for row in rows]
+    path = str(rng.randint(1, 50))
+    for _ in range(size):
+        path += rng.choice('LR') + str(rng.randint(1, 50))
+    return '\n'.join(lines) + '\n\n' + path
+
+@generator(23)
+def elves(size: int, rng: random.Random) -> str:
+    # size is the side of the grove, half of it covered with elves
+    lines = [''.join(rng.choice('#.') for _ in range(size)) for _ in range(size)]
+    return '\n'.join(lines)
+
+@generator(24)
+def blizzard_basin(size: int, rng: random.Random) -> str:
+    # size is the height of the basin, four times as wide, so the blizzards
+    # repeat every 4 * size minutes. The columns of the entrance and the exit
+    # have no vertical blizzards, which would leave the basin through them
+    height = max(size, 2)
+    width = 4 * height
+    lines = ["#." + "#" * width]
+    for _ in range(height):
+        cells = list()
+        for col in range(width):
+            choices = '<>' if col in (0, width - 1) else '<>^v'
+            cells.append(rng.choice(choices) if rng.random() < 0.3 else '.')
+        lines.append('#' + ''.join(cells) + '#')
+    lines.append("#" * width + ".#")
+    return '\n'.join(lines)
+
+@generator(25)
+def snafu_numbers(size: int, rng: random.Random) -> str:
+    lines = [to_snafu(rng.randint(1, 5 ** 19)) for _ in range(size)]
+    return '\n'.join(lines)
+
+def generate(day: int, size: int, seed: int = 0) -> str:
+    if day not in GENERATORS:
+        raise KeyError(f"No synthetic generator for day {day}")
+    rng = random.Random(f"{day}:{size}:{seed}")
+    return GENERATORS[day](size, rng)
+
+def synthetic_input(day: int, size: int, seed: int = 0) -> Path:
+    path = CACHE_DIR / f"day{day}-v{VERSIONS.get(day, 1)}_size{size}_seed{seed}.txt"
+    if not path.exists():
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(generate(day, size, seed))
+        tmp.replace(path)
+    return path
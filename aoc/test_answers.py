@@ -0,0 +1,36 @@
+import pytest
+from pathlib import Path
+
+from aoc import answers
+
+def test_record_and_verify(tmp_path):
+    registry = tmp_path / 'answers.json'
+    input_file = tmp_path / 'input.txt'
+    input_file.write_text("1-2,3-4\n")
+    assert answers.verify(input_file, 1, 0, path=registry) is None
+    assert answers.record(input_file, 4, 1, 0, path=registry)
+    assert answers.record(input_file, 15, 2, 26, {'ycheck': 10}, path=registry)
+    assert not answers.record(input_file, 4, 1, 5, path=registry)
+    assert answers.verify(input_file, 1, 0, path=registry)
+    assert answers.verify(input_file, 1, 1, path=registry) is False
+    assert answers.verify(input_file, 2, 26, {'ycheck': 10}, path=registry)
+    # Other parameters mean another puzzle
+    assert answers.verify(input_file, 2, 26, path=registry) is None
+
+def test_hash_follows_content(tmp_path):
+    input_file = tmp_path / 'input.txt'
+    input_file.write_text("A Y\n")
+    first = answers.input_hash(input_file)
+    input_file.write_text("B X\nC Z\n")
+    assert answers.input_hash(input_file) != first
+
+def test_normalize():
+    assert answers.normalize(152.0) == 152
+    assert answers.normalize((1, 2)) == [1, 2]
+    assert answers.normalize('CMZ') == 'CMZ'
+
+def test_check_answer():
+    input_file = Path('2022/4/test_input.txt')
+    answers.check_answer(input_file, 1, 2)
+    with pytest.raises(AssertionError):
+        answers.check_answer(input_file, 1, 3)
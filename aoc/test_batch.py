@@ -0,0 +1,36 @@
+from pathlib import Path
+
+from aoc import answers, batch, runner
+
+def test_expand_inputs():
+    inputs = list(batch.expand_inputs([str(runner.day_dir(4)), 'other.txt']))
+    assert [path.name for path in inputs] == ['input.txt', 'test_input.txt', 'other.txt']
+
+def test_run_batch_inline():
+    inputs = [runner.resolve_input(5, 'test_input.txt')] * 3
+    results = list(batch.run_batch(5, 1, inputs))
+    assert [result.answer for result in results] == ['CMZ'] * 3
+    assert all(result.verified for result in results)
+
+def test_run_batch_pool():
+    inputs = [runner.resolve_input(4, 'test_input.txt'), runner.resolve_input(4)] * 4
+    results = list(batch.run_batch(4, 1, inputs, processes=2))
+    assert sorted(result.answer for result in results) == [2] * 4 + [528] * 4
+    assert all(result.error is None and result.verified for result in results)
+
+def test_params_and_stats():
+    inputs = [runner.resolve_input(15, 'test_input.txt')]
+    results = list(batch.run_batch(15, 1, inputs, params={'ycheck': 10}))
+    assert results[0].answer == 26
+    assert batch.BatchStats(10, 0, 0, 2.0).per_second == 5.0
+
+def test_unregistered_inputs_are_not_hashed(tmp_path, monkeypatch):
+    hashed = list()
+    input_hash = answers.input_hash
+    monkeypatch.setattr(answers, 'input_hash', lambda input_file: hashed.append(Path(input_file).name) or input_hash(input_file))
+    other = tmp_path / 'other.txt'
+    other.write_bytes(runner.resolve_input(5, 'test_input.txt').read_bytes())
+    results = list(batch.run_batch(5, 1, [other, runner.resolve_input(5, 'test_input.txt')]))
+    assert [result.answer for result in results] == ['CMZ'] * 2
+    assert [result.verified for result in results] == [None, True]
+    assert 'other.txt' not in hashed
@@ -0,0 +1,69 @@
+import os
+import pytest
+
+from aoc import bench, runner, synthetic, timings
+
+THRESHOLD = float(os.environ.get('AOC_BENCH_THRESHOLD', bench.DEFAULT_THRESHOLD))
+REPEAT = int(os.environ.get('AOC_BENCH_REPEAT', bench.DEFAULT_REPEAT))
+
+def baseline_job(key: str) -> runner.Job:
+    day, part, label = key.split('/')
+    day = int(day)
+    if label.startswith('size'):
+        size, seed = label.split('_')
+        input_file = synthetic.synthetic_input(day, int(size[len('size'):]), int(seed[len('seed'):]))
+    else:
+        input_file = runner.resolve_input(day, f"{label}.txt")
+    return runner.Job(day, int(part), input_file)
+
+def test_percentile():
+    samples = [5.0, 1.0, 4.0, 2.0, 3.0]
+    assert bench.percentile(samples, 0.5) == 3.0
+    assert bench.percentile(samples, 0.95) == 5.0
+    assert bench.percentile([7.0], 0.95) == 7.0
+
+def test_find_regression():
+    baseline = {'16/2/input': {'median': 1.0}}
+    slow = bench.BenchResult(16, 2, 'input', [1.5], 1.5, 1.5, 1.5, None)
+    fast = bench.BenchResult(16, 2, 'input', [1.1], 1.1, 1.1, 1.1, None)
+    assert bench.find_regression(slow, baseline, 0.25).ratio == 1.5
+    assert bench.find_regression(fast, baseline, 0.25) is None
+    assert bench.find_regression(slow, {}, 0.25) is None
+
+def test_baseline_roundtrip(tmp_path):
+    path = tmp_path / 'baseline.json'
+    result = bench.BenchResult(4, 1, 'input', [0.1, 0.2, 0.3], 0.2, 0.3, 0.1, 528)
+    bench.save_baseline([result], path)
+    entries = bench.load_baseline(path)
+    assert entries['4/1/input']['median'] == 0.2
+    assert baseline_job('4/1/input').input_file == runner.resolve_input(4)
+
+def test_synthetic_label():
+    input_file = synthetic.synthetic_input(4, 10)
+    assert timings.input_label(input_file) == 'size10_seed0'
+    assert baseline_job('4/1/size10_seed0').input_file == input_file
+
+def test_scaling_curves():
+    results = [
+        bench.BenchResult(8, 1, 'size200_seed0', [0.4], 0.4, 0.4, 0.4, 1),
+        bench.BenchResult(8, 1, 'size100_seed0', [0.1], 0.1, 0.1, 0.1, 1),
+        bench.BenchResult(8, 1, 'input', [0.2], 0.2, 0.2, 0.2, 1),
+    ]
+    curves = bench.scaling_curves(results)
+    assert curves == {(8, 1): [(100, 0.1), (200, 0.4)]}
+    assert bench.growth_exponent(curves[(8, 1)]) == pytest.approx(2.0)
+    assert bench.growth_exponent([(100, 0.1)]) is None
+
+def test_baseline():
+    # Without a baseline the regression tests below collect nothing, say so
+    # instead of passing silently
+    if not bench.load_baseline():
+        pytest.skip(f"no 2022/{bench.BASELINE_FILE.name}, run python -m aoc bench --save")
+
+@pytest.mark.slow
+@pytest.mark.parametrize('key', sorted(bench.load_baseline()))
+def test_no_regression(key):
+    result = bench.bench_job(baseline_job(key), REPEAT)
+    assert result.error is None
+    regression = bench.find_regression(result, bench.load_baseline(), THRESHOLD)
+    assert regression is None, f"{key}: {regression.baseline:.4f}s -> {regression.current:.4f}s"
@@ -0,0 +1,20 @@
+from aoc import bits
+
+def test_masks():
+    mask = bits.from_indexes([0, 3, 9])
+    assert mask == 0b1000001001
+    assert list(bits.bits(mask)) == [0, 3, 9]
+    assert bits.popcount(mask) == 3 and bits.lowest(mask) == 0 and bits.highest(mask) == 9
+    assert bits.lowest(0) == -1 and bits.full(4) == 0b1111
+    index = bits.indexer('abcab')
+    assert index == {'a': 0, 'b': 1, 'c': 2}
+    assert bits.decode(bits.encode('ca', index), 'abc') == ['a', 'c']
+
+def test_rows():
+    lines = ['#..#', '.##.']
+    rows = bits.to_rows(lines)
+    assert rows == [0b1001, 0b0110]
+    assert bits.from_rows(rows, 4) == lines
+    assert bits.from_rows([bits.west(rows[1]), bits.east(rows[1])], 5) == ['..##.', '##...']
+    assert bits.from_rows([bits.spread(bits.from_indexes([2, 7]))], 9) == ['.###..###']
+    assert bits.columns(rows) == (0, 3) and bits.columns([0, 0b1100]) == (2, 3) and bits.columns([]) == (0, -1)
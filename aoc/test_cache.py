@@ -0,0 +1,53 @@
+import pytest
+from pathlib import Path
+
+from aoc import cache
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, 'CACHE_DIR', tmp_path / 'parsed')
+    monkeypatch.delenv(cache.ENV_VAR, raising=False)
+    return tmp_path / 'parsed'
+
+def parse_pairs(calls):
+    def parse(input_file: Path):
+        calls.append(input_file)
+        return [tuple(int(token) for token in line.split(',')) for line in input_file.read_text().split()]
+    return parse
+
+def test_load_records(tmp_path, cache_dir):
+    input_file = tmp_path / 'input.txt'
+    input_file.write_text("1,-2\n3,4000000000000\n")
+    calls = list()
+    flat = cache.load_records(input_file, 'pairs', 1, 2, parse_pairs(calls))
+    assert list(cache.records(flat, 2)) == [(1, -2), (3, 4000000000000)]
+    flat = cache.load_records(input_file, 'pairs', 1, 2, parse_pairs(calls))
+    assert isinstance(flat, memoryview) and list(flat) == [1, -2, 3, 4000000000000]
+    assert len(calls) == 1
+    # A new parser version or new content is parsed again
+    cache.load_records(input_file, 'pairs', 2, 2, parse_pairs(calls))
+    input_file.write_text("5,6\n")
+    assert list(cache.load_records(input_file, 'pairs', 2, 2, parse_pairs(calls))) == [5, 6]
+    assert len(calls) == 3
+
+def test_corrupted_cache(tmp_path, cache_dir):
+    input_file = tmp_path / 'input.txt'
+    input_file.write_text("1,2\n")
+    calls = list()
+    cache.load_records(input_file, 'pairs', 1, 2, parse_pairs(calls))
+    cache.cache_file(input_file, 'pairs', 1).write_bytes(b'garbage')
+    assert list(cache.load_records(input_file, 'pairs', 1, 2, parse_pairs(calls))) == [1, 2]
+    assert len(calls) == 2
+
+def test_disabled(tmp_path, cache_dir, monkeypatch):
+    monkeypatch.setenv(cache.ENV_VAR, '0')
+    input_file = tmp_path / 'input.txt'
+    input_file.write_text("1,2\n")
+    assert list(cache.load_records(input_file, 'pairs', 1, 2, parse_pairs(list()))) == [1, 2]
+    assert not cache_dir.exists()
+
+def test_bad_width(tmp_path, cache_dir):
+    input_file = tmp_path / 'input.txt'
+    input_file.write_text("1,2,3\n")
+    with pytest.raises(RuntimeError):
+        cache.load_records(input_file, 'pairs', 1, 2, parse_pairs(list()))
@@ -0,0 +1,45 @@
+import pytest
+
+from aoc import cycles
+
+def square(x):
+    return (x * x + 1) % 255
+
+def walk(x, steps):
+    seen = dict()
+    for step in range(steps):
+        if x in seen:
+            return cycles.Cycle(seen[x], step - seen[x])
+        seen[x] = step
+        x = square(x)
+
+@pytest.mark.parametrize('find', [cycles.brent, cycles.floyd])
+def test_pure(find):
+    for x in (0, 3, 100):
+        assert find(square, x) == walk(x, 300)
+    assert find(lambda x: x + 1, 0, max_steps=100) is None
+    assert find(lambda x: (x[0] + 1, x[1]), (0, 'tag'), lambda x: x[0] % 7) == cycles.Cycle(0, 7)
+
+def test_detect_and_extrapolate():
+    state = [3, 0]
+    def advance():
+        state[1] += state[0]
+        state[0] = square(state[0])
+    cycle, metrics = cycles.detect(advance, lambda: state[0], lambda: state[1])
+    assert cycle == walk(3, 300)
+    assert len(metrics) == cycle.start + 2 * cycle.length + 1
+    state[:] = [3, 0]
+    totals = list()
+    for _ in range(1000):
+        totals.append(state[1])
+        advance()
+    assert [cycles.extrapolate(metrics, cycle, step) for step in range(1000)] == totals
+    assert cycles.extrapolate([(0, 1), (1, 1), (2, 1)], cycles.Cycle(1, 1), 10) == (10, 1)
+    assert cycle.reduce(999) < cycle.start + cycle.length
+
+def test_detect_gives_up():
+    count = [0]
+    def advance():
+        count[0] += 1
+    cycle, metrics = cycles.detect(advance, lambda: count[0], max_steps=50)
+    assert cycle is None and len(metrics) == 51
@@ -0,0 +1,64 @@
+import pytest
+
+from aoc.grid import BitLayer, Grid
+
+def test_padding():
+    grid = Grid(2, 3, fill=1, pad_value=9)
+    assert grid.width == 5 and len(grid.cells) == 4 * 5
+    assert grid[0, 0] == 1 and grid[-1, -1] == 9 and grid[2, 3] == 9
+    idx = grid.index(0, 0)
+    assert grid.position(idx) == (0, 0)
+    assert [grid.cells[nidx] for nidx in grid.neighbors(idx)] == [9, 1, 9, 1]
+    assert grid.around(idx) == (9, 9, 9, 9, 1, 9, 1, 1)
+    assert (1, 2) in grid and (2, 0) not in grid
+
+def test_from_lines():
+    grid = Grid.from_lines(["#.", " #."], {' ': 0, '.': 1, '#': 2})
+    assert (grid.rows, grid.cols) == (2, 3)
+    assert list(grid.row(0)) == [2, 1, 0]
+    assert grid.count(2) == 2
+    assert [grid.position(idx) for idx in grid.find(1)] == [(0, 1), (1, 2)]
+    assert grid.render({0: ' ', 1: '.', 2: '#'}) == "#. \n #."
+    with pytest.raises(RuntimeError):
+        Grid.from_lines(["#x"], {'#': 1})
+
+def test_int16_grid():
+    grid = Grid(2, 2, fill=-1, typecode='h')
+    grid[1, 1] = 1000
+    assert grid.count(-1) == 3
+    assert grid.find(1000) == [grid.index(1, 1)]
+
+def test_grow():
+    grid = Grid(1, 2, pad_value=7)
+    grid[0, 1] = 3
+    idx = grid.index(0, 1)
+    grid.grow(2)
+    assert grid.rows == 3 and grid.cells[idx] == 3
+    assert grid[2, 0] == 0 and grid[3, 0] == 7
+
+def test_bit_layer():
+    layer = BitLayer(20, [0, 9, 19])
+    assert 9 in layer and 10 not in layer
+    layer.discard(9)
+    layer.add(12)
+    assert list(layer) == [0, 12, 19] and len(layer) == 3
+    other = BitLayer(20, [12, 13])
+    assert list(layer | other) == [0, 12, 13, 19]
+    assert list(layer & other) == [12]
+    assert list(layer - other) == [0, 19]
+
+def test_whole_grid_queries():
+    lines = ["#..#", ".##.", "#..."]
+    grid = Grid.from_lines(lines, {'.': 0, '#': 1})
+    elves = grid.where(1) & grid.inside_layer()
+    assert sorted(grid.position(idx) for idx in elves) == [(0, 0), (0, 3), (1, 1), (1, 2), (2, 0)]
+    assert list(elves.shifted(-1)) == [idx + 1 for idx in elves]
+    planes = grid.neighbor_planes(elves)
+    inside = grid.inside_layer()
+    for idx in inside:
+        count = sum(1 for offset in grid.offsets8 if idx + offset in elves)
+        assert sum((plane >> idx & 1) << k for k, plane in enumerate(planes)) == count
+        for least in range(5):
+            assert (idx in grid.neighbors_at_least(elves, least)) == (count >= least)
+    assert len(grid.where(0) & inside) == 7
+    assert len(Grid(3, 3, typecode='h').where(0)) == 25
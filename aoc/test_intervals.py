@@ -0,0 +1,47 @@
+import random
+
+from aoc.intervals import IntervalIndex, IntervalSet, merge
+
+def test_merge():
+    assert merge([(5, 7), (1, 2), (3, 3), (10, 9), (6, 12)]) == [(1, 3), (5, 12)]
+    spans = IntervalSet()
+    for lo, hi in [(10, 20), (1, 3), (22, 25), (4, 4), (21, 21), (-5, -2)]:
+        spans.add(lo, hi)
+    assert list(spans) == [(-5, -2), (1, 4), (10, 25)]
+    spans.add(0, 30)
+    assert list(spans) == [(-5, -2), (0, 30)]
+
+def test_queries():
+    spans = IntervalSet([(2, 4), (8, 10), (12, 12)])
+    assert [value for value in range(15) if value in spans] == [2, 3, 4, 8, 9, 10, 12]
+    assert spans.length() == 7 and len(spans) == 3
+    assert spans.covers(8, 10) and not spans.covers(4, 8) and not spans.covers(0, 1)
+    assert spans.overlaps(4, 8) and spans.overlaps(11, 13) and not spans.overlaps(5, 7) and not spans.overlaps(13, 20)
+    assert list(spans.gaps(0, 15)) == [(0, 1), (5, 7), (11, 11), (13, 15)]
+    assert list(spans.gaps(9, 11)) == [(11, 11)]
+    assert not spans.gaps(2, 4)
+
+def test_set_operations():
+    first = IntervalSet([(0, 10), (20, 30)])
+    second = IntervalSet([(5, 25), (40, 50)])
+    assert list(first | second) == [(0, 30), (40, 50)]
+    assert list(first & second) == [(5, 10), (20, 25)]
+    assert (first & IntervalSet([(11, 19)])) == IntervalSet()
+    values = set(range(0, 11)) | set(range(20, 31))
+    assert (first & second).length() == len(values & (set(range(5, 26)) | set(range(40, 51))))
+
+def test_index():
+    rng = random.Random(4)
+    spans = [(lo, lo + rng.randrange(20)) for lo in (rng.randrange(100) for _ in range(60))]
+    index = IntervalIndex(spans)
+    def brute(lo, hi):
+        return [idx for idx, (start, end) in enumerate(spans) if start <= hi and lo <= end]
+    for lo in range(-5, 125, 7):
+        for width in (0, 3, 30):
+            assert sorted(index.overlapping(lo, lo + width)) == brute(lo, lo + width)
+    assert sorted(index.containing(50)) == brute(50, 50)
+    pairs = sorted(index.overlapping_pairs())
+    assert pairs == [(a, b) for a in range(len(spans)) for b in range(a + 1, len(spans)) if b in brute(*spans[a])]
+    coverage = [len(brute(value, value)) for value in range(130)]
+    assert index.max_coverage() == (max(coverage), coverage.index(max(coverage)))
+    assert IntervalIndex([]).overlapping(0, 10) == [] and IntervalIndex([]).max_coverage() == (0, 0)
@@ -0,0 +1,22 @@
+from aoc import parallel
+
+def test_split():
+    data = b''.join(b"line %d\n" % idx for idx in range(100))
+    for parts in (1, 2, 7, 40, 500):
+        ranges = parallel.split(data, parts)
+        assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+        assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+        assert all(data[start - 1:start] == b"\n" for start, _ in ranges[1:])
+        assert len(ranges) <= parts
+    for group in (2, 3, 7):
+        ranges = parallel.split(data, 9, group)
+        assert ranges[-1][1] == len(data) and len(ranges) > 1
+        assert all(data[:start].count(b"\n") % group == 0 for start, _ in ranges)
+    # Blank lines are not records and never count towards a group
+    data = b''.join(b"line %d\n%s" % (idx, b"\n" if idx % 5 == 0 else b"") for idx in range(100))
+    for group in (2, 3):
+        ranges = parallel.split(data, 9, group)
+        assert len(ranges) > 1
+        assert all(len(data[:start].split()) % (2 * group) == 0 for start, _ in ranges)
+    assert parallel.split(b"", 4) == [(0, 0)]
+    assert parallel.split(b"no line break", 4) == [(0, 13)]
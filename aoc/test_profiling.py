@@ -0,0 +1,58 @@
+import time
+import pytest
+from pathlib import Path
+
+from aoc import profiling, runner
+
+def countdown(depth: int) -> int:
+    if depth == 0:
+        end = time.process_time() + 0.05
+        total = 0
+        while time.process_time() < end:
+            total += 1
+        return total
+    return countdown(depth - 1)
+
+def test_report_base(tmp_path):
+    base = profiling.report_base(4, 1, runner.resolve_input(4, 'test_input.txt'), tmp_path)
+    assert base == tmp_path / 'day04_part1_test_input'
+
+def test_no_profiler(tmp_path):
+    with profiling.Profiler() as prof:
+        countdown(0)
+    assert prof.write(tmp_path / 'countdown') == []
+    assert not list(tmp_path.iterdir())
+
+def test_sampling_keeps_recursion(tmp_path):
+    with profiling.SamplingProfiler() as prof:
+        countdown(5)
+    folded, report = prof.write(tmp_path / 'countdown')
+    assert folded.name == 'countdown.sample.folded' and report.exists()
+    lines = folded.read_text().splitlines()
+    assert lines
+    # Every level of the recursion is a frame of its own, the stacks start
+    # below this test
+    for line in lines:
+        stack, count = line.rsplit(' ', 1)
+        assert stack.split(';') == [profiling.frame_label(countdown.__code__)] * 6
+        assert int(count) > 0
+
+@pytest.mark.parametrize('name,suffixes', [('cprofile', ['.prof', '.txt']), ('memory', ['.txt'])])
+def test_profilers(tmp_path, name, suffixes):
+    prof = profiling.get_profiler(name)
+    with prof:
+        countdown(2)
+    paths = prof.write(tmp_path / 'countdown')
+    assert [path.name for path in paths] == [f"countdown.{name}{suffix}" for suffix in suffixes]
+    assert paths[-1].read_text()
+
+def test_unknown_profiler():
+    with pytest.raises(RuntimeError):
+        profiling.get_profiler('perf')
+
+def test_run_job_profile(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, 'REPORTS_DIR', tmp_path)
+    job = runner.Job(4, 1, runner.resolve_input(4, 'test_input.txt'))
+    result = runner.run_job(job, profiler='cprofile')
+    assert result.answer == 2 and result.verified
+    assert [Path(path).name for path in result.reports] == ['day04_part1_test_input.cprofile.prof', 'day04_part1_test_input.cprofile.txt']
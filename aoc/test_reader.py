@@ -0,0 +1,48 @@
+from aoc import reader
+
+def test_lines(tmp_path):
+    input_file = tmp_path / 'input.txt'
+    input_file.write_bytes(b"A Y\r\nB X\n\nC Z")
+    lines = list(reader.lines(reader.mapped(input_file)))
+    assert all(isinstance(line, memoryview) for line in lines)
+    assert [line.tobytes() for line in lines] == [b"A Y", b"B X", b"", b"C Z"]
+    input_file.write_bytes(b"")
+    assert list(reader.lines(reader.mapped(input_file))) == []
+
+def test_ints():
+    data = b"2-4,6-8\n-3 x10\n"
+    assert reader.ints(data) == [2, -4, 6, -8, -3, 10]
+    assert reader.ints(b"x=-5, y=12\n") == [-5, 12]
+    assert reader.ints(data, signed=False) == [2, 4, 6, 8, 3, 10]
+    assert list(reader.int_records(b"2-4,6-8\n5-7,7-9\n", 4, signed=False)) == [(2, 4, 6, 8), (5, 7, 7, 9)]
+    assert reader.int_columns(b"1 2\n3 4\n", 2) == [[1, 3], [2, 4]]
+
+def test_int_groups():
+    data = b"1000\n2000\n\n4000\n\n5000\n6000\n"
+    assert list(reader.int_groups(data)) == [[1000, 2000], [4000], [5000, 6000]]
+    assert reader.count_lines(b"A Y\nB X\nA Y\n") == {b"A Y": 2, b"B X": 1}
+
+def test_stream_groups(tmp_path):
+    input_file = tmp_path / 'input.txt'
+    data = b"1000\r\n2000\r\n\r\n4000\n\n\n5000\n-6000\n\n7000"
+    input_file.write_bytes(data)
+    expected = list(reader.int_groups(data))
+    assert expected == [[1000, 2000], [4000], [5000, -6000], [7000]]
+    for size in (1, 2, 3, 5, 7, 64):
+        assert list(reader.stream_groups(input_file, size)) == expected
+    data = b"1\r\n\r\n2\n\n\n3\r\n4\r\n\r\n" + b"5\r\n" * 1000
+    input_file.write_bytes(data)
+    expected = list(reader.int_groups(data))
+    assert expected == [[1], [2], [3, 4], [5] * 1000]
+    for size in (1, 2, 3, 4, 5, 64):
+        assert list(reader.stream_groups(input_file, size)) == expected
+    input_file.write_bytes(b"")
+    assert list(reader.stream_groups(input_file)) == []
+
+def test_windows():
+    data = b"A Y\nB X\nC Z\nA X"
+    for size in (1, 3, 4, 6, 100):
+        parts = list(reader.windows(data, size))
+        assert b''.join(parts) == data
+        assert all(part.endswith(b"\n") for part in parts[:-1])
+    assert list(reader.windows(b"")) == []
@@ -0,0 +1,42 @@
+import pytest
+from pathlib import Path
+
+from aoc import runner
+
+def test_parse_param():
+    assert runner.parse_param('ycheck=10') == {'ycheck': 10}
+    assert runner.parse_param('test=True') == {'test': True}
+    assert runner.parse_param('name=abc') == {'name': 'abc'}
+    with pytest.raises(ValueError):
+        runner.parse_param('ycheck')
+
+def test_make_jobs():
+    jobs = runner.make_jobs([4, 25], [1, 2], 'test_input.txt')
+    assert [(job.day, job.part) for job in jobs] == [(4, 1), (4, 2), (25, 1), (25, 2)]
+    assert jobs[0].input_file == Path(runner.day_dir(4) / 'test_input.txt')
+
+def test_run_job_inline():
+    job = runner.Job(4, 1, runner.resolve_input(4, 'test_input.txt'))
+    result = runner.run_job(job)
+    assert result.error is None
+    assert result.answer == 2
+    assert result.wall_s >= 0 and result.cpu_s >= 0
+
+def test_run_job_params():
+    job = runner.Job(15, 1, runner.resolve_input(15, 'test_input.txt'), {'ycheck': 10, 'unused': 1})
+    result = runner.run_job(job)
+    assert result.error is None
+
+def test_run_jobs_isolated():
+    jobs = runner.make_jobs([5], [1, 2], 'test_input.txt')
+    results = list(runner.run_jobs(jobs))
+    assert [result.answer for result in results] == ['CMZ', 'MCD']
+
+def test_longest_first():
+    assert runner.longest_first([0.1, 5.0, float('inf'), 5.0]) == [2, 1, 3, 0]
+
+def test_run_jobs_parallel():
+    jobs = runner.make_jobs([4, 5, 6], [1, 2], 'test_input.txt')
+    results = list(runner.run_jobs(jobs, processes=3))
+    assert [(result.day, result.part) for result in results] == [(job.day, job.part) for job in jobs]
+    assert [result.answer for result in results[:4]] == [2, 4, 'CMZ', 'MCD']
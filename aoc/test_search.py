@@ -0,0 +1,55 @@
+from aoc import search
+from aoc.grid import Grid
+
+MAZE = [
+    "S.#.",
+    ".##.",
+    "...E",
+]
+
+def get_maze():
+    grid = Grid.from_lines(MAZE, {'.': 0, 'S': 0, 'E': 0, '#': 1}, pad_value=1)
+    def neighbors(idx):
+        return [idx + offset for offset in grid.offsets4 if grid.cells[idx + offset] == 0]
+    return grid, neighbors
+
+def test_bfs():
+    grid, neighbors = get_maze()
+    dist = search.bfs(neighbors, [grid.index(0, 0)], len(grid.cells))
+    assert dist[grid.index(2, 3)] == 5
+    assert dist[grid.index(0, 3)] == 7
+    assert dist[grid.index(0, 2)] == search.UNREACHED
+    assert search.distance(neighbors, [grid.index(0, 0)], grid.index(0, 2), len(grid.cells)) is None
+
+def test_multi_source_bfs():
+    grid, neighbors = get_maze()
+    starts = [grid.index(0, 0), grid.index(0, 3)]
+    assert search.distance(neighbors, starts, grid.index(2, 3), len(grid.cells)) == 2
+
+def test_all_pairs_bfs():
+    # A path 0 - 1 - 2 and a lonely 3
+    edges = [[1], [0, 2], [1], []]
+    dist = search.all_pairs_bfs(edges.__getitem__, 4)
+    assert list(dist[0]) == [0, 1, 2, search.UNREACHED]
+    assert list(dist[2]) == [2, 1, 0, search.UNREACHED]
+    dist = search.all_pairs_bfs(edges.__getitem__, 4, [1])
+    assert list(dist[1]) == [1, 0, 1, search.UNREACHED] and len(dist[0]) == 0
+
+def test_dijkstra():
+    edges = [[(1, 4), (2, 1)], [(3, 1)], [(1, 2), (3, 5)], []]
+    dist = search.dijkstra(edges.__getitem__, [0], 4)
+    assert list(dist) == [0, 3, 1, 4]
+
+def test_astar():
+    # Walk on the number line from 0 to 10 with steps of 1 or 3
+    def neighbors(state):
+        return [(state + 1, 1), (state + 3, 1)]
+    assert search.astar(neighbors, 0, lambda state: state == 10, lambda state: 0) == 4
+    assert search.astar(neighbors, 0, lambda state: state == 10, lambda state: max(10 - state, 0) // 3) == 4
+
+def test_layered_bfs():
+    # Node 1 is only open on even steps
+    def neighbors(node, step):
+        return [nnode for nnode in (node - 1, node, node + 1) if 0 <= nnode <= 2 and (nnode != 1 or step % 2 == 0)]
+    assert search.layered_bfs(neighbors, [0], 2) == 3
+    assert search.layered_bfs(neighbors, [0], 2, max_steps=2) is None
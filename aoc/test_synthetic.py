@@ -0,0 +1,32 @@
+import pytest
+
+from aoc import DAYS, PARTS, runner, synthetic
+
+# Small enough for every solver to finish in about a second
+SIZES = {5: 50, 6: 500, 7: 30, 8: 20, 10: 100, 11: 4, 12: 8, 13: 20, 14: 20, 15: 4, 16: 10, 17: 100, 18: 100, 19: 2, 21: 101, 22: 20, 23: 12, 24: 4}
+# Day 25 has no second puzzle
+NO_ANSWER = {(25, 2)}
+
+def test_every_day_has_a_generator():
+    assert sorted(synthetic.GENERATORS) == DAYS
+
+def test_seeded():
+    assert synthetic.generate(16, 20, 1) == synthetic.generate(16, 20, 1)
+    assert synthetic.generate(16, 20, 1) != synthetic.generate(16, 20, 2)
+
+@pytest.mark.parametrize('day,part', [(day, part) for day in DAYS for part in PARTS])
+def test_solvable(tmp_path, day, part):
+    input_file = tmp_path / 'input.txt'
+    input_file.write_text(synthetic.generate(day, SIZES.get(day, 100)))
+    result = runner.run_job(runner.Job(day, part, input_file))
+    assert result.error is None
+    assert (result.answer is None) == ((day, part) in NO_ANSWER)
+
+def test_versioned_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(synthetic, 'CACHE_DIR', tmp_path)
+    monkeypatch.setitem(synthetic.VERSIONS, 4, 1)
+    first = synthetic.synthetic_input(4, 10)
+    monkeypatch.setitem(synthetic.VERSIONS, 4, 2)
+    second = synthetic.synthetic_input(4, 10)
+    assert first != second and first.exists() and second.exists()
+    assert first.name == 'day4-v1_size10_seed0.txt'
@@ -0,0 +1,46 @@
+import logging
+import pytest
+
+from aoc import trace
+
+class Explodes:
+    def __str__(self):
+        raise AssertionError("formatted while the channel is off")
+
+@pytest.fixture
+def no_trace():
+    patterns = list(trace._patterns)
+    trace.disable_all()
+    yield
+    trace.disable_all()
+    trace.enable(patterns)
+
+def test_channel_off_by_default(no_trace, caplog):
+    channel = trace.channel('test.off')
+    assert not channel.on
+    with caplog.at_level(logging.INFO):
+        channel.emit("%s", Explodes())
+    assert caplog.records == []
+
+def test_enable_patterns(no_trace):
+    cycle = trace.channel('test10.cycle')
+    signal = trace.channel('test10.signal')
+    other = trace.channel('test11.round')
+    trace.enable(['test10'])
+    assert cycle.on and signal.on and not other.on
+    trace.disable_all()
+    trace.enable(['test1?.round'])
+    assert other.on and not cycle.on
+    trace.enable(['test1?'])
+    assert cycle.on and signal.on
+    # Channels created after enable() pick up the patterns too
+    assert trace.channel('test12.round').on
+
+def test_emit(no_trace, caplog):
+    channel = trace.channel('test.emit')
+    trace.enable(['test.emit'])
+    with caplog.at_level(logging.INFO):
+        channel.emit("Round %d", 3)
+    assert [record.getMessage() for record in caplog.records] == ["Round 3"]
+    assert caplog.records[0].name == 'trace.test.emit'
+    assert caplog.records[0].filename == 'test_trace.py'
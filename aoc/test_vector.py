@@ -0,0 +1,20 @@
+import pytest
+
+from aoc import vector
+
+def test_use_numpy(monkeypatch):
+    assert vector.use_numpy('python') is False
+    assert vector.use_numpy() == (vector.numpy is not None)
+    with pytest.raises(RuntimeError):
+        vector.use_numpy('fortran')
+    monkeypatch.setattr(vector, 'numpy', None)
+    assert vector.use_numpy('auto') is False
+    with pytest.raises(RuntimeError):
+        vector.use_numpy('numpy')
+
+def test_uint_records():
+    pytest.importorskip('numpy')
+    assert vector.uint_records(b"2-4,6-8\r\n5-7,7-9\n", 4).tolist() == [[2, 4, 6, 8], [5, 7, 7, 9]]
+    assert vector.uint_records(b"", 4).shape == (0, 4)
+    with pytest.raises(RuntimeError):
+        vector.uint_records(b"1-2,3\n", 4)
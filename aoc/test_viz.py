@@ -0,0 +1,20 @@
+import pytest
+
+from aoc import viz
+
+@viz.view
+def plot(calls):
+    calls.append(1)
+    return 'shown'
+
+def test_view_is_noop_when_headless(monkeypatch):
+    monkeypatch.delenv(viz.ENV_VAR, raising=False)
+    calls = list()
+    assert plot(calls) is None and calls == []
+    monkeypatch.setenv(viz.ENV_VAR, '1')
+    assert plot(calls) == 'shown' and calls == [1]
+
+def test_require():
+    assert viz.require('json').dumps([1]) == '[1]'
+    with pytest.raises(RuntimeError):
+        viz.require('aoc_no_such_plotting_backend')
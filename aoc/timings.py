@@ -0,0 +1,56 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+from aoc import YEAR_DIR, synthetic
+
+BASELINE_FILE = YEAR_DIR / 'baseline.json'
+# Wall times of the latest 'run', used to schedule the next one when there is
+# no baseline for a job yet
+LAST_RUN_FILE = YEAR_DIR.parent / '.aoc_cache' / 'last_run.json'
+
+def job_key(day: int, part: int, label: str) -> str:
+    return f"{day}/{part}/{label}"
+
+def input_label(input_file: Path) -> str:
+    if input_file.parent == synthetic.CACHE_DIR:
+        # day4-v1_size100000_seed0 -> size100000_seed0
+        return input_file.stem.split('_', 1)[1]
+    return input_file.stem
+
+def load_entries(path: Path) -> Dict[str, Dict[str, Any]]:
+    if not path.exists():
+        return dict()
+    with path.open('r') as inf:
+        data = json.load(inf)
+    return data.get('entries', dict())
+
+def write_entries(path: Path, entries: Dict[str, Dict[str, Any]]):
+    data = {'version': 1, 'entries': dict(sorted(entries.items()))}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with tmp.open('w') as outf:
+        json.dump(data, outf, indent=2)
+        outf.write('\n')
+    tmp.replace(path)
+
+def record_last_run(results: Iterable[Any], path: Path = LAST_RUN_FILE):
+    entries = load_entries(path)
+    for result in results:
+        if result.error:
+            continue
+        key = job_key(result.day, result.part, input_label(Path(result.input_file)))
+        entries[key] = {'median': result.wall_s}
+    write_entries(path, entries)
+
+def expected_seconds(jobs: Iterable[Any], baseline: Path = BASELINE_FILE, last_run: Path = LAST_RUN_FILE) -> List[float]:
+    # Baseline medians first, then the latest run. Jobs never measured are
+    # assumed to be long so they are not left for the end of the schedule
+    known = load_entries(last_run)
+    known.update(load_entries(baseline))
+    expected = list()
+    for job in jobs:
+        entry = known.get(job_key(job.day, job.part, input_label(job.input_file)))
+        expected.append(entry['median'] if entry else float('inf'))
+    return expected
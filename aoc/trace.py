@@ -0,0 +1,72 @@
+import fnmatch
+import logging
+import os
+import sys
+from typing import Dict, Iterable, List
+
+# Comma separated channel patterns, inherited by worker processes and pytest
+ENV_VAR = 'AOC_TRACE'
+LOGGER_PREFIX = 'trace'
+
+class Channel:
+    # Hot loops test `channel.on` before building any message, so a channel
+    # that is off costs one attribute load and nothing is formatted
+    __slots__ = ('name', 'on', 'logger')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.on = False
+        self.logger = logging.getLogger(f"{LOGGER_PREFIX}.{name}")
+    def emit(self, msg: str, *args):
+        if self.on:
+            self.logger.info(msg, *args, stacklevel=2)
+    def __bool__(self) -> bool:
+        return self.on
+    def __repr__(self) -> str:
+        return f"Channel({self.name}, {'on' if self.on else 'off'})"
+
+_channels: Dict[str, Channel] = dict()
+_patterns: List[str] = list()
+
+def matches(name: str, pattern: str) -> bool:
+    # A pattern also matches the channels below it, so 'day10' enables every
+    # channel of day 10 and 'day1?' those of days 10 to 19
+    parts = name.split('.')
+    return any(fnmatch.fnmatchcase('.'.join(parts[:idx]), pattern) for idx in range(1, len(parts) + 1))
+
+def channel(name: str) -> Channel:
+    found = _channels.get(name)
+    if found is None:
+        found = Channel(name)
+        found.on = any(matches(name, pattern) for pattern in _patterns)
+        _channels[name] = found
+    return found
+
+def enable(patterns: Iterable[str]):
+    for pattern in patterns:
+        pattern = pattern.strip()
+        if pattern and pattern not in _patterns:
+            _patterns.append(pattern)
+    for name, found in _channels.items():
+        found.on = any(matches(name, pattern) for pattern in _patterns)
+    os.environ[ENV_VAR] = ','.join(_patterns)
+
+def disable_all():
+    _patterns.clear()
+    for found in _channels.values():
+        found.on = False
+    os.environ.pop(ENV_VAR, None)
+
+def channels() -> List[Channel]:
+    return [_channels[name] for name in sorted(_channels)]
+
+def log_to(stream=None):
+    # Only for the command line, under pytest the records go to log_cli
+    logger = logging.getLogger(LOGGER_PREFIX)
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(logging.Formatter('[%(name)s] %(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+enable(os.environ.get(ENV_VAR, '').split(','))
@@ -0,0 +1,30 @@
+from types import ModuleType
+from typing import Optional
+
+from aoc import reader
+
+try:
+    import numpy
+except ImportError:
+    # Optional, every vectorized engine has a pure Python counterpart
+    numpy: Optional[ModuleType] = None
+
+# Values of the engine parameter of the days that have a NumPy engine: auto
+# picks NumPy whenever it is installed
+ENGINES = ('auto', 'numpy', 'python')
+
+def use_numpy(engine: str = 'auto') -> bool:
+    if engine not in ENGINES:
+        raise RuntimeError(f"Unknown engine {engine!r}, expected one of {', '.join(ENGINES)}")
+    if engine == 'numpy' and numpy is None:
+        raise RuntimeError("The numpy engine needs numpy, install it or use engine=python")
+    return engine != 'python' and numpy is not None
+
+def uint_records(data: reader.Buffer, width: int):
+    # Every unsigned number of data as an (N, width) int64 array, parsed by
+    # NumPy itself once everything else is blanked out
+    text = bytes(data).translate(reader.UINT_TABLE)
+    numbers = numpy.fromstring(text, dtype=numpy.int64, sep=' ') if text.strip() else numpy.zeros(0, dtype=numpy.int64)
+    if numbers.size % width:
+        raise RuntimeError(f"{numbers.size} numbers do not make records of {width}")
+    return numbers.reshape(-1, width)
@@ -0,0 +1,38 @@
+import functools
+import importlib
+import os
+from types import ModuleType
+from typing import Callable, Dict
+
+# Set to 1 to open the plots of the days that have some. Off by default, so
+# pytest, the runner and the benchmarks never import a plotting stack
+ENV_VAR = 'AOC_VIZ'
+
+_modules: Dict[str, ModuleType] = dict()
+
+def enabled() -> bool:
+    return os.environ.get(ENV_VAR, '0') not in ('', '0')
+
+def enable(on: bool = True):
+    # Through the environment, so worker processes inherit it
+    os.environ[ENV_VAR] = '1' if on else '0'
+
+def require(name: str) -> ModuleType:
+    # Imported on the first plot only
+    module = _modules.get(name)
+    if module is None:
+        try:
+            module = importlib.import_module(name)
+        except ImportError as exc:
+            raise RuntimeError(f"Visualization needs {name}, install it or unset {ENV_VAR}") from exc
+        _modules[name] = module
+    return module
+
+def view(func: Callable) -> Callable:
+    # Marks a drawing function, which does nothing unless visualization is on
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not enabled():
+            return None
+        return func(*args, **kwargs)
+    return wrapper